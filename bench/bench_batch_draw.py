@@ -0,0 +1,94 @@
+"""
+Benchmark of batched curve drawing in MatplotlibDraw.
+
+Runs some of the example scripts with ``drawing_tool.batch_curves``
+turned off and on, and reports the number of matplotlib artists in
+the resulting figures and the time it takes to render them.
+
+Usage::
+
+    python bench_batch_draw.py                  # default examples
+    python bench_batch_draw.py ../examples/beam1.py
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, io, time, tempfile, runpy
+
+examples_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            os.pardir, 'examples')
+default_examples = [os.path.join(examples_dir, name) for name in
+                    ('beam2.py', 'wheel_on_inclined_plane.py')]
+
+
+def run_example(path):
+    """Run example script `path` in a scratch directory, non-interactively."""
+    stdin, stdout, sleep, cwd = sys.stdin, sys.stdout, time.sleep, os.getcwd()
+    sys.stdin = io.StringIO(u'\n'*100)  # answers to input()
+    sys.stdout = open(os.devnull, 'w')
+    time.sleep = lambda seconds: None
+    os.chdir(tempfile.mkdtemp(prefix='pysketcher_bench_'))
+    try:
+        runpy.run_path(path, run_name='__main__')
+    finally:
+        sys.stdout.close()
+        sys.stdin, sys.stdout, time.sleep = stdin, stdout, sleep
+        os.chdir(cwd)
+
+
+def count_artists(fig):
+    n = 0
+    for ax in fig.axes:
+        n += len(ax.lines) + len(ax.patches) + len(ax.collections) + \
+             len(ax.texts) + len(ax.images)
+    return n
+
+
+def render_time(fig, repetitions=5):
+    """Return the average time of a full redraw of `fig`."""
+    fig.canvas.draw()  # warm up (text layout etc.)
+    t0 = time.time()
+    for i in range(repetitions):
+        fig.canvas.draw()
+    return (time.time() - t0)/repetitions
+
+
+def benchmark(path, batch_curves):
+    from pysketcher import current_drawing_tool
+    tool = current_drawing_tool()
+    # The figures made by the drawing tool itself (offscreen figures
+    # are not known to pyplot)
+    figs = []
+    def open_figure():
+        type(tool)._open_figure(tool)
+        if tool._fig is not None and not any(f is tool._fig for f in figs):
+            figs.append(tool._fig)
+    tool._open_figure = open_figure
+    tool.batch_curves = batch_curves
+    try:
+        t0 = time.time()
+        run_example(path)
+        run_time = time.time() - t0
+    finally:
+        del tool._open_figure
+        tool.batch_curves = False
+    artists = sum(count_artists(fig) for fig in figs)
+    draw_time = sum(render_time(fig) for fig in figs)
+    if tool.backend != 'Agg':
+        import matplotlib.pyplot as plt
+        for fig in figs:
+            plt.close(fig)
+    return run_time, artists, draw_time
+
+
+def main(examples):
+    print('%-28s %-8s %10s %10s %12s' %
+          ('example', 'batch', 'run (s)', 'artists', 'render (s)'))
+    for path in examples:
+        for batch_curves in False, True:
+            run_time, artists, draw_time = benchmark(path, batch_curves)
+            print('%-28s %-8s %10.3f %10d %12.4f' %
+                  (os.path.basename(path), batch_curves,
+                   run_time, artists, draw_time))
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or default_examples)
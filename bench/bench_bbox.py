@@ -0,0 +1,71 @@
+"""
+Benchmark of the cached bounding boxes (``Shape.bbox``).
+
+``minmax_coordinates`` is called repeatedly on a sketch with many
+curves, with a translation of one curve (which removes the cached
+boxes along its path to the top of the tree) or of the whole sketch
+(which updates the cached box directly) between the calls. The time
+is compared with computing the box from all the coordinates every
+time, as done before the boxes were cached.
+
+Usage::
+
+    python bench_bbox.py               # 100 calls
+    python bench_bbox.py 1000
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+import numpy as np
+from pysketcher import drawing_tool, Curve, Composition
+
+
+def sketch(ngroups=30, ncurves=30, npoints=100):
+    t = np.linspace(0, 2*np.pi, npoints)
+    groups = {}
+    for i in range(ngroups):
+        curves = {}
+        for j in range(ncurves):
+            r = 1 + 3.*j/ncurves
+            curves['c%d' % j] = Curve(5 + r*np.cos(t), 5 + r*np.sin(t))
+        groups['g%d' % i] = Composition(curves)
+    return Composition(groups)
+
+
+def uncached_minmax(fig):
+    """Box computed from all coordinates (no caching)."""
+    x = np.concatenate([c.x for g in fig.shapes.values()
+                        for c in g.shapes.values()])
+    y = np.concatenate([c.y for g in fig.shapes.values()
+                        for c in g.shapes.values()])
+    return x.min(), x.max(), y.min(), y.max()
+
+
+def run(minmax, move, n):
+    fig = sketch()
+    t0 = time.time()
+    for i in range(n):
+        move(fig)
+        minmax(fig)
+    return time.time() - t0
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    moves = [('nothing', lambda fig: None),
+             ('one curve',
+              lambda fig: fig['g0']['c0'].translate((0.001, 0))),
+             ('sketch', lambda fig: fig.translate((0.001, 0)))]
+    print('%d calls, 900 curves, times in seconds' % n)
+    print('%12s %12s %12s' % ('moved', 'uncached', 'cached'))
+    for name, move in moves:
+        print('%12s %12.4f %12.4f' %
+              (name, run(uncached_minmax, move, n),
+               run(lambda fig: fig.minmax_coordinates(), move, n)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark of Shape.copy: stamp out a figure with many copies of the
+same parts (wheels, springs, supports), as copy() shares the
+coordinate arrays of the curves with the original, compared with a
+copy of all arrays (the former copy.deepcopy behavior). Reports the
+time and the memory allocated by the copies (tracemalloc), and checks
+that the figures are drawn the same (SVGDraw).
+
+Usage::
+
+    python bench_copy.py           # 200 copies of each part
+    python bench_copy.py 1000
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, copy, tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from pysketcher import *
+from pysketcher.NullDraw import NullDraw
+from pysketcher.SVGDraw import SVGDraw
+
+area = dict(xmin=0, xmax=100, ymin=0, ymax=30)
+
+
+def parts():
+    return dict(wheel=Wheel((1, 20), 0.8, nlines=12),
+                spring=Spring((1, 1), 5, num_windings=11, width=0.8),
+                support=SimplySupportedBeam((1, 10), 0.6))
+
+
+def full_copy(shape):
+    """Copy of the shape tree with copies of all arrays."""
+    if isinstance(shape, Curve):
+        new = copy.copy(shape)
+        new._x, new._y = shape.x.copy(), shape.y.copy()
+        new._matrix = new._xy = None
+        return new
+    new = copy.copy(shape)
+    shapes = shape.__dict__.get('_shapes')
+    if isinstance(shapes, dict):
+        new.__dict__['_shapes'] = dict((k, full_copy(v))
+                                       for k, v in shapes.items())
+    elif isinstance(shapes, list):
+        new.__dict__['_shapes'] = [full_copy(v) for v in shapes]
+    for name in list(new.__dict__):
+        if name not in ('_shapes',) and not name.startswith('_'):
+            new.__dict__[name] = copy.deepcopy(shape.__dict__[name])
+    new.__dict__.pop('_bbox_parents', None)
+    return new
+
+
+def stamp(originals, n, copier, move):
+    shapes = {}
+    for name, part in originals.items():
+        for i in range(n):
+            c = copier(part)
+            if move:
+                c.translate((i*96./n, 0))
+            shapes['%s%d' % (name, i)] = c
+    return Composition(shapes)
+
+
+def measure(originals, n, copier, move):
+    t = min(timed(lambda: stamp(originals, n, copier, move))
+            for i in range(3))
+    tracemalloc.start()
+    fig = stamp(originals, n, copier, move)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return t, memory, fig
+
+
+def timed(func):
+    t0 = time.time()
+    func()
+    return time.time() - t0
+
+
+def svg(shape):
+    tool = SVGDraw()
+    tool.set_coordinate_system(**area)
+    shape.draw(tool=tool)
+    return tool.svg()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    use_drawing_tool(NullDraw())
+    drawing_tool.set_coordinate_system(**area)
+    originals = parts()
+    print('%d copies of each of %s' % (n, ', '.join(sorted(originals))))
+    print('%-34s %9s %12s' % ('', 'time (ms)', 'memory (MB)'))
+    for move in False, True:
+        figs = []
+        for name, copier in [('copy() (shared arrays)',
+                              lambda s: s.copy()),
+                             ('copy of all arrays', full_copy)]:
+            t, memory, fig = measure(originals, n, copier, move)
+            figs.append(fig)
+            print('%-34s %9.1f %12.2f' %
+                  (name + (', translated' if move else ''), 1000*t,
+                   memory/1e6))
+        print('same drawing:', svg(figs[0]) == svg(figs[1]))
+
+
+if __name__ == '__main__':
+    main()
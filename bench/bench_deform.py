@@ -0,0 +1,80 @@
+"""
+Benchmark of ``deform`` with scalar and vectorized displacement functions.
+
+Deforms a curve with many points and a composition with many curves.
+The time is compared for:
+
+* the old implementation (a Python loop calling the function once per
+  point),
+* a scalar function (`vectorized=False`, called through
+  ``numpy.vectorize``),
+* a vectorized function (called once with whole arrays).
+
+For the composition, ``Shape.deform`` collects the coordinates of all
+curves and makes one call. This is compared with deforming each curve
+on its own.
+
+Usage::
+
+    python bench_deform.py
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, math
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+import numpy as np
+from pysketcher import drawing_tool, Curve, Composition
+
+
+def scalar_displacement(x, y):
+    return x, y + 0.1*math.sin(x)
+
+def vectorized_displacement(x, y):
+    return x, y + 0.1*np.sin(x)
+
+
+def loop_deform(curve, displacement_function):
+    """The original Curve.deform: one call per point."""
+    for i in range(len(curve.x)):
+        curve.x[i], curve.y[i] = displacement_function(curve.x[i], curve.y[i])
+
+
+def timeit(func, repetitions=3):
+    best = 1E+20
+    for i in range(repetitions):
+        t0 = time.time()
+        func()
+        best = min(best, time.time() - t0)
+    return best
+
+
+def main():
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    x = np.linspace(0, 10, 2001)
+    curve = Curve(x, 5 + np.sin(x))
+    ncurves = 1000
+    fig = Composition({'c%d' % i: Curve(x[:21], 5 + 0.001*i + 0*x[:21])
+                       for i in range(ncurves)})
+    curves = list(fig.shapes.values())
+
+    print('%-44s %10s' % ('', 'time [s]'))
+    print('%-44s %10.5f' % ('2001 points, loop (old deform)', timeit(
+        lambda: loop_deform(curve, scalar_displacement))))
+    print('%-44s %10.5f' % ('2001 points, scalar function', timeit(
+        lambda: curve.deform(scalar_displacement, vectorized=False))))
+    print('%-44s %10.5f' % ('2001 points, vectorized function', timeit(
+        lambda: curve.deform(vectorized_displacement))))
+
+    def per_curve():
+        for c in curves:
+            c.deform(vectorized_displacement, vectorized=True)
+    print('%-44s %10.5f' % ('%d curves, one call per curve' % ncurves,
+                            timeit(per_curve)))
+    print('%-44s %10.5f' % ('%d curves, one call for all curves' % ncurves,
+                            timeit(lambda: fig.deform(
+                                vectorized_displacement))))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark of saving a figure in several formats at once
+(``savefig`` with a filename without extension).
+
+The figure is saved as PNG, PDF and SVG by separate savefig calls
+(each renders and crops on its own) and by one call with all the
+formats, where the crop box is found from one rendering and the files
+are encoded and written sequentially or in threads.
+
+Usage::
+
+    python bench_export.py            # 10 repetitions
+    python bench_export.py 50
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, shutil, tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+os.environ.setdefault('PYSKETCHER_BACKEND', 'Agg')
+from pysketcher import drawing_tool, Circle, Spring, Composition
+
+formats = ('png', 'pdf', 'svg')
+
+
+def separate(stem):
+    for format in formats:
+        drawing_tool.savefig('%s.%s' % (stem, format))
+
+
+def timeit(n, save):
+    t0 = time.time()
+    for i in range(n):
+        save()
+    return (time.time() - t0)/n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    shapes = {}
+    for i in range(20):
+        shapes['wheel%d' % i] = Circle((0.5 + i/2.2, 1), 0.2)
+        shapes['spring%d' % i] = Spring((0.5 + i/2.2, 2), 2, width=0.3)
+    Composition(shapes).draw()
+    directory = tempfile.mkdtemp()
+    stem = os.path.join(directory, 'tmp')
+    try:
+        print('time per export to %s (ms):' % ', '.join(formats))
+        print('%24s %8.1f' % ('separate savefig calls',
+                              1000*timeit(n, lambda: separate(stem))))
+        for threads in False, True:
+            t = timeit(n, lambda: drawing_tool.savefig(
+                stem, formats=formats, threads=threads))
+            print('%24s %8.1f' % ('one call, threads=%s' % threads, 1000*t))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark of animation frames sent to gnuplot by GnuplotDraw.
+
+Each frame of a moving sketch is sent as one plot command with the
+coordinates as binary inline data. The time per frame is compared
+with formatting the same coordinates as ASCII text (the format of the
+old GnuplotDraw), and the bytes per frame are reported for both.
+gnuplot itself is used if it is found, otherwise the frames are
+sent to a process that just reads them (the time in gnuplot is then
+not included).
+
+Usage::
+
+    python bench_gnuplot.py            # 50 frames
+    python bench_gnuplot.py 200
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time
+import numpy as np
+try:
+    from shutil import which
+except ImportError:
+    from distutils.spawn import find_executable as which
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from pysketcher import *
+
+if which('gnuplot'):
+    command = 'gnuplot'
+else:
+    command = ['sh', '-c', 'cat > /dev/null']
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    tool = use_drawing_tool('gnuplot', command, terminal='dumb')
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    shapes = {}
+    for i in range(20):
+        shapes['wheel%d' % i] = Circle((0.5 + i/2.2, 1), 0.2)
+        shapes['spring%d' % i] = Spring((0.5 + i/2.2, 2), 2, width=0.3)
+    sketch = Composition(shapes)
+
+    t0 = time.time()
+    for i in range(n):
+        drawing_tool.begin_frame()
+        sketch.translate((0.01, 0))
+        sketch.draw()
+        drawing_tool.end_frame()
+    binary = (time.time() - t0)/n
+    bytes_binary = sum(len(spec) + len(data)
+                       for spec, data in tool._curves)
+
+    # The same frame formatted as ASCII text
+    t0 = time.time()
+    for i in range(n):
+        text = ''.join(''.join('%g %g\n' % tuple(p)
+                               for p in np.frombuffer(data).reshape(-1, 2))
+                       + 'e\n' for spec, data in tool._curves)
+    ascii_format = (time.time() - t0)/n
+    tool.close()
+
+    print('gnuplot command: %s' % command)
+    print('%28s %8.2f' % ('time per frame, binary (ms)', 1000*binary))
+    print('%28s %8.2f' % ('ASCII formatting only (ms)', 1000*ascii_format))
+    print('%28s %8d %8d' % ('bytes per frame, binary/ASCII', bytes_binary,
+                            len(text)))
+
+if __name__ == '__main__':
+    main()
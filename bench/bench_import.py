@@ -0,0 +1,71 @@
+"""
+Benchmark of the start-up cost of pysketcher.
+
+Measures, in a fresh Python process, the time it takes to import
+pysketcher and to construct (but not draw) a sketch, and checks that
+matplotlib is not imported before something is drawn. The time of
+the first drawing in the offscreen (Agg) backend is reported too.
+
+Usage::
+
+    python bench_import.py          # 5 runs
+    python bench_import.py 20       # 20 runs
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, subprocess
+
+package_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           os.pardir)
+
+script = r"""
+import sys, time
+t0 = time.time()
+import pysketcher as ps
+t1 = time.time()
+ps.drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+wheel = ps.Circle(center=(2, 2), radius=1)
+ground = ps.Wall(x=[0, 10], y=[0.5, 0.5], thickness=-0.5)
+spring = ps.Spring(start=(3, 1), length=3)
+fig = ps.Composition(dict(wheel=wheel, ground=ground, spring=spring))
+fig.rotate(10, (0, 0))
+fig.translate((1, 0))
+t2 = time.time()
+imported = 'matplotlib' in sys.modules
+ps.drawing_tool.set_linecolor('blue')
+fig.draw()
+ps.drawing_tool.ax.figure.canvas.draw()
+t3 = time.time()
+print(t1 - t0, t2 - t1, t3 - t2, int(imported))
+"""
+
+
+def run(n):
+    env = dict(os.environ)
+    env['PYSKETCHER_BACKEND'] = 'offscreen'
+    env['PYTHONPATH'] = os.pathsep.join(
+        [package_dir] + [p for p in [env.get('PYTHONPATH')] if p])
+    results = []
+    for i in range(n):
+        output = subprocess.check_output([sys.executable, '-c', script],
+                                         env=env)
+        results.append([float(w) for w in output.split()[-4:]])
+    return results
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = run(n)
+    columns = list(zip(*results))
+    print('%-32s %10s %10s' % ('', 'min [s]', 'mean [s]'))
+    for name, values in zip(['import pysketcher',
+                             'construct shapes (no drawing)',
+                             'first drawing (Agg)'], columns[:3]):
+        print('%-32s %10.4f %10.4f' % (name, min(values), sum(values)/n))
+    imported = any(columns[3])
+    print('matplotlib imported before drawing: %s' %
+          ('yes' if imported else 'no'))
+    return 1 if imported else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Benchmark of recording instruction files (the `instruction_file`
+argument to ``set_coordinate_system``).
+
+A sketch with many curves is drawn without recording and with
+recording, where the coordinates go to a .npz side-car file. The
+previous way of writing the coordinates, as pprint.pformat of the
+coordinate lists in the Python file, is timed for comparison, and the
+file sizes are reported.
+
+Usage::
+
+    python bench_instruction_file.py          # 100 curves
+    python bench_instruction_file.py 500
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, shutil, tempfile, pprint
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+import numpy as np
+from pysketcher.MatplotlibDraw import MatplotlibDraw
+
+
+def curves(n, npoints=500):
+    x = np.linspace(0, 10, npoints)
+    return [(x, 5 + 4*np.sin(x + 0.1*i)) for i in range(n)]
+
+
+def run(n, instruction_file):
+    tool = MatplotlibDraw(backend='offscreen')
+    data = curves(n)
+    t0 = time.time()
+    tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10,
+                               instruction_file=instruction_file)
+    for x, y in data:
+        tool.plot_curve(x, y)
+    if instruction_file:
+        tool.instruction_file.close()
+    return time.time() - t0
+
+
+def run_pformat(n, filename):
+    """The coordinates written as Python lists (old recorder)."""
+    t0 = time.time()
+    with open(filename, 'w') as f:
+        for x, y in curves(n):
+            f.write('x = %s\n' % pprint.pformat(x.tolist()))
+            f.write('y = %s\n' % pprint.pformat(y.tolist()))
+    return time.time() - t0
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, 'tmp.py')
+        t_none = run(n, None)
+        t_npz = run(n, filename)
+        size_npz = os.path.getsize(filename) + \
+                   os.path.getsize(filename[:-3] + '.npz')
+        t_pformat = run_pformat(n, filename)
+        size_pformat = os.path.getsize(filename)
+        print('%d curves with 500 points' % n)
+        print('%20s %10s %10s' % ('', 'time (s)', 'size (kB)'))
+        print('%20s %10.3f' % ('no recording', t_none))
+        print('%20s %10.3f %10.0f' % ('.npz recording', t_npz,
+                                      size_npz/1024.))
+        print('%20s %10.3f %10.0f' % ('pformat (old)', t_none + t_pformat,
+                                      size_pformat/1024.))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark of lazy transformations (``Shape.set_lazy_transforms``).
+
+A chain of rotations and translations is applied to a sketch with
+many curves, and the coordinates are then computed (as when drawing
+the sketch). The time is compared with ordinary (eager) transformations,
+and so is the round-off error after rotating the sketch a full turn
+in many small steps.
+
+Usage::
+
+    python bench_lazy.py               # 100 transformations
+    python bench_lazy.py 1000
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+import numpy as np
+from pysketcher import drawing_tool, Curve, Composition
+
+
+def sketch(ncurves=1000, npoints=100):
+    t = np.linspace(0, 2*np.pi, npoints)
+    curves = {}
+    for i in range(ncurves):
+        r = 1 + 3.*i/ncurves
+        curves['c%d' % i] = Curve(5 + r*np.cos(t), 5 + r*np.sin(t))
+    return Composition(curves)
+
+
+def transform(fig, n):
+    for i in range(n//2):
+        fig.rotate(360./(n//2), (5, 5))
+        fig.translate((0, 0))
+
+
+def coordinates(fig):
+    return [(fig.shapes[name].x, fig.shapes[name].y)
+            for name in sorted(fig.shapes)]
+
+
+def run(lazy, n):
+    fig = sketch()
+    original = [(x.copy(), y.copy()) for x, y in coordinates(fig)]
+    if lazy:
+        fig.set_lazy_transforms()
+    t0 = time.time()
+    transform(fig, n)
+    t1 = time.time()
+    final = coordinates(fig)
+    t2 = time.time()
+    error = max(max(abs(x - x0).max(), abs(y - y0).max())
+                for (x, y), (x0, y0) in zip(final, original))
+    return t1 - t0, t2 - t1, error
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    print('%d transformations of 1000 curves, times in seconds' % n)
+    print('%8s %12s %12s %12s %12s' % ('', 'transform', 'coordinates',
+                                       'total', 'error'))
+    for lazy in False, True:
+        t_transform, t_coordinates, error = run(lazy, n)
+        print('%8s %12.4f %12.4f %12.4f %12.2e' %
+              ('lazy' if lazy else 'eager', t_transform, t_coordinates,
+               t_transform + t_coordinates, error))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of packed shape trees (``Shape.pack``).
+
+A sketch with a fixed total number of points is split into a varying
+number of curves. The time of a rotate/translate/scale sequence and of
+drawing the sketch (in batch mode, without rendering) is reported for
+the ordinary tree and for the packed tree. With packing, the cost
+should follow the total number of points rather than the number of
+curves.
+
+Usage::
+
+    python bench_pack.py                 # 100000 points in total
+    python bench_pack.py 1000000
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time
+
+os.environ.setdefault('PYSKETCHER_BACKEND', 'offscreen')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+import numpy as np
+from pysketcher import drawing_tool, Curve, Composition
+
+
+def sketch(ncurves, npoints):
+    """Composition of `ncurves` curves with `npoints` points in total."""
+    n = max(npoints//ncurves, 2)
+    t = np.linspace(0, 2*np.pi, n)
+    curves = {}
+    for i in range(ncurves):
+        r = 1 + 3.*i/ncurves
+        curves['c%d' % i] = Curve(5 + r*np.cos(t), 5 + r*np.sin(t))
+    return Composition(curves)
+
+
+def transform(fig):
+    for i in range(10):
+        fig.rotate(1, (5, 5))
+        fig.translate((0.001, 0))
+        fig.scale(1.00001)
+
+
+def draw(fig):
+    drawing_tool.erase()
+    fig.draw()
+    drawing_tool.flush()
+
+
+def timeit(func, fig, repetitions=3):
+    best = 1E+20
+    for i in range(repetitions):
+        t0 = time.time()
+        func(fig)
+        best = min(best, time.time() - t0)
+    return best
+
+
+def main():
+    npoints = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    drawing_tool.batch_curves = True
+    print('%d points in total, times in seconds' % npoints)
+    print('%8s %12s %12s %12s %12s' % ('curves', 'transform', 'packed',
+                                       'draw', 'packed'))
+    for ncurves in 10, 100, 1000, 10000:
+        fig = sketch(ncurves, npoints)
+        t_transform = timeit(transform, fig)
+        t_draw = timeit(draw, fig)
+        fig.pack()
+        t_transform_packed = timeit(transform, fig)
+        t_draw_packed = timeit(draw, fig)
+        print('%8d %12.4f %12.4f %12.4f %12.4f' %
+              (ncurves, t_transform, t_transform_packed,
+               t_draw, t_draw_packed))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark of the cost of profiling the drawing of shapes.
+
+Draws a tree of 20 wheels and 20 springs with the NullDraw drawing
+tool (so that only pysketcher's own work is timed), with profiling
+off and on.
+
+Usage::
+
+    python bench_profile.py            # 200 repetitions
+    python bench_profile.py 1000
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from pysketcher import *
+
+
+def timeit(n, func):
+    best = None
+    for repeat in range(3):
+        t0 = time.time()
+        for i in range(n):
+            func()
+        t = (time.time() - t0)/n
+        best = t if best is None else min(best, t)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    use_drawing_tool('null')
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    shapes = {}
+    for i in range(20):
+        shapes['wheel%d' % i] = Wheel((0.5 + i/2.2, 1), 0.2)
+        shapes['spring%d' % i] = Spring((0.5 + i/2.2, 2), 2, width=0.3)
+    sketch = Composition(shapes)
+    off = timeit(n, sketch.draw)
+    drawing_tool.profile()
+    on = timeit(n, sketch.draw)
+    drawing_tool.profile(False)
+    print('time per draw (ms):')
+    print('%20s %8.3f' % ('profiling off', 1000*off))
+    print('%20s %8.3f' % ('profiling on', 1000*on))
+    drawing_tool.profile_report(limit=5)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark of the render cache (CachedDraw) in a simulated build of
+documentation figures: a fresh Python process saves one figure of
+each shape class in ``pysketcher.bench.shape_cases`` as PNG and PDF,
+as a doc build runs the figure scripts.
+
+The build is timed with Matplotlib directly, with CachedDraw and an
+empty cache (every figure is rendered and stored), and with CachedDraw
+when nothing has changed (every figure is copied from the cache).
+The files of the cached builds are compared with the files of the
+first cached build.
+
+Usage::
+
+    python bench_render_cache.py
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, shutil, tempfile, subprocess
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+build = '''
+import sys
+from pysketcher import *
+from pysketcher.bench import shape_cases, shape_area
+for name in sorted(shape_cases):
+    drawing_tool.set_coordinate_system(**shape_area)
+    try:
+        shape = shape_cases[name]()
+    except ImportError:
+        continue  # optional package (e.g. scipy) not installed
+    shape.draw()
+    drawing_tool.display(name)
+    drawing_tool.savefig(name)
+print('matplotlib' in sys.modules)
+'''
+
+
+def run(directory, **env):
+    env = dict(os.environ, PYSKETCHER_BACKEND='Agg', **env)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + [p for p in [os.environ.get('PYTHONPATH')] if p])
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+    os.mkdir(directory)
+    t0 = time.time()
+    output = subprocess.check_output([sys.executable, '-c', build],
+                                     cwd=directory, env=env)
+    return time.time() - t0, output.decode().strip() == 'True'
+
+
+def read_files(directory):
+    files = {}
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name), 'rb') as f:
+            files[name] = f.read()
+    return files
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    cache = os.path.join(tmp, 'cache')
+    try:
+        print('%-36s %8s %12s %6s' % ('build', 'time (s)', 'matplotlib',
+                                      'same'))
+        t, mpl = run(os.path.join(tmp, 'plain'))
+        print('%-36s %8.2f %12s %6s' % ('MatplotlibDraw', t, mpl, ''))
+        cached = dict(PYSKETCHER_DRAWING_TOOL='cached',
+                      PYSKETCHER_CACHE_DIR=cache)
+        t, mpl = run(os.path.join(tmp, 'cold'), **cached)
+        files = read_files(os.path.join(tmp, 'cold'))
+        print('%-36s %8.2f %12s %6s' % ('CachedDraw, empty cache', t, mpl,
+                                        ''))
+        for i in range(2):
+            t, mpl = run(os.path.join(tmp, 'warm'), **cached)
+            same = read_files(os.path.join(tmp, 'warm')) == files
+            print('%-36s %8.2f %12s %6s' % ('CachedDraw, nothing changed',
+                                            t, mpl, same))
+        figures = os.path.join(cache, 'figures')
+        print('%d files, cache size %.1f MB' %
+              (len(files), sum(os.path.getsize(os.path.join(figures, name))
+                               for name in os.listdir(figures))/1e6))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
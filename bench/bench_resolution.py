@@ -0,0 +1,68 @@
+"""
+Benchmark of adaptive resolution of curved shapes
+(``MatplotlibDraw.chord_tolerance``).
+
+A sketch with many small wheels and springs and a few large circles is
+made and drawn with the fixed default resolution and with a tolerance
+of half a pixel. The total no of points and the times are reported.
+
+Usage::
+
+    python bench_resolution.py          # 200 small shapes
+    python bench_resolution.py 1000
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+os.environ.setdefault('PYSKETCHER_BACKEND', 'Agg')
+from pysketcher import drawing_tool, Circle, Spring, Composition, Curve
+
+
+def sketch(n):
+    shapes = {}
+    for i in range(n):
+        x = 1 + 98.*(i % 20)/20
+        y = 1 + 98.*(i//20)/(n//20 + 1)
+        shapes['wheel%d' % i] = Circle((x, y), 0.3)
+        shapes['spring%d' % i] = Spring((x + 1, y), 2, width=0.4)
+    for i in range(3):
+        shapes['big%d' % i] = Circle((50, 50), 20 + 10*i)
+    return Composition(shapes)
+
+
+def count_points(fig):
+    npoints = [0]
+    def count(shape):
+        if isinstance(shape, Curve):
+            npoints[0] += len(shape.x)
+        elif hasattr(shape, 'shapes'):
+            for child in shape.shapes.values():
+                count(child)
+    count(fig)
+    return npoints[0]
+
+
+def run(n, tolerance):
+    drawing_tool.chord_tolerance = tolerance
+    drawing_tool.set_coordinate_system(xmin=0, xmax=100, ymin=0, ymax=100)
+    t0 = time.time()
+    fig = sketch(n)
+    t1 = time.time()
+    fig.draw()
+    drawing_tool.fig.savefig(os.devnull, format='png')
+    t2 = time.time()
+    return count_points(fig), t1 - t0, t2 - t1
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print('%d wheels and springs, times in seconds' % n)
+    print('%10s %10s %10s %10s' % ('tolerance', 'points', 'make', 'draw'))
+    for tolerance in None, 0.5:
+        print('%10s %10d %10.3f %10.3f' % ((tolerance,) + run(n, tolerance)))
+
+if __name__ == '__main__':
+    main()
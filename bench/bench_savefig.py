@@ -0,0 +1,66 @@
+"""
+Benchmark of the latency of ``MatplotlibDraw.savefig`` with and
+without cropping. Cropping is done in-process: PNG images are trimmed
+by a scan of the rendered pixels, and PDF files get a tight bounding
+box. The previous way, running ``convert -trim`` and ``pdfcrop`` on
+the saved files, is timed too if these programs are installed.
+
+Usage::
+
+    python bench_savefig.py            # 20 saves per format
+    python bench_savefig.py 100
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, shutil, tempfile, subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+os.environ.setdefault('PYSKETCHER_BACKEND', 'Agg')
+from pysketcher import drawing_tool, Circle, Spring, Composition
+
+
+def installed(program):
+    with open(os.devnull, 'w') as devnull:
+        return subprocess.call(['which', program], stdout=devnull) == 0
+
+
+def timeit(n, save):
+    t0 = time.time()
+    for i in range(n):
+        save()
+    return (time.time() - t0)/n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    fig = Composition({'wheel': Circle((3, 2), 1),
+                       'spring': Spring((6, 1), 3)})
+    fig.draw()
+    directory = tempfile.mkdtemp()
+    try:
+        print('time per save (ms):')
+        for ext, program in ('.png', 'convert'), ('.pdf', 'pdfcrop'):
+            filename = os.path.join(directory, 'tmp' + ext)
+            t_plain = timeit(n, lambda: drawing_tool.savefig(filename,
+                                                             crop=False))
+            t_crop = timeit(n, lambda: drawing_tool.savefig(filename))
+            print('%s: no crop %.1f, in-process crop %.1f' %
+                  (ext, 1000*t_plain, 1000*t_crop), end='')
+            if installed(program):
+                args = ['convert', '-trim', filename, filename] \
+                       if program == 'convert' else \
+                       ['pdfcrop', filename, filename]
+                def external():
+                    drawing_tool.savefig(filename, crop=False)
+                    with open(os.devnull, 'w') as devnull:
+                        subprocess.call(args, stdout=devnull)
+                print(', %s %.1f' % (program, 1000*timeit(n, external)))
+            else:
+                print(' (%s is not installed)' % program)
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main()
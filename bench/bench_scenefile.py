@@ -0,0 +1,94 @@
+"""
+Benchmark of scene files (Shape.save, load) against building the
+scene by the constructors and against pickle.
+
+The scene is a row of springs, dashpots and arbitrary volumes (with
+texts and arrows). Times the construction, save, load with and without
+memory mapping, load followed by drawing (NullDraw, so that the first
+access of the mapped coordinates is included), and pickle, and checks
+that the loaded scene is drawn exactly as the original (SVGDraw).
+
+Usage::
+
+    python bench_scenefile.py           # 30 of each shape
+    python bench_scenefile.py 100
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, pickle, shutil, tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from pysketcher import *
+from pysketcher.NullDraw import NullDraw
+from pysketcher.SVGDraw import SVGDraw
+
+area = dict(xmin=0, xmax=100, ymin=0, ymax=20)
+
+
+def build(n):
+    shapes = {}
+    for i in range(n):
+        x = 1 + i*96./n
+        shapes['spring%d' % i] = Spring((x, 1), 5, num_windings=i % 10 + 5,
+                                        width=0.8)
+        shapes['dashpot%d' % i] = Dashpot((x + 1, 7), 5, width=0.8)
+        shapes['volume%d' % i] = ArbitraryVolume((x + 1, 16), 2)
+    return Composition(shapes)
+
+
+def best(func, repeat=5):
+    times = []
+    for i in range(repeat):
+        t0 = time.time()
+        result = func()
+        times.append(time.time() - t0)
+    return min(times), result
+
+
+def svg(shape):
+    tool = SVGDraw()
+    tool.set_coordinate_system(**area)
+    shape.draw(tool=tool)
+    return tool.svg()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    use_drawing_tool(NullDraw())
+    drawing_tool.set_coordinate_system(**area)
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, 'scene.pysk')
+    try:
+        t_build, scene = best(lambda: build(n), 3)
+        t_save, _ = best(lambda: scene.save(filename))
+        t_mmap, loaded = best(lambda: load(filename))
+        t_read, _ = best(lambda: load(filename, mmap=False))
+        t_draw, _ = best(lambda: load(filename).draw())
+        t_build_draw, _ = best(lambda: build(n).draw(), 3)
+        data = pickle.dumps(scene, pickle.HIGHEST_PROTOCOL)
+        t_pickle, _ = best(lambda: pickle.loads(data))
+        counter = NullDraw()
+        counter.set_coordinate_system(**area)
+        scene.draw(tool=counter)
+        print('%d shapes, %d curves, %d points, %d texts' %
+              (3*n, counter.counts['curves'], counter.counts['points'],
+               counter.counts['texts']))
+        print('file size: %.1f kB (pickle: %.1f kB)' %
+              (os.path.getsize(filename)/1e3, len(data)/1e3))
+        print('time (ms):')
+        for name, t in [('build by constructors', t_build),
+                        ('save', t_save),
+                        ('load (mmap)', t_mmap),
+                        ('load (read)', t_read),
+                        ('pickle.loads', t_pickle),
+                        ('build + draw', t_build_draw),
+                        ('load (mmap) + draw', t_draw)]:
+            print('%24s %9.2f' % (name, 1000*t))
+        print('same drawing:', svg(loaded) == svg(scene))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark of StochasticWavyCurve, whose coordinates are loaded from
+road_profiles.npy once per process (previously the constructor
+executed large array literals in shapes.py).
+
+Reports the time to compile shapes.py (the cost of the first import,
+before a .pyc file exists), the time to import pysketcher in a fresh
+process, and the time per StochasticWavyCurve object (the first
+object includes loading the data).
+
+Usage::
+
+    python bench_stochastic.py          # 1000 objects
+    python bench_stochastic.py 10000
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, subprocess
+
+package_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           os.pardir)
+
+script = r"""
+import time
+t0 = time.time()
+import pysketcher
+print(time.time() - t0)
+"""
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    filename = os.path.join(package_dir, 'pysketcher', 'shapes.py')
+    with open(filename) as f:
+        source = f.read()
+    t0 = time.time()
+    compile(source, filename, 'exec')
+    print('compile shapes.py (%d bytes): %.4f s' %
+          (len(source), time.time() - t0))
+
+    env = dict(os.environ, PYTHONPATH=package_dir)
+    output = subprocess.check_output([sys.executable, '-c', script], env=env)
+    print('import pysketcher:             %.4f s' % float(output))
+
+    sys.path.insert(0, package_dir)
+    from pysketcher import StochasticWavyCurve
+    t0 = time.time()
+    StochasticWavyCurve()
+    t1 = time.time()
+    for i in range(n):
+        StochasticWavyCurve(curve_no=i % 3, percentage=50)
+    t2 = time.time()
+    print('first StochasticWavyCurve:     %.6f s' % (t1 - t0))
+    print('StochasticWavyCurve:           %.6f s per object' % ((t2 - t1)/n))
+
+if __name__ == '__main__':
+    main()
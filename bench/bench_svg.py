@@ -0,0 +1,83 @@
+"""
+Benchmark of the SVG drawing tool against Matplotlib (Agg).
+
+Times the startup of a fresh Python process that draws one sketch
+(and checks that SVGDraw never imports matplotlib), and the time per
+sketch when the same sketch is drawn and saved many times: as SVG by
+SVGDraw, and as SVG and PNG by MatplotlibDraw.
+
+Usage::
+
+    python bench_svg.py            # 20 repetitions
+    python bench_svg.py 100
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, shutil, tempfile, subprocess
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, root)
+os.environ.setdefault('PYSKETCHER_BACKEND', 'Agg')
+from pysketcher import *
+
+startup = '''
+import sys
+from pysketcher import *
+use_drawing_tool(%r)
+drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+Circle((5, 2), 1).draw()
+drawing_tool.savefig(%r)
+print('matplotlib' in sys.modules)
+'''
+
+
+def sketch():
+    drawing_tool.erase()
+    shapes = {}
+    for i in range(20):
+        wheel = Circle((0.5 + i/2.2, 1), 0.2)
+        wheel.set_filled_curves('blue', pattern='/')
+        shapes['wheel%d' % i] = wheel
+        shapes['spring%d' % i] = Spring((0.5 + i/2.2, 2), 2, width=0.3)
+    shapes['arrow'] = Arrow1((0, 4.5), (10, 4.5), style='<->')
+    Composition(shapes).draw()
+
+
+def timeit(n, func):
+    t0 = time.time()
+    for i in range(n):
+        func()
+    return (time.time() - t0)/n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, 'tmp')
+    env = dict(os.environ, PYTHONPATH=root)
+    try:
+        print('startup + one sketch in a new process (ms):')
+        for tool, ext in ('svg', '.svg'), ('matplotlib', '.png'):
+            t0 = time.time()
+            out = subprocess.check_output(
+                [sys.executable, '-c', startup % (tool, filename + ext)],
+                env=env)
+            print('%24s %8.1f  (matplotlib imported: %s)' %
+                  (tool, 1000*(time.time() - t0), out.decode().strip()))
+
+        print('time per sketch, draw + savefig (ms):')
+        for tool, ext in ('svg', '.svg'), ('matplotlib', '.svg'), \
+                         ('matplotlib', '.png'):
+            use_drawing_tool(tool)
+            drawing_tool.set_coordinate_system(xmin=0, xmax=10,
+                                               ymin=0, ymax=5)
+            def run():
+                sketch()
+                drawing_tool.savefig(filename + ext)
+            run()  # warm up (imports, font cache)
+            print('%24s %8.1f' % ('%s %s' % (tool, ext), 1000*timeit(n, run)))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark of the text cache (``MatplotlibDraw.text_cache``).
+
+A figure with many different texts is drawn and saved twice: first
+with an empty cache (LaTeX is run for every text) and then with the
+cache filled by the first run (as in a later process). A third run
+draws the texts as ordinary Matplotlib texts, without the cache.
+
+Usage::
+
+    python bench_text_cache.py         # 40 texts
+    python bench_text_cache.py 200
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, shutil, tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from pysketcher.MatplotlibDraw import MatplotlibDraw, _latex_installed
+from pysketcher.cache import DiskCache
+
+
+def run(n, cache):
+    tool = MatplotlibDraw(backend='offscreen')
+    tool.text_cache = cache
+    t0 = time.time()
+    tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    tool.set_fontsize(14)
+    for i in range(n):
+        tool.text(r'$F_{%d} = \sqrt{m_{%d} g}$' % (i, i),
+                  (1 + 8.*(i % 5)/5, 1 + 8.*(i//5)/(n//5 + 1)))
+    tool.fig.savefig(os.devnull, format='png')
+    return time.time() - t0
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    directory = tempfile.mkdtemp()
+    try:
+        cache = DiskCache(directory)
+        if not _latex_installed():
+            print('LaTeX is not installed: the cache is not used')
+        print('%d texts, times in seconds' % n)
+        print('%12s %8.3f' % ('no cache', run(n, None)))
+        print('%12s %8.3f' % ('empty cache', run(n, cache)))
+        cache = DiskCache(directory)
+        print('%12s %8.3f' % ('full cache', run(n, cache)))
+        print(cache.stats())
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main()
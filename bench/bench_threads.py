@@ -0,0 +1,85 @@
+"""
+Benchmark of rendering many independent sketches in one process:
+one after the other, and by a pool of threads where each thread draws
+with its own drawing tool (``drawing_context``).
+
+Each sketch is a row of wheels and springs with its own coordinate
+system, drawn by SVGDraw (pure Python: the threads mostly take turns
+on the GIL) and by MatplotlibDraw with an offscreen figure and saved
+as PNG (Agg releases the GIL while it rasterizes). The output of each
+sketch is compared with the sequential output.
+
+Usage::
+
+    python bench_threads.py             # 40 sketches, 4 threads
+    python bench_threads.py 100 8
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, shutil, tempfile
+from multiprocessing.pool import ThreadPool
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, root)
+os.environ.setdefault('PYSKETCHER_BACKEND', 'Agg')
+from pysketcher import *
+
+
+def sketch(i):
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10 + i % 5,
+                                       ymin=0, ymax=5)
+    shapes = {}
+    for j in range(20):
+        wheel = Circle((0.5 + j/2.2, 1), 0.2)
+        wheel.set_filled_curves('blue', pattern='/')
+        shapes['wheel%d' % j] = wheel
+        shapes['spring%d' % j] = Spring((0.5 + j/2.2, 2), 2, width=0.3)
+    shapes['arrow'] = Arrow1((0, 4.5), (10, 4.5), style='<->')
+    Composition(shapes).draw()
+
+
+def render(tool, directory):
+    def render(i):
+        with drawing_context(tool) as t:
+            if tool == 'matplotlib':
+                t.use_offscreen_figure()
+            sketch(i)
+            filename = os.path.join(directory, 'tmp%d.%s' %
+                                    (i, 'png' if tool == 'matplotlib'
+                                     else 'svg'))
+            t.savefig(filename)
+            with open(filename, 'rb') as f:
+                return f.read()
+    return render
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    nthreads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    directory = tempfile.mkdtemp()
+    try:
+        print('%d sketches, time per sketch (ms):' % n)
+        print('%-12s %12s %12s %8s' % ('tool', 'sequential',
+                                       '%d threads' % nthreads, 'same'))
+        for tool in 'svg', 'matplotlib':
+            func = render(tool, directory)
+            func(0)   # warm up (imports, font cache)
+            t0 = time.time()
+            sequential = [func(i) for i in range(n)]
+            t1 = time.time()
+            pool = ThreadPool(nthreads)
+            try:
+                threaded = pool.map(func, range(n))
+            finally:
+                pool.close()
+            t2 = time.time()
+            same = sequential == threaded if tool == 'svg' else \
+                   [len(s) for s in sequential] == [len(s) for s in threaded]
+            print('%-12s %12.1f %12.1f %8s' %
+                  (tool, 1000*(t1 - t0)/n, 1000*(t2 - t1)/n, same))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
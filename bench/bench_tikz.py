@@ -0,0 +1,67 @@
+"""
+Benchmark of the TikZ drawing tool.
+
+Draws and saves a sketch with many curves by TikZDraw with a few
+precisions, and by MatplotlibDraw as PDF and PGF (TikZ/PGF code made
+by Matplotlib), and reports the time and the size of the files.
+
+Usage::
+
+    python bench_tikz.py            # 20 repetitions
+    python bench_tikz.py 100
+"""
+from __future__ import division
+from __future__ import print_function
+import os, sys, time, shutil, tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+os.environ.setdefault('PYSKETCHER_BACKEND', 'Agg')
+from pysketcher import *
+
+
+def sketch():
+    drawing_tool.erase()
+    shapes = {}
+    for i in range(20):
+        wheel = Circle((0.5 + i/2.2, 1), 0.2)
+        wheel.set_filled_curves('blue', pattern='/')
+        shapes['wheel%d' % i] = wheel
+        shapes['spring%d' % i] = Spring((0.5 + i/2.2, 2), 2, width=0.3)
+    shapes['arrow'] = Arrow1((0, 4.5), (10, 4.5), style='<->')
+    Composition(shapes).draw()
+
+
+def timeit(n, func):
+    t0 = time.time()
+    for i in range(n):
+        func()
+    return (time.time() - t0)/n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, 'tmp')
+    cases = [('tikz', '.tex', dict(precision=p)) for p in (2, 3, 6)] + \
+            [('matplotlib', ext, {}) for ext in ('.pdf', '.pgf')]
+    try:
+        print('%24s %10s %10s' % ('draw + savefig', 'time (ms)', 'size (kB)'))
+        for tool, ext, kwargs in cases:
+            use_drawing_tool(tool, **kwargs)
+            drawing_tool.set_coordinate_system(xmin=0, xmax=10,
+                                               ymin=0, ymax=5)
+            def run():
+                sketch()
+                drawing_tool.savefig(filename + ext)
+            run()  # warm up (imports)
+            t = timeit(n, run)
+            name = '%s %s %s' % (tool, ext, ' '.join(
+                '%s=%s' % item for item in kwargs.items()))
+            print('%24s %10.1f %10.1f' % (name, 1000*t,
+                  os.path.getsize(filename + ext)/1024.))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +0,0 @@
-"""
-Convert matplotlib figures to tikz:
-https://github.com/nschloe/matplotlib2tikz
-"""
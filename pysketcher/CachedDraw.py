@@ -0,0 +1,323 @@
+from __future__ import division
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import absolute_import
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from builtins import object
+
+import os, sys, hashlib, shutil, tempfile, importlib
+import numpy as np
+from .cache import DiskCache, default_cache_dir
+from .DrawingTool import DrawingTool
+
+# Attributes that belong to the CachedDraw object itself; other
+# attributes are set on, and read from, the wrapped tool
+_own_attributes = frozenset((
+    'tool', 'cache', 'screen', 'hits', 'misses', 'instruction_file',
+    'chord_tolerance', 'xmin', 'xmax', 'ymin', 'ymax', 'xrange', 'yrange',
+    'axis', 'xsize', 'ysize', 'linecolor', 'linewidth', 'linestyle',
+    'fillcolor', 'fillpattern', 'fontsize', 'arrow_head_width'))
+
+
+class CachedDraw(DrawingTool):
+    """
+    Drawing tool that wraps another drawing tool (`tool`: a name in
+    ``drawing_tools``, constructed with `kwargs`, or a tool object,
+    default $PYSKETCHER_CACHED_TOOL or 'matplotlib') and caches the
+    files it saves. Meant for builds of documents with many figures
+    that seldom change::
+
+        Terminal> PYSKETCHER_DRAWING_TOOL=cached python beam.py
+
+    The drawing primitives (curves with their coordinates, texts,
+    styles, coordinate system, title) are not sent to the wrapped
+    tool, but recorded and hashed. ``savefig`` looks up the hash of
+    the figure, together with the file extension, dpi, crop, the
+    options of the wrapped tool and the versions of its code and
+    Python packages (``cache_packages``), in `cache` (default: the
+    figures directory of ``default_cache_dir()``). If the figure has
+    been saved before, the files are copied from the cache and the
+    wrapped tool never draws the figure (Matplotlib is not even
+    imported). Otherwise the recorded primitives are replayed in the
+    wrapped tool, which saves the files, and the files are stored in
+    the cache.
+
+    Reading or calling anything of the wrapped tool that is not part
+    of the DrawingTool interface (e.g. ``drawing_tool.ax``) makes the
+    wrapped tool draw the figure and turns the cache off until the
+    next ``set_coordinate_system``, as does an `instruction_file`.
+    Global state outside pysketcher, such as Matplotlib's rcParams,
+    is not part of the hash.
+
+    ============ ====================================================
+    Attribute    Description
+    ============ ====================================================
+    tool         the wrapped drawing tool
+    cache        DiskCache where the files are stored (None: no cache)
+    screen       True: ``display`` shows the figure by the wrapped
+                 tool (default False: figures are only saved)
+    hits         no of savefig calls that copied the files from cache
+    misses       no of savefig calls that rendered the figure
+    ============ ====================================================
+    """
+    def __init__(self, tool=None, cache=None, **kwargs):
+        from .shapes import _make_tool
+        DrawingTool.__init__(self)
+        if tool is None:
+            tool = os.environ.get('PYSKETCHER_CACHED_TOOL', 'matplotlib')
+        self.tool = _make_tool(tool, (), kwargs)
+        if cache is None:
+            cache = DiskCache(os.path.join(default_cache_dir(), 'figures'),
+                              maxsize=500*1024**2)
+        self.cache = cache
+        self.screen = False
+        self.hits = self.misses = 0
+        self._versions = None   # part of the keys (see _key)
+        self._attributes = {}   # attributes set on the wrapped tool
+        self._state = []        # calls since set_coordinate_system
+        self._pending = []      # calls not sent to the wrapped tool
+        self._synced = True     # wrapped tool has the coordinate system
+        self._bypass = False    # cache turned off for this figure
+        self._hash = hashlib.sha1()
+
+    def __getattr__(self, name):
+        # Only called when `name` is not found in the object
+        if name.startswith('_') or name in _own_attributes:
+            raise AttributeError(name)
+        self._sync()
+        self._bypass = True  # the wrapped tool is used directly
+        return getattr(self.tool, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith('_') or name in _own_attributes:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.tool, name, value)
+            self._attributes[name] = _serialize(value)
+            self._hash.update(('%s=' % name).encode('utf-8') +
+                              self._attributes[name])
+
+    def _call(self, name, args=(), kwargs={}, state=False):
+        """
+        Record the call ``tool.name(*args, **kwargs)``. The call
+        is part of the state after ``erase`` if `state` is true.
+        """
+        call = (name, args, kwargs)
+        self._pending.append(call)
+        if state:
+            self._state.append(call)
+        self._hash.update(_serialize(call))
+
+    def _restart_hash(self):
+        """Hash of the attributes and the state (after erase)."""
+        self._hash = hashlib.sha1()
+        for name in sorted(self._attributes):
+            self._hash.update(('%s=' % name).encode('utf-8') +
+                              self._attributes[name])
+        for call in self._state:
+            self._hash.update(_serialize(call))
+
+    def _sync(self):
+        """Send the recorded calls to the wrapped tool."""
+        pending, self._pending = self._pending, []
+        for name, args, kwargs in pending:
+            getattr(self.tool, name)(*args, **kwargs)
+        self._synced = True
+
+    def set_coordinate_system(self, xmin, xmax, ymin, ymax, axis=False,
+                              instruction_file=None, new_figure=True,
+                              xkcd=False):
+        DrawingTool.set_coordinate_system(self, xmin, xmax, ymin, ymax,
+                                          axis)
+        self._state = []
+        self._pending = []
+        self._synced = False
+        self._bypass = instruction_file is not None
+        self._restart_hash()
+        self._call('set_coordinate_system', (xmin, xmax, ymin, ymax),
+                   dict(axis=axis, instruction_file=instruction_file,
+                        new_figure=new_figure, xkcd=xkcd), state=True)
+
+    def adjust_coordinate_system(self, minmax, occupation_percent=80):
+        DrawingTool.adjust_coordinate_system(self, minmax,
+                                             occupation_percent)
+        self._call('adjust_coordinate_system',
+                   (dict(minmax), occupation_percent), state=True)
+
+    def set_linecolor(self, color):
+        DrawingTool.set_linecolor(self, color)
+        self._call('set_linecolor', (color,), state=True)
+
+    def set_linestyle(self, style):
+        DrawingTool.set_linestyle(self, style)
+        self._call('set_linestyle', (style,), state=True)
+
+    def set_linewidth(self, width):
+        DrawingTool.set_linewidth(self, width)
+        self._call('set_linewidth', (width,), state=True)
+
+    def set_filled_curves(self, color='', pattern=''):
+        DrawingTool.set_filled_curves(self, color, pattern)
+        self._call('set_filled_curves', (color, pattern), state=True)
+
+    def set_fontsize(self, fontsize=18):
+        DrawingTool.set_fontsize(self, fontsize)
+        self._call('set_fontsize', (fontsize,), state=True)
+
+    def set_grid(self, on=False):
+        self._call('set_grid', (on,), state=True)
+
+    def erase(self):
+        if self._synced:
+            self._call('erase')
+        else:
+            # Nothing drawn by the wrapped tool: just restart from the state
+            self._pending = list(self._state)
+        self._restart_hash()
+
+    def plot_curve(self, x, y,
+                   linestyle=None, linewidth=None,
+                   linecolor=None, arrow=None,
+                   fillcolor=None, fillpattern=None,
+                   shadow=0, name=None):
+        # Copies, since shapes may later move their arrays in-place
+        self._call('plot_curve', (np.array(x, dtype=float),
+                                  np.array(y, dtype=float)),
+                   dict(linestyle=linestyle, linewidth=linewidth,
+                        linecolor=linecolor, arrow=arrow,
+                        fillcolor=fillcolor, fillpattern=fillpattern,
+                        shadow=shadow, name=name))
+
+    def plot_curves(self, segments,
+                    linestyle=None, linewidth=None,
+                    linecolor=None, arrow=None,
+                    fillcolor=None, fillpattern=None,
+                    shadow=0):
+        self._call('plot_curves',
+                   ([np.array(xy, dtype=float) for xy in segments],),
+                   dict(linestyle=linestyle, linewidth=linewidth,
+                        linecolor=linecolor, arrow=arrow,
+                        fillcolor=fillcolor, fillpattern=fillpattern,
+                        shadow=shadow))
+
+    def text(self, text, position, alignment='center', fontsize=0,
+             arrow_tip=None, bgcolor=None, fgcolor=None, fontfamily=None):
+        self._call('text', (text, tuple(position)),
+                   dict(alignment=alignment, fontsize=fontsize,
+                        arrow_tip=None if arrow_tip is None
+                                  else tuple(arrow_tip),
+                        bgcolor=bgcolor, fgcolor=fgcolor,
+                        fontfamily=fontfamily))
+
+    def display(self, title=None, show=True):
+        """
+        Record the title. The figure is only shown (drawn by the
+        wrapped tool) if `show` and the ``screen`` attribute are true.
+        """
+        show = bool(show and self.screen)
+        self._call('display', (), dict(title=title, show=show))
+        if show:
+            self._sync()
+
+    def use_offscreen_figure(self):
+        self.tool.use_offscreen_figure()
+
+    def close(self):
+        if hasattr(self.tool, 'close'):
+            self.tool.close()
+
+    def _key(self, kind, *options):
+        """Return the cache key of the current figure."""
+        if self._versions is None:
+            cls = self.tool.__class__
+            module = sys.modules[cls.__module__]
+            with open(os.path.splitext(module.__file__)[0] + '.py',
+                      'rb') as f:
+                source = hashlib.sha1(f.read()).hexdigest()
+            settings = sorted((name, value) for name, value in
+                              vars(self.tool).items()
+                              if not name.startswith('_') and
+                              isinstance(value, (str, int, float, bool)))
+            self._versions = (cls.__name__, source, repr(settings)) + \
+                tuple('%s-%s' % (package, _package_version(package))
+                      for package in cls.cache_packages)
+        return (kind, self._hash.hexdigest()) + tuple(
+            repr(option) for option in options) + self._versions
+
+    def savefig(self, filename, dpi=None, crop=True, **kwargs):
+        """
+        Save the figure as the wrapped tool does (e.g. in several
+        formats if `filename` has no extension), from the cache if
+        the same figure has been saved before.
+        """
+        if self._bypass or self.cache is None:
+            self._sync()
+            return self.tool.savefig(filename, dpi=dpi, crop=crop, **kwargs)
+        directory, basename = os.path.split(filename)
+        stem, ext = os.path.splitext(basename)
+        key = self._key('savefig', ext, dpi, crop, sorted(kwargs.items()))
+        files = self.cache.get(key)
+        if files is None:
+            self.misses += 1
+            files = {}
+            self._sync()
+            tmpdir = tempfile.mkdtemp()
+            try:
+                self.tool.savefig(os.path.join(tmpdir, basename),
+                                  dpi=dpi, crop=crop, **kwargs)
+                for name in os.listdir(tmpdir):
+                    if name.startswith(stem + '.'):
+                        with open(os.path.join(tmpdir, name), 'rb') as f:
+                            files[name[len(stem)+1:]] = np.frombuffer(
+                                f.read(), dtype=np.uint8)
+            finally:
+                shutil.rmtree(tmpdir)
+            self.cache.put(key, files)
+        else:
+            self.hits += 1
+        for suffix in files:
+            with open(os.path.join(directory, '%s.%s' % (stem, suffix)),
+                      'wb') as f:
+                f.write(files[suffix].tobytes())
+
+    def figure_bytes(self, formats, dpi=None, crop=True):
+        """As ``savefig``, for the figure in memory."""
+        if self._bypass or self.cache is None:
+            self._sync()
+            return self.tool.figure_bytes(formats, dpi=dpi, crop=crop)
+        key = self._key('figure_bytes', tuple(formats), dpi, crop)
+        data = self.cache.get(key)
+        if data is None:
+            self.misses += 1
+            self._sync()
+            data = self.tool.figure_bytes(formats, dpi=dpi, crop=crop)
+            self.cache.put(key, dict(
+                (format, np.frombuffer(data[format], dtype=np.uint8))
+                for format in data))
+            return data
+        self.hits += 1
+        return dict((format, data[format].tobytes()) for format in data)
+
+
+def _serialize(value):
+    """Return `value` (call, array, list, ...) as bytes for hashing."""
+    if isinstance(value, np.ndarray):
+        return ('array%s%s:' % (value.dtype.str, value.shape)).encode(
+            'utf-8') + np.ascontiguousarray(value).tobytes()
+    if isinstance(value, (list, tuple)):
+        return b'(' + b','.join(_serialize(v) for v in value) + b')'
+    if isinstance(value, dict):
+        return b'{' + b','.join(
+            ('%s:' % name).encode('utf-8') + _serialize(value[name])
+            for name in sorted(value)) + b'}'
+    return repr(value).encode('utf-8')
+
+def _package_version(name):
+    """Version of the installed package `name` (not imported if possible)."""
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return getattr(importlib.import_module(name), '__version__', '?')
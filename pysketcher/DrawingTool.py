@@ -0,0 +1,248 @@
+from __future__ import division
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import absolute_import
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from builtins import object
+
+from . import profiling
+
+
+class DrawingTool(object):
+    """
+    Base class for the drawing tools (backends). The shapes talk to
+    the drawing tool through ``plot_curve``, ``plot_curves``, ``text``,
+    ``set_coordinate_system``, ``erase``, ``display`` and ``savefig``,
+    and they use the attributes xmin, xmax, ymin, ymax, xrange and
+    yrange. This class holds the bookkeeping that is common to all
+    drawing tools (coordinate system, line properties) and default
+    versions of the methods that only some tools need (animation
+    frames, batching).
+
+    A subclass must implement ``plot_curve``, ``text``, ``erase``,
+    ``display`` and ``savefig``, and extend ``set_coordinate_system``.
+    """
+
+    # Colors are stored as these codes (the Matplotlib ones) in
+    # Curve objects, so all tools must understand them
+    line_colors = {'red': 'r', 'green': 'g', 'blue': 'b', 'cyan': 'c',
+                   'magenta': 'm', 'purple': 'p',
+                   'yellow': 'y', 'black': 'k', 'white': 'w',
+                   'brown': 'brown', '': ''}
+
+    # Python packages whose version affects the files made by the tool
+    # (part of the cache keys of CachedDraw)
+    cache_packages = ()
+
+    def __init__(self):
+        self.instruction_file = None
+        self.chord_tolerance = None  # fixed resolution of curved shapes
+
+    def ok(self):
+        """
+        Return True if set_coordinate_system is called and
+        objects can be drawn.
+        """
+        return hasattr(self, 'xmin')
+
+    def set_coordinate_system(self, xmin, xmax, ymin, ymax, axis=False,
+                              instruction_file=None, new_figure=True,
+                              xkcd=False):
+        """
+        Define the drawing area [xmin,xmax]x[ymin,ymax] and reset the
+        line properties to their default values.
+        """
+        self.xmin, self.xmax, self.ymin, self.ymax = \
+             float(xmin), float(xmax), float(ymin), float(ymax)
+        self.xrange = self.xmax - self.xmin
+        self.yrange = self.ymax - self.ymin
+        self.axis = axis
+
+        ratio = (self.ymax-self.ymin)/(self.xmax-self.xmin)
+        self.xsize = 800  # pixel size
+        self.ysize = self.xsize*ratio
+
+        # Default properties
+        self.set_linecolor('red')
+        self.set_linewidth(2)
+        self.set_linestyle('solid')
+        self.set_filled_curves()  # no filling
+        self.set_fontsize(14)
+        self.arrow_head_width = 0.2*self.xrange/16
+
+    def tolerance(self):
+        """
+        Return chord_tolerance converted from pixels to the units of
+        the coordinate system, or None if no tolerance is set (or no
+        coordinate system).
+        """
+        if self.chord_tolerance is None or not hasattr(self, 'xsize'):
+            return None
+        return self.chord_tolerance*self.xrange/self.xsize
+
+    def inside(self, pt, exception=False):
+        """Is point pt inside the defined plotting area?"""
+        area = '[%s,%s]x[%s,%s]' % \
+               (self.xmin, self.xmax, self.ymin, self.ymax)
+        tol = 1E-14
+        pt_inside = True
+        if self.xmin - tol <= pt[0] <= self.xmax + tol:
+            pass
+        else:
+            pt_inside = False
+        if self.ymin - tol <= pt[1] <= self.ymax + tol:
+            pass
+        else:
+            pt_inside = False
+        if pt_inside:
+            return pt_inside, 'point=%s is inside plotting area %s' % \
+                   (pt, area)
+        else:
+            msg = 'point=%s is outside plotting area %s' % (pt, area)
+            if exception:
+                raise ValueError(msg)
+            return pt_inside, msg
+
+    def set_linecolor(self, color):
+        """
+        Change the color of lines. Available colors are
+        'black', 'white', 'red', 'blue', 'green', 'yellow',
+        'magenta', 'cyan'.
+        """
+        self.linecolor = self.line_colors[color]
+
+    def set_linestyle(self, style):
+        """Change line style: 'solid', 'dashed', 'dashdot', 'dotted'."""
+        if not style in ('solid', 'dashed', 'dashdot', 'dotted'):
+            raise ValueError('Illegal line style: %s' % style)
+        self.linestyle = style
+
+    def set_linewidth(self, width):
+        """Change the line width (int, starts at 1)."""
+        self.linewidth = width
+
+    def set_filled_curves(self, color='', pattern=''):
+        """
+        Fill area inside curves with specified color and/or pattern.
+        A common pattern is '/' (45 degree lines). Other patterns
+        include '-', '+', 'x', '\\', '*', 'o', 'O', '.'.
+        """
+        if color is False:
+            self.fillcolor = ''
+            self.fillpattern = ''
+        else:
+            self.fillcolor = color if len(color) == 1 else \
+                             self.line_colors[color]
+            self.fillpattern = pattern
+
+    def set_fontsize(self, fontsize=18):
+        """
+        Method for setting a common fontsize for text, unless
+        individually specified when calling ``text``.
+        """
+        self.fontsize = fontsize
+
+    def set_grid(self, on=False):
+        pass
+
+    def adjust_coordinate_system(self, minmax, occupation_percent=80):
+        """
+        Given a dict of xmin, xmax, ymin, ymax values, and a desired
+        filling of the plotting area of `occupation_percent` percent,
+        set new axis limits.
+        """
+        x_range = minmax['xmax'] - minmax['xmin']
+        y_range = minmax['ymax'] - minmax['ymin']
+        x_space = x_range*100./occupation_percent - x_range
+        y_space = y_range*100./occupation_percent - y_range
+        self.xmin = minmax['xmin'] - x_space/2.
+        self.xmax = minmax['xmax'] + x_space/2.
+        self.ymin = minmax['ymin'] - y_space/2.
+        self.ymax = minmax['ymax'] + y_space/2.
+        self.xrange = self.xmax - self.xmin
+        self.yrange = self.ymax - self.ymin
+
+    def plot_curves(self, segments,
+                    linestyle=None, linewidth=None,
+                    linecolor=None, arrow=None,
+                    fillcolor=None, fillpattern=None,
+                    shadow=0):
+        """
+        Define several curves with the same style. `segments` is a
+        list of arrays with the (x,y) points of each curve.
+        """
+        for xy in segments:
+            self.plot_curve(xy[:,0], xy[:,1], linestyle, linewidth,
+                            linecolor, arrow, fillcolor, fillpattern,
+                            shadow)
+
+    # Animation support (see MatplotlibDraw): tools that cannot reuse
+    # drawing primitives between frames just redraw everything
+
+    def begin_frame(self):
+        self.erase()
+
+    def end_frame(self, blit=False):
+        pass
+
+    def end_animation(self):
+        pass
+
+    def use_offscreen_figure(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def figure_bytes(self, formats, dpi=None, crop=True):
+        """
+        Return dict with the figure, as saved by ``savefig``, in each
+        of the `formats` (file extensions such as 'png' or 'svg'), as
+        bytes. This version saves the files in a temporary directory;
+        tools that can encode the figure in memory override it.
+        """
+        import os, shutil, tempfile
+        directory = tempfile.mkdtemp()
+        try:
+            data = {}
+            for format in formats:
+                filename = os.path.join(directory, 'figure.%s' % format)
+                self.savefig(filename, dpi=dpi, crop=crop)
+                with open(filename, 'rb') as f:
+                    data[format] = f.read()
+            return data
+        finally:
+            shutil.rmtree(directory)
+
+    # Profiling of the shapes (see profiling.py)
+
+    def profile(self, on=True):
+        """
+        Turn on (or off, if `on` is False) the recording of calls,
+        time and points per shape class and path when shapes are
+        drawn or transformed (in this thread). Turning it on starts
+        a new profile.
+        """
+        if on:
+            profiling.start()
+        else:
+            profiling.stop()
+
+    def profile_report(self, by='class', sort='time', limit=None,
+                       operation='draw', show=True):
+        """
+        Return (and print, if `show`) a table of the most recent
+        profile of `operation`: calls, time and points per shape
+        class (`by` is 'class') or per path in the tree of shapes
+        (`by` is 'path'), sorted by 'time', 'calls', 'points' or
+        'name', and limited to `limit` rows.
+        """
+        profile = profiling.last_profile()
+        if profile is None:
+            raise ValueError('no profile: call profile() before drawing')
+        report = profile.report(by, operation, sort, limit)
+        if show:
+            print(report)
+        return report
@@ -0,0 +1,331 @@
+from __future__ import division
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import absolute_import
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from builtins import object
+
+import os, shlex, subprocess
+import numpy as np
+from .DrawingTool import DrawingTool
+
+
+class GnuplotDraw(DrawingTool):
+    """
+    Drawing tool that plots with Gnuplot, through a pipe to a
+    gnuplot process. The coordinates of the curves are sent as binary
+    inline data (8-byte floats), and all curves of a figure (or an
+    animation frame) are plotted by one ``plot`` command when
+    ``display`` (or ``end_frame``) is called, which makes this tool
+    suitable for quick previews of animations.
+
+    `command` is the gnuplot command (string or list of arguments),
+    by default $PYSKETCHER_GNUPLOT or ``gnuplot -persist``. Any
+    program that reads gnuplot commands on standard input can be used,
+    e.g. a stand-in script when testing. `terminal` is the terminal
+    for the screen (default: gnuplot's default terminal).
+
+    If `instruction_file` is given to ``set_coordinate_system``,
+    everything sent to gnuplot is also written to that file, which can
+    be replayed by ``gnuplot instruction_file``.
+    """
+    gnuplot_colors = {'r': 'red', 'g': 'green', 'b': 'blue', 'c': 'cyan',
+                      'm': 'magenta', 'p': 'purple', 'y': 'yellow',
+                      'k': 'black', 'w': 'white'}
+    gnuplot_dashtypes = {'solid': 1, 'dashed': 2, 'dotted': 3,
+                         'dashdot': 4}
+    # Gnuplot's fill patterns for Matplotlib's hatches
+    gnuplot_patterns = {'/': 4, '\\': 5, 'x': 1, '+': 1}
+    gnuplot_alignments = {'left': 'left', 'right': 'right'}
+    # Terminals for savefig (%(width)d and %(height)d are pixels)
+    terminals = {
+        '.png': 'pngcairo size %(width)d,%(height)d',
+        '.pdf': 'pdfcairo size %(width)g/100.,%(height)g/100.',
+        '.eps': 'epscairo size %(width)g/100.,%(height)g/100.',
+        '.svg': 'svg size %(width)d,%(height)d',
+        }
+    sync_marker = 'pysketcher-sync'
+
+    def __init__(self, command=None, terminal=None):
+        DrawingTool.__init__(self)
+        if command is None:
+            command = os.environ.get('PYSKETCHER_GNUPLOT',
+                                     'gnuplot -persist')
+        if isinstance(command, str):
+            command = shlex.split(command)
+        self.command = command
+        self.terminal = terminal
+        self.gnuplot = None  # the process, started when first used
+        self.erase()
+
+    def _start(self):
+        self.gnuplot = subprocess.Popen(
+            self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self('set print "-"\n')  # for _sync
+        if self.terminal is not None:
+            self('set terminal %s\n' % self.terminal)
+        self('set terminal push\n')
+
+    def __call__(self, command, data=None):
+        """Send `command` (and binary `data`) to gnuplot."""
+        if self.gnuplot is None:
+            self._start()
+        command = command.encode('utf-8')
+        if data is not None:
+            command += data
+        self.gnuplot.stdin.write(command)
+        if self.instruction_file is not None:
+            self.instruction_file.write(command)
+
+    def _sync(self):
+        """Wait until gnuplot has carried out all commands."""
+        self('print "%s"\n' % self.sync_marker)
+        self.gnuplot.stdin.flush()
+        marker = self.sync_marker.encode('utf-8')
+        while True:
+            line = self.gnuplot.stdout.readline()
+            if not line:
+                raise IOError('%s exited' % ' '.join(self.command))
+            if line.strip() == marker:
+                break
+
+    def close(self):
+        """Stop the gnuplot process."""
+        if self.gnuplot is not None:
+            self('quit\n')
+            self.gnuplot.stdin.close()
+            self.gnuplot.wait()
+            self.gnuplot.stdout.close()
+            self.gnuplot = None
+        if self.instruction_file is not None:
+            self.instruction_file.close()
+            self.instruction_file = None
+
+    def set_coordinate_system(self, xmin, xmax, ymin, ymax, axis=False,
+                              instruction_file=None, new_figure=True,
+                              xkcd=False):
+        """
+        Define the drawing area [xmin,xmax]x[ymin,ymax].
+        axis: None or False means that axes with tickmarks
+        are not drawn.
+        instruction_file: name of file where all the instructions
+        are recorded.
+        """
+        DrawingTool.set_coordinate_system(self, xmin, xmax, ymin, ymax,
+                                          axis)
+        if self.instruction_file is not None:
+            self.instruction_file.close()
+        if instruction_file is not None:
+            self.instruction_file = open(instruction_file, 'wb')
+        else:
+            self.instruction_file = None
+        self.erase()
+        settings = ['set xrange [%.17g:%.17g]' % (self.xmin, self.xmax),
+                    'set yrange [%.17g:%.17g]' % (self.ymin, self.ymax),
+                    'set size ratio -1',  # equal aspect ratio
+                    'unset key']
+        if not axis:
+            settings += ['unset border', 'unset tics',
+                         'set margins 0,0,0,0']
+        self('; '.join(settings) + '\n')
+
+    def erase(self):
+        """Erase the current figure."""
+        self._curves = []    # (plot specification, binary data)
+        self._settings = []  # labels and arrows
+        self.title = None
+
+    def _color(self, color):
+        return self.gnuplot_colors.get(color, color)
+
+    def _line_spec(self, linestyle, linewidth, linecolor):
+        if linecolor == '':
+            return 'lw 0 lc rgb "white"'
+        return 'dt %d lw %g lc rgb "%s"' % (
+            self.gnuplot_dashtypes.get(linestyle, 1), linewidth/2.,
+            self._color(linecolor))
+
+    def _add_curve(self, xy, spec):
+        """Add the (n,2) array `xy` to the plot command."""
+        data = np.ascontiguousarray(xy, dtype='<f8')
+        self._curves.append((
+            "'-' binary record=(%d) format='%%float64%%float64' "
+            "endian=little using 1:2 %s" % (len(data), spec),
+            data.tobytes()))
+
+    def plot_curve(self, x, y,
+                   linestyle=None, linewidth=None,
+                   linecolor=None, arrow=None,
+                   fillcolor=None, fillpattern=None,
+                   shadow=0, name=None):
+        """Define a curve with coordinates x and y (arrays)."""
+        if linestyle is None:
+            # use "global" linestyle
+            linestyle = self.linestyle
+        if linecolor is None:
+            linecolor = self.linecolor
+        if linewidth is None:
+            linewidth = self.linewidth
+        if fillcolor is None:
+            fillcolor = self.fillcolor
+        if fillpattern is None:
+            fillpattern = self.fillpattern
+        if shadow == 1:
+            shadow = 3   # smallest displacement that is visible
+
+        xy = np.column_stack((np.asarray(x, dtype=float),
+                              np.asarray(y, dtype=float)))
+        if shadow:
+            # shadow is given in points (1/72 inch) at 100 pixels/inch
+            offset = shadow*100/72.*self.xrange/self.xsize
+            self._add_curve(xy + [offset, -offset], 'with lines ' +
+                            self._line_spec('solid', linewidth, 'gray'))
+
+        line = self._line_spec(linestyle, linewidth, linecolor)
+        if fillcolor or fillpattern:
+            # The border of the filled area is the curve itself
+            if fillpattern:
+                fill = 'fc rgb "%s" fs transparent pattern %d' % \
+                       (self._color(linecolor),
+                        self.gnuplot_patterns.get(fillpattern[0], 2))
+            else:
+                fill = 'fc rgb "%s" fs solid' % self._color(fillcolor)
+            if linecolor == '':
+                fill += ' noborder'
+            else:
+                fill += ' border lc rgb "%s"' % self._color(linecolor)
+            self._add_curve(xy, 'with filledcurves closed %s %s' %
+                            (line, fill))
+        else:
+            self._add_curve(xy, 'with lines ' + line)
+
+        if arrow:
+            if not arrow in ('->', '<-', '<->'):
+                raise ValueError("arrow argument must be '->', '<-', or '<->', not %s" % repr(arrow))
+            head = {'->': 'head', '<-': 'backhead', '<->': 'heads'}[arrow]
+            # Draw the arrow head(s) along the last (first) segment
+            start, stop = xy[-2], xy[-1]
+            if arrow == '<-':
+                start, stop = xy[0], xy[1]
+            self._settings.append(
+                'set arrow from %.17g,%.17g to %.17g,%.17g %s filled '
+                'size first %.17g,20 lw %g lc rgb "%s" front' %
+                (start[0], start[1], stop[0], stop[1], head,
+                 1.5*self.arrow_head_width, linewidth/2.,
+                 self._color(linecolor)))
+
+    def plot_curves(self, segments,
+                    linestyle=None, linewidth=None,
+                    linecolor=None, arrow=None,
+                    fillcolor=None, fillpattern=None,
+                    shadow=0):
+        """
+        Define several curves with the same style. `segments` is a
+        list of arrays with the (x,y) points of each curve. Curves
+        without filling, arrows and shadow are sent as one data set,
+        with undefined (NaN) points between the curves.
+        """
+        if linestyle is None:
+            linestyle = self.linestyle
+        if linecolor is None:
+            linecolor = self.linecolor
+        if linewidth is None:
+            linewidth = self.linewidth
+        if fillcolor is None:
+            fillcolor = self.fillcolor
+        if fillpattern is None:
+            fillpattern = self.fillpattern
+        if arrow or shadow or fillcolor or fillpattern:
+            DrawingTool.plot_curves(
+                self, segments, linestyle, linewidth, linecolor, arrow,
+                fillcolor, fillpattern, shadow)
+            return
+        gap = np.array([[np.nan, np.nan]])
+        pieces = []
+        for xy in segments:
+            pieces += [xy, gap]
+        self._add_curve(np.concatenate(pieces[:-1]), 'with lines ' +
+                        self._line_spec(linestyle, linewidth, linecolor))
+
+    def text(self, text, position, alignment='center', fontsize=0,
+             arrow_tip=None, bgcolor=None, fgcolor=None, fontfamily=None):
+        """
+        Write `text` string at a position (centered, left, right -
+        according to the `alignment` string). If ``arrow_tip`` is
+        given, an arrow is drawn from the text to that (x,y) point.
+        LaTeX math is shown without the $ signs, and `bgcolor` is
+        ignored.
+        """
+        if fontsize == 0:
+            fontsize = self.fontsize
+        text = text.replace('$', '').replace('\\', '\\\\').replace(
+            '"', '\\"')
+        label = 'set label "%s" at %.17g,%.17g %s font "%s,%d" front' % (
+            text, float(position[0]), float(position[1]),
+            self.gnuplot_alignments.get(alignment, 'center'),
+            fontfamily or '', fontsize)
+        if fgcolor is not None:
+            label += ' textcolor rgb "%s"' % self._color(fgcolor)
+        self._settings.append(label)
+        if arrow_tip is not None:
+            if not len(arrow_tip) == 2:
+                raise ValueError('arrow_tip=%s must be (x,y) pt.' % arrow_tip)
+            self._settings.append(
+                'set arrow from %.17g,%.17g to %.17g,%.17g head lw 1 '
+                'lc rgb "black" front' %
+                (float(position[0]), float(position[1]),
+                 float(arrow_tip[0]), float(arrow_tip[1])))
+
+    def _plot(self):
+        """Send the plot command with all curves of the figure."""
+        commands = ['unset label', 'unset arrow']
+        if self.title is not None:
+            commands.append('set title "%s"' % self.title.replace('"', '\\"'))
+        else:
+            commands.append('unset title')
+        commands += self._settings
+        if self._curves:
+            commands.append('plot ' + ', '.join(
+                spec for spec, data in self._curves))
+        self('\n'.join(commands) + '\n',
+             b''.join(data for spec, data in self._curves))
+
+    def display(self, title=None, show=True):
+        """Display the figure."""
+        if title is not None:
+            self.title = title
+        if show:
+            self._plot()
+            self.gnuplot.stdin.flush()
+
+    def end_frame(self, blit=False):
+        self.display()
+
+    def flush(self):
+        self._sync()
+
+    def savefig(self, filename, dpi=None, crop=True):
+        """
+        Save the figure in `filename` (.png, .pdf, .eps or .svg;
+        default .png). `dpi` scales the size of PNG and SVG files
+        (100 dpi gives 800 pixels in x direction). `crop` is ignored:
+        without axes the coordinate system fills the whole figure.
+        """
+        ext = os.path.splitext(filename)[1]
+        if not ext:
+            ext = '.png'
+            filename += ext
+        if ext not in self.terminals:
+            raise ValueError('%s cannot make %s files (only %s)' %
+                             (self.__class__.__name__, ext,
+                              ', '.join(sorted(self.terminals))))
+        scale = 1 if dpi is None or ext in ('.pdf', '.eps') else dpi/100.
+        terminal = self.terminals[ext] % dict(
+            width=self.xsize*scale, height=self.ysize*scale)
+        self('set terminal %s\nset output "%s"\n' %
+             (terminal, filename.replace('\\', '\\\\').replace('"', '\\"')))
+        self._plot()
+        self('set output\nset terminal pop\nset terminal push\n')
+        self._sync()
@@ -9,21 +9,75 @@ from builtins import str
 from builtins import *
 from builtins import object
 
-import os
-import matplotlib
+import os, sys
+import numpy as np
+from .cache import DiskCache, default_cache_dir
+from .DrawingTool import DrawingTool
 
-matplotlib.use('TkAgg')
-matplotlib.rcParams['text.latex.preamble'] = '\\usepackage{amsmath}'
+# matplotlib is imported when the first figure is made (see
+# MatplotlibDraw._open_figure) such that importing pysketcher and
+# constructing shapes is cheap and works without a display.
+matplotlib = None
+_backend = None  # the backend selected by _import_matplotlib
 
-import matplotlib.pyplot as mpl
-import matplotlib.transforms as transforms
-import numpy as np
+def _import_matplotlib(backend):
+    """
+    Import matplotlib and select `backend`, or switch to `backend` if
+    another backend was selected before (an ImportError tells that
+    the backend cannot be used).
+    """
+    global matplotlib, _backend
+    if matplotlib is None:
+        import matplotlib
+        matplotlib.rcParams['text.latex.preamble'] = '\\usepackage{amsmath}'
+    # Offscreen figures are made without pyplot (any backend)
+    if backend != 'Agg' and backend.lower() != _backend:
+        if 'matplotlib.pyplot' in sys.modules:
+            sys.modules['matplotlib.pyplot'].switch_backend(backend)
+        else:
+            matplotlib.use(backend)
+        _backend = backend.lower()
+    return matplotlib
 
-class MatplotlibDraw(object):
+def _default_backend():
+    """
+    Return the backend in PYSKETCHER_BACKEND, or else 'TkAgg', or
+    'Agg' if there is no display (a Unix machine without X11 or
+    Wayland, e.g. a server or a continuous integration job).
+    """
+    backend = os.environ.get('PYSKETCHER_BACKEND')
+    if backend:
+        return backend
+    if os.name == 'posix' and sys.platform != 'darwin' and \
+           not os.environ.get('DISPLAY') and \
+           not os.environ.get('WAYLAND_DISPLAY'):
+        return 'Agg'
+    return 'TkAgg'
+
+class MatplotlibDraw(DrawingTool):
     """
     Simple interface for plotting. This interface makes use of
     Matplotlib for plotting.
 
+    `backend` is the Matplotlib backend: 'TkAgg' (default) for screen
+    graphics, or 'Agg' (alias 'offscreen') for figures that are only
+    saved to file and need no display (the default when there is no
+    display). The default can be changed by the environment variable
+    PYSKETCHER_BACKEND. Matplotlib is not imported before the first
+    figure is made, i.e., when the first object is drawn after
+    ``set_coordinate_system``.
+
+    `text_cache` is True for the text cache in pysketcher's cache
+    directory, or a DiskCache object (see the attribute below). The
+    default is no cache, unless the environment variable
+    PYSKETCHER_TEXT_CACHE is 1.
+
+    `usetex` tells if LaTeX typesets the texts (default: as set by
+    ``matplotlib.rc('text', usetex=...)`` before the tool is made, or
+    else True if LaTeX is installed; without LaTeX, Matplotlib's
+    mathtext renders $...$). Matplotlib's global rcParams are not
+    changed.
+
     Some attributes that must be controlled directly (no set_* method
     since these attributes are changed quite seldom).
 
@@ -33,28 +87,59 @@ class MatplotlibDraw(object):
     allow_screen_graphics      False means that no plot is shown on
                                the screen. (Does not work yet.)
     arrow_head_width           Size of arrow head.
+    batch_curves               True means that curves are collected and
+                               emitted as one LineCollection/PolyCollection
+                               per group of equally styled curves when
+                               the figure is displayed or saved (see
+                               ``flush``).
+    chord_tolerance            None, or max distance in pixels (on the
+                               screen) between curved shapes (Arc,
+                               Circle, Spring, Wavy) and the line
+                               segments approximating them, used to
+                               choose the no of points when the shapes
+                               are made (see ``tolerance``).
+    usetex                     True if LaTeX typesets the texts.
+    text_cache                 None (default), or DiskCache object (see
+                               pysketcher.cache) where the outlines of
+                               texts typeset by LaTeX are stored, such
+                               that LaTeX is run only once for each
+                               text (across processes). The texts are
+                               then drawn as outlines (not selectable
+                               in PDF and SVG files). Used only when
+                               LaTeX is installed.
     ========================== ============================================
     """
-
-    line_colors = {'red': 'r', 'green': 'g', 'blue': 'b', 'cyan': 'c',
-                   'magenta': 'm', 'purple': 'p',
-                   'yellow': 'y', 'black': 'k', 'white': 'w',
-                   'brown': 'brown', '': ''}
-    def __init__(self):
-        self.instruction_file = None
+    cache_packages = ('matplotlib',)
+
+    def __init__(self, backend=None, text_cache=None, usetex=None):
+        DrawingTool.__init__(self)
+        if backend is None:
+            backend = _default_backend()
+        if backend.lower() in ('agg', 'offscreen'):
+            backend = 'Agg'
+        self.backend = backend
+        self._fig = self._ax = None
+        self._new_figure = None  # pending figure (see _open_figure)
         self.allow_screen_graphics = True  # does not work yet
+        self.batch_curves = False
+        self._batch = []  # pending curve groups in batch mode
+        self._frame = None  # artists of the previous animation frame
+        if text_cache is None:
+            text_cache = os.environ.get('PYSKETCHER_TEXT_CACHE', '0') != '0'
+        if text_cache is True:
+            text_cache = DiskCache(os.path.join(default_cache_dir(), 'text'))
+        self.text_cache = text_cache or None
+        if usetex is None:
+            usetex = _user_usetex()
+        if usetex is None:
+            usetex = _latex_installed()
+        self.usetex = bool(usetex)
 
     def __del__(self):
-        if self.instruction_file:
+        if self.instruction_file and not self.instruction_file.closed:
             self.instruction_file.write('\nmpl.draw()\nraw_input()\n')
             self.instruction_file.close()
 
-    def ok(self):
-        """
-        Return True if set_coordinate_system is called and
-        objects can be drawn.
-        """
-
     def adjust_coordinate_system(self, minmax, occupation_percent=80):
         """
         Given a dict of xmin, xmax, ymin, ymax values, and a desired
@@ -79,70 +164,130 @@ class MatplotlibDraw(object):
         are not drawn.
         instruction_file: name of file where all the instructions
         for the plotting program are stored (useful for debugging
-        a figure or tailoring plots).
+        a figure or tailoring plots). The coordinates of the curves
+        are stored in a file with the same name and extension .npz
+        (see class InstructionFile).
         """
 
         # Close file for previous figure and start new one
         # if not the figure file is the same
-        if self.instruction_file is not None:
-            if instruction_file == self.instruction_file.name:
-                pass  # continue with same file
-            else:
-                self.instruction_file.close()  # make new py file for commands
-
-        self.mpl = mpl
-        if xkcd:
-            self.mpl.xkcd()
-        else:
-            # Allow \boldsymbol{} etc in title, labels, etc
-            matplotlib.rc('text', usetex=True)
-
-        self.xmin, self.xmax, self.ymin, self.ymax = \
-             float(xmin), float(xmax), float(ymin), float(ymax)
-        self.xrange = self.xmax - self.xmin
-        self.yrange = self.ymax - self.ymin
-        self.axis = axis
-
-        # Compute the right X11 geometry on the screen based on the
-        # x-y ratio of axis ranges
-        ratio = (self.ymax-self.ymin)/(self.xmax-self.xmin)
-        self.xsize = 800  # pixel size
-        self.ysize = self.xsize*ratio
-        geometry = '%dx%d' % (self.xsize, self.ysize)
-        # See http://stackoverflow.com/questions/7449585/how-do-you-set-the-absolute-position-of-figure-windows-with-matplotlib
-
-        if isinstance(instruction_file, str):
-            self.instruction_file = open(instruction_file, 'w')
+        if self.instruction_file is not None and \
+               instruction_file == self.instruction_file.name:
+            pass  # continue with same file
         else:
-            self.instruction_file = None
+            if self.instruction_file is not None:
+                self.instruction_file.close()  # make new py file for commands
+            if isinstance(instruction_file, str):
+                self.instruction_file = InstructionFile(instruction_file)
+            else:
+                self.instruction_file = None
 
-        self.mpl.ion()  # important for interactive drawing and animation
+        self.xkcd = xkcd
         if self.instruction_file:
             self.instruction_file.write("""\
 import matplotlib
-matplotlib.use('TkAgg')
-# Allow \boldsymbol{} etc in title, labels, etc
-matplotlib.rc('text', usetex=True)
-matplotlib.rcParams['text.latex.preamble'] = '\\usepackage{amsmath}'
+matplotlib.use('%s')
+# Allow \\boldsymbol{} etc in title, labels, etc
+matplotlib.rc('text', usetex=%s)
+matplotlib.rcParams['text.latex.preamble'] = '\\\\usepackage{amsmath}'
 import matplotlib.pyplot as mpl
 import matplotlib.transforms as transforms
 
 mpl.ion()  # for interactive drawing
-""")
-        # Default properties
-        self.set_linecolor('red')
-        self.set_linewidth(2)
-        self.set_linestyle('solid')
-        self.set_filled_curves()  # no filling
-        self.set_fontsize(14)
-        self.arrow_head_width = 0.2*self.xrange/16
+""" % (self.backend, self.usetex))
+
+        # Area, size of the window (x-y ratio of the axis ranges) and
+        # default properties
+        DrawingTool.set_coordinate_system(self, xmin, xmax, ymin, ymax,
+                                          axis)
 
+        # The figure is made when it is first needed (see _open_figure)
+        self._new_figure = new_figure
+        self._batch = []
+
+    def _get_fig(self):
+        if self._new_figure is not None:
+            self._open_figure()
+        return self._fig
+
+    def _set_fig(self, fig):
+        self._fig = fig
+
+    fig = property(_get_fig, _set_fig,
+                   doc='Matplotlib figure (made when first needed).')
+
+    def _get_ax(self):
+        if self._new_figure is not None:
+            self._open_figure()
+        return self._ax
+
+    def _set_ax(self, ax):
+        self._ax = ax
+
+    ax = property(_get_ax, _set_ax,
+                  doc='Matplotlib axes (made when first needed).')
+
+    def _open_figure(self):
+        """
+        Import matplotlib and make the figure and axes requested by
+        the last call to ``set_coordinate_system``.
+        """
+        new_figure, self._new_figure = self._new_figure, None
+        batch = self._batch  # curves drawn before the figure was needed
+        _import_matplotlib(self.backend)
+        if self.backend != 'Agg':
+            import matplotlib.pyplot as mpl
+            self.mpl = mpl
+        if self.xkcd:
+            import matplotlib.pyplot as mpl
+            mpl.xkcd()
+        if self.backend == 'Agg':
+            if new_figure:
+                # Same pixel size as the screen window
+                dpi = 100.
+                self._fig = _offscreen_figure(
+                    (self.xsize/dpi, self.ysize/dpi), dpi)
+            self._make_axes(new_figure=False)
+            self._batch = batch
+            return
+
+        self.mpl.ion()  # important for interactive drawing and animation
         self._make_axes(new_figure=new_figure)
+        self._batch = batch
 
+        # Compute the right X11 geometry on the screen based on the
+        # x-y ratio of axis ranges
+        # See http://stackoverflow.com/questions/7449585/how-do-you-set-the-absolute-position-of-figure-windows-with-matplotlib
+        geometry = '%dx%d' % (self.xsize, self.ysize)
         manager = self.mpl.get_current_fig_manager()
-        manager.window.wm_geometry(geometry)
+        window = getattr(manager, 'window', None)
+        if hasattr(window, 'wm_geometry'):  # Tk window
+            window.wm_geometry(geometry)
+
+    def use_offscreen_figure(self):
+        """
+        Continue drawing in a new figure of the same size that has no
+        window and is not known to pyplot (rendered by Agg only).
+        Used by worker processes that render movie frames.
+        """
+        if self._new_figure is not None or self._fig is None:
+            # No figure made yet: make the offscreen figure directly
+            self.backend = 'Agg'
+            self._frame = None
+            return
+        self.backend = 'Agg'
+        self._fig = _offscreen_figure(self._fig.get_size_inches(),
+                                      self._fig.dpi)
+        self._frame = None
+        self._make_axes(new_figure=False)
 
     def _make_axes(self, new_figure=False):
+        self._batch = []
+        if self._frame is not None:
+            # Erased in the middle of an animation: make new artists
+            self._frame = []
+            self._frame_pos = 0
+            self._background = None
         if new_figure:
             self.fig = self.mpl.figure()
         self.ax = self.fig.gca()
@@ -151,13 +296,14 @@ mpl.ion()  # for interactive drawing
         self.ax.set_aspect('equal')  # extent of 1 unit is the same on the axes
 
         if not self.axis:
-            self.mpl.axis('off')
+            self.ax.axis('off')
             axis_cmd = "mpl.axis('off')  # do not show axes with tickmarks\n"
         else:
             axis_cmd = ''
 
         if self.instruction_file:
-            fig = 'fig = mpl.figure()\n' if new_figure else ''
+            fig = 'fig = mpl.figure()\n' if new_figure else \
+                  'fig = mpl.gcf()\n'
             self.instruction_file.write("""\
 %s
 ax = fig.gca()
@@ -169,76 +315,14 @@ ax.set_aspect('equal')
 
 """ % (fig, self.xmin, self.xmax, self.ymin, self.ymax, axis_cmd))
 
-    def inside(self, pt, exception=False):
-        """Is point pt inside the defined plotting area?"""
-        area = '[%s,%s]x[%s,%s]' % \
-               (self.xmin, self.xmax, self.ymin, self.ymax)
-        tol = 1E-14
-        pt_inside = True
-        if self.xmin - tol <= pt[0] <= self.xmax + tol:
-            pass
-        else:
-            pt_inside = False
-        if self.ymin - tol <= pt[1] <= self.ymax + tol:
-            pass
-        else:
-            pt_inside = False
-        if pt_inside:
-            return pt_inside, 'point=%s is inside plotting area %s' % \
-                   (pt, area)
-        else:
-            msg = 'point=%s is outside plotting area %s' % (pt, area)
-            if exception:
-                raise ValueError(msg)
-            return pt_inside, msg
-
-    def set_linecolor(self, color):
-        """
-        Change the color of lines. Available colors are
-        'black', 'white', 'red', 'blue', 'green', 'yellow',
-        'magenta', 'cyan'.
-        """
-        self.linecolor = MatplotlibDraw.line_colors[color]
-
-    def set_linestyle(self, style):
-        """Change line style: 'solid', 'dashed', 'dashdot', 'dotted'."""
-        if not style in ('solid', 'dashed', 'dashdot', 'dotted'):
-            raise ValueError('Illegal line style: %s' % style)
-        self.linestyle = style
-
-    def set_linewidth(self, width):
-        """Change the line width (int, starts at 1)."""
-        self.linewidth = width
-
-    def set_filled_curves(self, color='', pattern=''):
-        """
-        Fill area inside curves with specified color and/or pattern.
-        A common pattern is '/' (45 degree lines). Other patterns
-        include '-', '+', 'x', '\\', '*', 'o', 'O', '.'.
-        """
-        if color is False:
-            self.fillcolor = ''
-            self.fillpattern = ''
-        else:
-            self.fillcolor = color if len(color) == 1 else \
-                         MatplotlibDraw.line_colors[color]
-            self.fillpattern = pattern
-
-    def set_fontsize(self, fontsize=18):
-        """
-        Method for setting a common fontsize for text, unless
-        individually specified when calling ``text``.
-        """
-        self.fontsize = fontsize
-
     def set_grid(self, on=False):
-        self.mpl.grid(on)
+        self.ax.grid(on)
         if self.instruction_file:
             self.instruction_file.write("\nmpl.grid(%s)\n" % str(on))
 
     def erase(self):
         """Erase the current figure."""
-        self.mpl.delaxes()
+        self.fig.delaxes(self.ax)
         if self.instruction_file:
             self.instruction_file.write("\nmpl.delaxes()  # erase\n")
 
@@ -255,8 +339,8 @@ ax.set_aspect('equal')
         #else:
         #    mpl.ion()
 
-        self.xdata = np.asarray(x, dtype=np.float)
-        self.ydata = np.asarray(y, dtype=np.float)
+        self.xdata = np.asarray(x, dtype=float)
+        self.ydata = np.asarray(y, dtype=float)
 
         if linestyle is None:
             # use "global" linestyle
@@ -275,29 +359,54 @@ ax.set_aspect('equal')
         # We can plot fillcolor/fillpattern, arrow or line
 
         if self.instruction_file:
-            import pprint
             if name is not None:
                 self.instruction_file.write('\n# %s\n' % name)
-            if not arrow:
-                self.instruction_file.write(
-                    'x = %s\n' % pprint.pformat(self.xdata.tolist()))
-                self.instruction_file.write(
-                    'y = %s\n' % pprint.pformat(self.ydata.tolist()))
+            self.instruction_file.write_array('x', self.xdata)
+            self.instruction_file.write_array('y', self.ydata)
 
+        # In batch mode the curve is only recorded here and later
+        # emitted as part of a collection (see flush). Shadows need
+        # their own offset transform and are always drawn directly.
+        batch = self.batch_curves and not shadow and linecolor != ''
 
         if fillcolor or fillpattern:
             if fillpattern != '':
                 fillcolor = 'white'
             #print('%d coords, fillcolor="%s" linecolor="%s" fillpattern="%s"' % (x.size, fillcolor, linecolor, fillpattern))
-            [line] = self.ax.fill(x, y, fillcolor, edgecolor=linecolor,
-                                  linewidth=linewidth, hatch=fillpattern)
+            if batch:
+                self._add_to_batch(
+                    self._batch_key(linestyle, linewidth, linecolor,
+                                    fillcolor, fillpattern),
+                    [np.column_stack((self.xdata, self.ydata))])
+            else:
+                style = (fillcolor, linecolor, linewidth, fillpattern)
+                data = (self.xdata, self.ydata)
+                line = self._reuse('fill', style, data)
+                if line is None:
+                    [line] = self.ax.fill(x, y, fillcolor,
+                                          edgecolor=linecolor,
+                                          linewidth=linewidth,
+                                          hatch=fillpattern)
+                    self._record('fill', style, data, line)
             if self.instruction_file:
                 self.instruction_file.write("[line] = ax.fill(x, y, '%s', edgecolor='%s', linewidth=%d, hatch='%s')\n" % (fillcolor, linecolor, linewidth, fillpattern))
 
+        elif batch:
+            self._add_to_batch(
+                self._batch_key(linestyle, linewidth, linecolor,
+                                fillcolor, fillpattern),
+                [np.column_stack((self.xdata, self.ydata))])
+            if self.instruction_file:
+                self.instruction_file.write("[line] = ax.plot(x, y, '%s', linewidth=%d, linestyle='%s')\n" % (linecolor, linewidth, linestyle))
         else:
             # Plain line
-            [line] = self.ax.plot(x, y, linecolor, linewidth=linewidth,
-                                  linestyle=linestyle)
+            style = (linecolor, linewidth, linestyle)
+            data = (self.xdata, self.ydata)
+            line = self._reuse('line', style, data)
+            if line is None:
+                [line] = self.ax.plot(x, y, linecolor, linewidth=linewidth,
+                                      linestyle=linestyle)
+                self._record('line', style, data, line)
             if self.instruction_file:
                 self.instruction_file.write("[line] = ax.plot(x, y, '%s', linewidth=%d, linestyle='%s')\n" % (linecolor, linewidth, linestyle))
 
@@ -323,6 +432,7 @@ ax.set_aspect('equal')
             # http://matplotlib.sourceforge.net/users/transforms_tutorial.html#using-offset-transforms-to-create-a-shadow-effect
             # shift the object over 2 points, and down 2 points
             dx, dy = shadow/72., -shadow/72.
+            import matplotlib.transforms as transforms
             offset = transforms.ScaledTranslation(
                 dx, dy, self.fig.dpi_scale_trans)
             shadow_transform = self.ax.transData + offset
@@ -330,9 +440,14 @@ ax.set_aspect('equal')
             # use the zorder to make sure we are below the line
             if linewidth is None:
                 linewidth = 3
-            self.ax.plot(x, y, linewidth=linewidth, color='gray',
-                         transform=shadow_transform,
-                         zorder=0.5*line.get_zorder())
+            style = (linewidth, shadow)
+            data = (self.xdata, self.ydata)
+            if self._reuse('shadow', style, data) is None:
+                [shadow_line] = self.ax.plot(
+                    x, y, linewidth=linewidth, color='gray',
+                    transform=shadow_transform,
+                    zorder=0.5*line.get_zorder())
+                self._record('shadow', style, data, shadow_line)
 
 
             if self.instruction_file:
@@ -347,61 +462,327 @@ self.ax.plot(x, y, linewidth=%d, color='gray',
 """ % linewidth)
 
 
+    def plot_curves(self, segments,
+                    linestyle=None, linewidth=None,
+                    linecolor=None, arrow=None,
+                    fillcolor=None, fillpattern=None,
+                    shadow=0):
+        """
+        Define several curves with the same style. `segments` is a
+        list of arrays with the (x,y) points of each curve. In batch
+        mode (``batch_curves``) all the curves are added to a group
+        in one operation, otherwise ``plot_curve`` is called for each
+        curve.
+        """
+        if self.batch_curves and not shadow and not arrow and \
+               not self.instruction_file:
+            if linestyle is None:
+                linestyle = self.linestyle
+            if linecolor is None:
+                linecolor = self.linecolor
+            if linewidth is None:
+                linewidth = self.linewidth
+            if fillcolor is None:
+                fillcolor = self.fillcolor
+            if fillpattern is None:
+                fillpattern = self.fillpattern
+            if linecolor != '':
+                self._add_to_batch(
+                    self._batch_key(linestyle, linewidth, linecolor,
+                                    fillcolor, fillpattern), segments)
+                return
+        for xy in segments:
+            self.plot_curve(xy[:,0], xy[:,1], linestyle, linewidth,
+                            linecolor, arrow, fillcolor, fillpattern,
+                            shadow)
+
+    def _batch_key(self, linestyle, linewidth, linecolor,
+                   fillcolor, fillpattern):
+        """Return the style of a curve in batch mode (see flush)."""
+        if fillcolor or fillpattern:
+            if fillpattern != '':
+                fillcolor = 'white'
+            return ('fill', fillcolor, linecolor, linewidth, fillpattern,
+                    'solid')
+        return ('line', linecolor, linewidth, linestyle)
+
+    def _add_to_batch(self, key, segments):
+        """
+        Record curves (`segments` is a list of arrays of (x,y) points)
+        in batch mode. The curves join the latest group of the same kind
+        ('line' or 'fill') if the style `key` is the same, otherwise a
+        new group is started. Only consecutive curves are merged so that the
+        stacking order of overlapping curves is preserved.
+        """
+        for group_key, group in reversed(self._batch):
+            if group_key[0] == key[0]:
+                if group_key == key:
+                    group.extend(segments)
+                    return
+                break
+        self._batch.append((key, list(segments)))
+
+    def flush(self):
+        """
+        Emit the curves collected in batch mode (``batch_curves``)
+        as one LineCollection or PolyCollection per group of equally
+        styled curves. Called by ``display`` and ``savefig``.
+        """
+        if self._batch:
+            from matplotlib.collections import LineCollection, PolyCollection
+        for key, segments in self._batch:
+            kind = 'polys' if key[0] == 'fill' else 'lines'
+            if self._reuse(kind, key, segments) is not None:
+                continue
+            if kind == 'polys':
+                kind_, fillcolor, linecolor, linewidth, fillpattern, \
+                       linestyle = key
+                collection = PolyCollection(
+                    segments, facecolors=fillcolor, edgecolors=linecolor,
+                    linewidths=linewidth, linestyles=linestyle,
+                    hatch=fillpattern or None)
+            else:
+                kind_, linecolor, linewidth, linestyle = key
+                # Same cap and join style as for lines from ax.plot
+                capstyle = 'projecting' if linestyle == 'solid' else 'butt'
+                collection = LineCollection(
+                    segments, colors=linecolor, linewidths=linewidth,
+                    linestyles=linestyle, capstyle=capstyle,
+                    joinstyle='round')
+            self.ax.add_collection(collection, autolim=False)
+            self._record(kind, key, segments, collection)
+        self._batch = []
+
+    def begin_frame(self):
+        """
+        Start a new frame in an animation where the artists from the
+        previous frame are reused. Drawing primitives (curves, arrows,
+        texts) are matched with the previous frame in the order they
+        are drawn, and a matching artist just gets its coordinates
+        updated (set_data, set_xy, set_position) if they have changed.
+        The first frame erases the figure and creates all artists.
+        """
+        if self._frame is None:
+            self.erase()
+            self._frame = []
+            self._frame_no = 0
+            self._background = None
+        else:
+            self._frame_no += 1
+        self._frame_pos = 0
+        self._dirty = []
+
+    def end_frame(self, blit=False):
+        """
+        Finish a frame started by ``begin_frame``: remove artists that
+        were not drawn in this frame. With `blit` true, the artists that
+        have changed since the first frame are redrawn on top of a
+        cached background with all the static artists, instead of
+        redrawing the whole figure.
+        """
+        self.flush()
+        for kind, style, data, artist in self._frame[self._frame_pos:]:
+            artist.remove()
+        del self._frame[self._frame_pos:]
+        if blit:
+            self._blit()
+
+    def end_animation(self):
+        """Stop reusing artists between frames (see ``begin_frame``)."""
+        if self._frame is not None:
+            for kind, style, data, artist in self._frame:
+                artist.set_animated(False)
+        self._frame = None
+        self._background = None
+
+    def _reuse(self, kind, style, data):
+        """
+        Between ``begin_frame`` and ``end_frame``: return the artist
+        of the next drawing primitive in the previous frame if it has
+        the same `kind` and `style`, after updating it with `data`.
+        Otherwise (and outside animations) return None, and the caller
+        must make a new artist and register it by ``_record``.
+        """
+        if self._frame is None:
+            return None
+        pos = self._frame_pos
+        self._frame_pos += 1
+        if pos < len(self._frame):
+            old_kind, old_style, old_data, artist = self._frame[pos]
+            if old_kind == kind and old_style == style:
+                if not _same_data(data, old_data):
+                    _update_artist(kind, artist, data)
+                    self._frame[pos] = (kind, style, _copy_data(data), artist)
+                    self._dirty.append(artist)
+                return artist
+            # The figure has changed: draw the rest of it from scratch
+            for entry in self._frame[pos:]:
+                entry[3].remove()
+            del self._frame[pos:]
+        return None
+
+    def _record(self, kind, style, data, artist):
+        """Register a new artist in the current animation frame."""
+        if self._frame is not None:
+            self._frame.append((kind, style, _copy_data(data), artist))
+            if self._frame_no > 0:
+                self._dirty.append(artist)
+
+    def _blit(self):
+        """Redraw only the changing artists of an animation."""
+        canvas = self.fig.canvas
+        new_dynamic = [a for a in self._dirty if not a.get_animated()]
+        for artist in new_dynamic:
+            artist.set_animated(True)
+        if new_dynamic or self._background is None:
+            # Make a new background with the static artists
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(self.fig.bbox)
+        else:
+            canvas.restore_region(self._background)
+        dynamic = [entry[3] for entry in self._frame
+                   if entry[3].get_animated()]
+        dynamic.sort(key=lambda artist: artist.get_zorder())
+        for artist in dynamic:
+            self.ax.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
 
     def display(self, title=None, show=True):
         """Display the figure."""
+        self.flush()
         if title is not None:
-            self.mpl.title(title)
+            self.ax.set_title(title, usetex=self._usetex())
             if self.instruction_file:
                 self.instruction_file.write('mpl.title("%s")\n' % title)
 
         if show:
-            self.mpl.draw()
+            self.fig.canvas.draw_idle()
 
         if self.instruction_file:
             self.instruction_file.write('mpl.draw()\n')
 
-    def savefig(self, filename, dpi=None, crop=True):
-        """Save figure in file. Set dpi=300 for really high resolution."""
+    def savefig(self, filename, dpi=None, crop=True,
+                formats=('png', 'pdf'), threads=True):
+        """
+        Save figure in file. Set dpi=300 for really high resolution.
+        With `crop` true, the white space around PNG and PDF figures
+        is removed: a PNG image is trimmed to the pixels that differ
+        from the color of the corners (as ``convert -trim`` does), and
+        a PDF file gets the tight bounding box of the drawing (as with
+        ``pdfcrop``).
+
+        If `filename` has no extension, the figure is saved in all
+        the `formats` (e.g. 'png', 'pdf', 'svg'). The figure is then
+        rendered once as an image, which also gives the crop box of
+        the vector formats, and the files are encoded and written in
+        parallel threads if `threads` is true (see ``_export``).
+        """
+        self.flush()
         # If filename is without extension, generate all important formats
         ext = os.path.splitext(filename)[1]
         if not ext:
-            # Create both PNG and PDF file
-            self.mpl.savefig(filename + '.png', dpi=dpi)
-            self.mpl.savefig(filename + '.pdf')
-            if crop:
-                # Crop the PNG file
-                failure = os.system('convert -trim %s.png %s.png' %
-                                    (filename, filename))
-                if failure:
-                    print('convert from ImageMagick is not installed - needed for cropping PNG files')
-                failure = os.system('pdfcrop %s.pdf %s.pdf' %
-                                    (filename, filename))
-                if failure:
-                    print('pdfcrop is not installed - needed for cropping PDF files')
+            self._export(filename, formats, dpi, crop, threads)
             #self.mpl.savefig(filename + '.eps')
             if self.instruction_file:
-                self.instruction_file.write('mpl.savefig("%s.png", dpi=%s)\n'
-                                            % (filename, dpi))
-                self.instruction_file.write('mpl.savefig("%s.pdf")\n'
-                                            % filename)
+                for format in formats:
+                    if format == 'png':
+                        self.instruction_file.write(
+                            'mpl.savefig("%s.png", dpi=%s)\n' %
+                            (filename, dpi))
+                    else:
+                        self.instruction_file.write(
+                            'mpl.savefig("%s.%s")\n' % (filename, format))
         else:
-            self.mpl.savefig(filename, dpi=dpi)
-            if ext == '.png':
-                if crop:
-                    failure = os.system('convert -trim %s %s' % (filename, filename))
-                    if failure:
-                        print('convert from ImageMagick is not installed - needed for cropping PNG files')
-            elif ext == '.pdf':
-                if crop:
-                    failure = os.system('pdfcrop %s %s' % (filename, filename))
-                    if failure:
-                        print('pdfcrop is not installed - needed for cropping PDF files')
-
+            self._savefig(filename, dpi, crop)
             if self.instruction_file:
                 self.instruction_file.write('mpl.savefig("%s", dpi=%s)\n'
                                             % (filename, dpi))
 
+    def _export(self, stem, formats, dpi, crop, threads):
+        """
+        Save the figure in files stem.format for all `formats`. The
+        drawing is done in this thread (see ``_encode``). Encoding the
+        image and writing the files is done in threads.
+        """
+        if dpi is None:
+            dpi = _savefig_dpi(self.fig)
+        jobs = []
+        for format, data in self._encode(formats, dpi, crop):
+            filename = '%s.%s' % (stem, format)
+            if format == 'png':
+                jobs.append((_write_png, (filename, data, dpi)))
+            else:
+                jobs.append((_write_bytes, (filename, data)))
+        if threads and len(jobs) > 1:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(len(jobs))
+            try:
+                pool.map(_run_job, jobs)
+            finally:
+                pool.close()
+        else:
+            for job in jobs:
+                _run_job(job)
+
+    def _encode(self, formats, dpi, crop):
+        """
+        Return list of (format, data) for all `formats`, where data
+        is an RGBA image at `dpi` for 'png' and the file contents
+        (bytes) for vector formats. The figure is drawn in this thread
+        (Matplotlib figures cannot be drawn from several threads at
+        once): once as an image, if needed, and once per vector format.
+        """
+        import io
+        if dpi is None:
+            dpi = _savefig_dpi(self.fig)
+        rgba = None
+        if 'png' in formats or crop:
+            rgba = _render_rgba(self.fig, dpi)
+        bbox_inches = None
+        if crop:
+            rows, columns = _trim(rgba)
+            rgba = rgba[rows,columns]
+            bbox_inches = _pixels_to_bbox(self.fig, dpi, rows, columns)
+        encoded = []
+        for format in formats:
+            if format == 'png':
+                encoded.append((format, rgba))
+            else:
+                buf = io.BytesIO()
+                self.fig.savefig(buf, format=format,
+                                 bbox_inches=bbox_inches, pad_inches=0)
+                encoded.append((format, buf.getvalue()))
+        return encoded
+
+    def figure_bytes(self, formats=('png',), dpi=None, crop=True):
+        """
+        Return dict with the figure in each of the `formats` (e.g.
+        'png', 'pdf', 'svg') as bytes, made in memory as by
+        ``savefig(stem)``.
+        """
+        import io
+        self.flush()
+        if dpi is None:
+            dpi = _savefig_dpi(self.fig)
+        data = {}
+        for format, value in self._encode(formats, dpi, crop):
+            if format == 'png':
+                buf = io.BytesIO()
+                _write_png(buf, value, dpi)
+                value = buf.getvalue()
+            data[format] = value
+        return data
+
+    def _savefig(self, filename, dpi, crop):
+        ext = os.path.splitext(filename)[1]
+        if crop and ext == '.png':
+            _save_trimmed_png(self.fig, filename, dpi)
+        elif crop and ext == '.pdf':
+            self.fig.savefig(filename, dpi=dpi, bbox_inches='tight',
+                             pad_inches=0)
+        else:
+            self.fig.savefig(filename, dpi=dpi)
 
     def text(self, text, position, alignment='center', fontsize=0,
              arrow_tip=None, bgcolor=None, fgcolor=None, fontfamily=None):
@@ -414,6 +795,11 @@ self.ax.plot(x, y, linewidth=%d, color='gray',
         the (x,y) coordinates for the arrow tip.
         fontsize=0 indicates use of the default font as set by
         ``set_fontsize``.
+        With a text cache (``self.text_cache``) and LaTeX typesetting
+        the texts, a text without arrow and background color is drawn
+        as its outline, which is stored in the cache the first time
+        the text is used. Otherwise LaTeX runs when the figure is
+        rendered.
         """
         if fontsize == 0:
             if hasattr(self, 'fontsize'):
@@ -430,11 +816,26 @@ self.ax.plot(x, y, linewidth=%d, color='gray',
             kwargs['backgroundcolor'] = bgcolor
         if fgcolor is not None:
             kwargs['color'] = fgcolor
+        kwargs['usetex'] = self._usetex()
 
         x, y = position
+        style = (alignment, fontsize, tuple(sorted(kwargs.items())))
         if arrow_tip is None:
-            self.ax.text(x, y, text, horizontalalignment=alignment,
-                         fontsize=fontsize, **kwargs)
+            if bgcolor is None and self._outline_texts():
+                # Draw the outline of the text as typeset by LaTeX
+                style = (text,) + style
+                data = (x, y)
+                if self._reuse('textpath', style, data) is None:
+                    artist = self._text_patch(text, x, y, alignment,
+                                              fontsize, fontfamily, fgcolor)
+                    self._record('textpath', style, data, artist)
+            else:
+                data = (text, x, y)
+                if self._reuse('text', style, data) is None:
+                    artist = self.ax.text(x, y, text,
+                                          horizontalalignment=alignment,
+                                          fontsize=fontsize, **kwargs)
+                    self._record('text', style, data, artist)
             if self.instruction_file:
                 self.instruction_file.write("""\
 ax.text(%g, %g, %s,
@@ -444,17 +845,21 @@ ax.text(%g, %g, %s,
             if not len(arrow_tip) == 2:
                 raise ValueError('arrow_tip=%s must be (x,y) pt.' % arrow)
             pt = arrow_tip
-            self.ax.annotate(text, xy=pt, xycoords='data',
-                             textcoords='data', xytext=position,
-                             horizontalalignment=alignment,
-                             verticalalignment='top',
-                             fontsize=fontsize,
-                             arrowprops=dict(arrowstyle='->',
-                                             facecolor='black',
-                                             #linewidth=2,
-                                             linewidth=1,
-                                             shrinkA=5,
-                                             shrinkB=5))
+            data = (text, tuple(position), tuple(pt))
+            if self._reuse('annotation', style, data) is None:
+                artist = self.ax.annotate(
+                    text, xy=pt, xycoords='data',
+                    textcoords='data', xytext=position,
+                    horizontalalignment=alignment,
+                    verticalalignment='top',
+                    fontsize=fontsize, usetex=kwargs['usetex'],
+                    arrowprops=dict(arrowstyle='->',
+                                    facecolor='black',
+                                    #linewidth=2,
+                                    linewidth=1,
+                                    shrinkA=5,
+                                    shrinkB=5))
+                self._record('annotation', style, data, artist)
             if self.instruction_file:
                 self.instruction_file.write("""\
 ax.annotate('%s', xy=%s, xycoords='data',
@@ -470,6 +875,37 @@ ax.annotate('%s', xy=%s, xycoords='data',
 """ % (text, pt.tolist() if isinstance(pt, np.ndarray) else pt,
        position, alignment, fontsize))
 
+    def _outline_texts(self):
+        """
+        Return True if texts are drawn as outlines from the text
+        cache: the cache is turned on, and the texts in the figure
+        are typeset by LaTeX, which is installed.
+        """
+        if self.text_cache is None:
+            return False
+        self.ax  # make the figure (imports matplotlib) if not done
+        return self._usetex() and _latex_installed()
+
+    def _usetex(self):
+        """Return True if LaTeX typesets the texts in the figure."""
+        # Allow \boldsymbol{} etc in title, labels, etc (not with xkcd)
+        return self.usetex and not getattr(self, 'xkcd', False)
+
+    def _text_patch(self, text, x, y, alignment, fontsize, fontfamily,
+                    color):
+        """Add the outline of `text` (from the text cache) to the axes."""
+        from matplotlib.path import Path
+        from matplotlib.patches import PathPatch
+        vertices, codes = _text_path(text, fontsize, fontfamily, alignment,
+                                     self.text_cache)
+        if color is None:
+            color = matplotlib.rcParams['text.color']
+        patch = PathPatch(Path(vertices, codes), facecolor=color,
+                          edgecolor='none', linewidth=0, clip_on=False,
+                          transform=_text_transform(self.ax, x, y))
+        self.ax.add_artist(patch)
+        return patch
+
 # Drawing annotations with arrows:
 #http://matplotlib.sourceforge.net/users/annotations_intro.html
 #http://matplotlib.sourceforge.net/mpl_examples/pylab_examples/annotation_demo2.py
@@ -488,16 +924,8 @@ ax.annotate('%s', xy=%s, xycoords='data',
             linewidth = self.linewidth
 
         if style == '->' or style == '<->':
-            self.mpl.arrow(x, y, dx, dy, hold=True,
-                           facecolor=linecolor,
-                           edgecolor=linecolor,
-                           linestyle=linestyle,
-                           linewidth=linewidth,
-                           head_width=self.arrow_head_width,
-                           #head_width=0.1,
-                           #width=1,  # width of arrow body in coordinate scale
-                           length_includes_head=True,
-                           shape='full')
+            self._arrow(x, y, dx, dy, linestyle, linewidth, linecolor,
+                        self.arrow_head_width)
             if self.instruction_file:
                 self.instruction_file.write("""\
 mpl.arrow(x=%g, y=%g, dx=%g, dy=%g,
@@ -508,14 +936,8 @@ mpl.arrow(x=%g, y=%g, dx=%g, dy=%g,
           shape='full')
 """ % (x, y, dx, dy, linecolor, linecolor, linestyle, linewidth))
         if style == '<-' or style == '<->':
-            self.mpl.arrow(x+dx, y+dy, -dx, -dy, hold=True,
-                           facecolor=linecolor,
-                           edgecolor=linecolor,
-                           linewidth=linewidth,
-                           head_width=0.1,
-                           #width=1,
-                           length_includes_head=True,
-                           shape='full')
+            self._arrow(x+dx, y+dy, -dx, -dy, 'solid', linewidth, linecolor,
+                        0.1)
             if self.instruction_file:
                 self.instruction_file.write("""\
 mpl.arrow(x=%g, y=%g, dx=%g, dy=%g,
@@ -525,6 +947,28 @@ mpl.arrow(x=%g, y=%g, dx=%g, dy=%g,
           shape='full')
 """ % (x+dx, y+dy, -dx, -dy, linecolor, linecolor, linewidth))
 
+    def _arrow(self, x, y, dx, dy, linestyle, linewidth, linecolor,
+               head_width):
+        """Draw a filled arrow, or record it as a polygon in batch mode."""
+        kwargs = dict(head_width=head_width, length_includes_head=True,
+                      shape='full')
+        if self.batch_curves:
+            from matplotlib.patches import FancyArrow
+            polygon = FancyArrow(x, y, dx, dy, **kwargs).get_xy()
+            self._add_to_batch(('fill', linecolor, linecolor, linewidth,
+                                '', linestyle), [polygon])
+            return
+        style = (linestyle, linewidth, linecolor, head_width)
+        data = (x, y, dx, dy)
+        if self._reuse('arrow', style, data) is None:
+            arrow = self.ax.arrow(x, y, dx, dy,
+                                  facecolor=linecolor,
+                                  edgecolor=linecolor,
+                                  linestyle=linestyle,
+                                  linewidth=linewidth,
+                                  **kwargs)
+            self._record('arrow', style, data, arrow)
+
     def arrow2(self, x, y, dx, dy, style='->'):
         """Draw arrow (dx,dy) at (x,y). `style` is '->', '<-' or '<->'."""
         self.ax.annotate('', xy=(x+dx,y+dy), xytext=(x,y),
@@ -545,6 +989,228 @@ ax.annotate('', xy=(%s,%s), xytext=(%s,%s),
 
 
 
+class InstructionFile(object):
+    """
+    Recorder of the Matplotlib commands that make a figure (the
+    `instruction_file` argument to ``set_coordinate_system``). The
+    commands are written to the Python file `filename`, while
+    coordinate arrays are collected and saved in a .npz file with the
+    same stem when the recorder is closed (at the latest when the
+    program ends). The Python file loads the arrays from the .npz file
+    by key (``write_array``), so the figure can be reproduced by
+    running the Python file.
+    """
+    def __init__(self, filename):
+        self.name = filename
+        self.data_name = os.path.splitext(filename)[0] + '.npz'
+        self._file = open(filename, 'w', buffering=2**16)
+        self._arrays = {}
+        self._pid = os.getpid()  # (forked processes must not close)
+        self._file.write("""\
+import os
+import numpy as np
+# Coordinates of the curves
+data = np.load(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            %s))
+""" % repr(str(os.path.basename(self.data_name))))
+        import atexit
+        atexit.register(self.close)
+
+    def write(self, text):
+        self._file.write(text)
+
+    def write_array(self, variable, array):
+        """Write ``variable = <array>``, where array is in the .npz file."""
+        key = 'a%d' % len(self._arrays)
+        self._arrays[key] = np.array(array)  # (array may change later)
+        self._file.write('%s = data[%s]\n' % (variable, repr(str(key))))
+
+    def close(self):
+        if self._file.closed or os.getpid() != self._pid:
+            return
+        self._file.close()
+        np.savez_compressed(self.data_name, **self._arrays)
+        self._arrays = {}
+
+    closed = property(lambda self: self._file.closed)
+
+
+def _savefig_dpi(fig):
+    """The resolution used by fig.savefig when dpi is not given."""
+    dpi = matplotlib.rcParams['savefig.dpi']
+    return fig.dpi if dpi == 'figure' else dpi
+
+def _render_rgba(fig, dpi):
+    """Return `fig` rendered by Agg as an (height, width, 4) array."""
+    import io
+    buf = io.BytesIO()
+    fig.savefig(buf, format='rgba', dpi=dpi)
+    pixels = np.frombuffer(buf.getvalue(), dtype=np.uint8)
+    # Agg truncates the size in pixels (allow for round-off in w*dpi)
+    w, h = fig.get_size_inches()*dpi
+    for width in int(w), int(round(w)):
+        if width > 0 and pixels.size % (4*width) == 0:
+            break
+    return pixels.reshape(-1, width, 4)
+
+def _write_png(filename, rgba, dpi):
+    """Write `rgba` image as PNG to `filename` (name or file object)."""
+    import matplotlib.image
+    matplotlib.image.imsave(filename, rgba, dpi=dpi, format='png')
+
+def _write_bytes(filename, data):
+    with open(filename, 'wb') as f:
+        f.write(data)
+
+def _run_job(job):
+    function, args = job
+    function(*args)
+
+def _save_trimmed_png(fig, filename, dpi=None):
+    """Render `fig` and save it as PNG without the uniform border."""
+    if dpi is None:
+        dpi = _savefig_dpi(fig)
+    rgba = _render_rgba(fig, dpi)
+    _write_png(filename, rgba[_trim(rgba)], dpi)
+
+def _pixels_to_bbox(fig, dpi, rows, columns):
+    """
+    Return the Bbox (in inches) of the `rows` and `columns` slices of
+    the image of `fig` rendered at `dpi`, with one pixel extra space.
+    """
+    from matplotlib.transforms import Bbox
+    width, height = fig.get_size_inches()*dpi  # in pixels
+    c0 = max(0, (columns.start or 0) - 1)
+    c1 = min(width, (columns.stop or width) + 1)
+    r0 = max(0, (rows.start or 0) - 1)
+    r1 = min(height, (rows.stop or height) + 1)
+    return Bbox([[c0/dpi, (height - r1)/dpi], [c1/dpi, (height - r0)/dpi]])
+
+def _trim(image):
+    """
+    Return slices of the rows and columns of `image` (RGBA array)
+    that remain when the border with the color of the upper left
+    pixel is removed.
+    """
+    inside = (image != image[0,0]).any(axis=2)
+    rows = np.flatnonzero(inside.any(axis=1))
+    columns = np.flatnonzero(inside.any(axis=0))
+    if len(rows) == 0:
+        return slice(None), slice(None)  # blank image
+    return slice(rows[0], rows[-1]+1), slice(columns[0], columns[-1]+1)
+
+def _offscreen_figure(figsize, dpi):
+    """Return a figure that is rendered by Agg and unknown to pyplot."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
+_latex = None  # True if LaTeX is installed (see _latex_installed)
+
+def _user_usetex():
+    """
+    Return the user's setting of Matplotlib's text.usetex, or None if
+    Matplotlib is not imported or the setting is the default.
+    """
+    mpl = sys.modules.get('matplotlib')
+    if mpl is None or not hasattr(mpl, 'rcParams'):
+        return None
+    usetex = mpl.rcParams['text.usetex']
+    if usetex == mpl.rcParamsDefault['text.usetex']:
+        return None
+    return usetex
+
+def _latex_installed():
+    """Return True if the latex program is found (checked once)."""
+    global _latex
+    if _latex is None:
+        try:
+            from shutil import which
+        except ImportError:
+            from distutils.spawn import find_executable as which  # Python 2
+        _latex = which('latex') is not None
+    return _latex
+
+def _text_path(text, fontsize, fontfamily, alignment, cache, usetex=True):
+    """
+    Return vertices (in points, relative to the text position) and codes
+    of the path outlining `text`. The path is taken from `cache` if the
+    same text has been typeset before with the same font and preamble.
+    """
+    from matplotlib.path import Path
+    if fontfamily is None:
+        fontfamily = matplotlib.rcParams['font.family']
+    key = ('text', text, fontsize, repr(fontfamily), usetex,
+           repr(matplotlib.rcParams['text.latex.preamble']),
+           matplotlib.__version__)
+    arrays = cache.get(key)
+    if arrays is None:
+        from matplotlib.textpath import TextPath
+        from matplotlib.font_manager import FontProperties
+        path = TextPath((0, 0), text, size=fontsize, usetex=usetex,
+                        prop=FontProperties(family=fontfamily))
+        arrays = {'vertices': np.asarray(path.vertices, dtype=float),
+                  'codes': np.asarray(path.codes, dtype=np.uint8)}
+        cache.put(key, arrays)
+    vertices, codes = arrays['vertices'], arrays['codes']
+    # Alignment relative to the extent of the glyphs (vertical: baseline)
+    x = vertices[codes != Path.CLOSEPOLY, 0]
+    if len(x) > 0 and alignment != 'left':
+        shift = x.max() if alignment == 'right' else (x.min() + x.max())/2.
+        vertices = vertices - (shift, 0)
+    return vertices, codes
+
+def _text_transform(ax, x, y):
+    """Map points relative to (x,y) in data coordinates to the display."""
+    from matplotlib.transforms import Affine2D, ScaledTranslation
+    return Affine2D().scale(1/72.) + ax.figure.dpi_scale_trans + \
+           ScaledTranslation(x, y, ax.transData)
+
+def _same_data(data1, data2):
+    """Compare tuples or lists of numbers, strings and arrays."""
+    if len(data1) != len(data2):
+        return False
+    for a, b in zip(data1, data2):
+        if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+            if not np.array_equal(a, b):
+                return False
+        elif a != b:
+            return False
+    return True
+
+def _copy_data(data):
+    """Copy `data` (as compared by _same_data) for later comparison."""
+    return [a.copy() if isinstance(a, np.ndarray) else a for a in data]
+
+def _update_artist(kind, artist, data):
+    """Give a reused artist new coordinates (and text)."""
+    if kind in ('line', 'shadow'):
+        artist.set_data(*data)
+    elif kind == 'fill':
+        artist.set_xy(np.column_stack(data))
+    elif kind == 'arrow':
+        x, y, dx, dy = data
+        artist.set_data(x=x, y=y, dx=dx, dy=dy)
+    elif kind == 'textpath':
+        x, y = data
+        artist.set_transform(_text_transform(artist.axes, x, y))
+    elif kind == 'text':
+        text, x, y = data
+        artist.set_text(text)
+        artist.set_position((x, y))
+    elif kind == 'annotation':
+        text, position, arrow_tip = data
+        artist.set_text(text)
+        artist.set_position(position)
+        artist.xy = arrow_tip
+    elif kind == 'lines':
+        artist.set_segments(data)
+    elif kind == 'polys':
+        artist.set_verts(data)
+
+
 def _test():
     d = MatplotlibDraw(0, 10, 0, 5, instruction_file='tmp3.py', axis=True)
     d.set_linecolor('magenta')
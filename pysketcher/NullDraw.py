@@ -0,0 +1,117 @@
+from __future__ import division
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import absolute_import
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from builtins import object
+
+import time
+from .DrawingTool import DrawingTool
+
+
+class NullDraw(DrawingTool):
+    """
+    Drawing tool that draws nothing, but counts what the shapes send
+    to it and times the figures. Used to measure the cost of building
+    and traversing the shapes without the cost of a plotting package
+    (see ``pysketcher.bench``).
+
+    ============ ====================================================
+    Attribute    Description
+    ============ ====================================================
+    counts       dict with no of curves, points, texts, arrows, fills,
+                 shadows, figures, frames and files (savefig calls)
+    times        list with the time (s) of each figure: from erase
+                 (or set_coordinate_system, begin_frame) to the first
+                 display, end_frame or savefig
+    ============ ====================================================
+    """
+    def __init__(self):
+        DrawingTool.__init__(self)
+        self.reset()
+
+    def reset(self):
+        """Set all counts to zero and forget the times."""
+        self.counts = dict.fromkeys(
+            ('curves', 'points', 'texts', 'arrows', 'fills', 'shadows',
+             'figures', 'frames', 'files'), 0)
+        self.times = []
+        self._start = time.time()   # time of reset
+        self._figure_start = None   # time of erase
+
+    def stats(self):
+        """Return dict with the counts and the total time since reset."""
+        stats = dict(self.counts)
+        stats['time'] = time.time() - self._start
+        stats['figure_time'] = sum(self.times)
+        return stats
+
+    def _figure_done(self):
+        if self._figure_start is not None:
+            self.times.append(time.time() - self._figure_start)
+            self.counts['figures'] += 1
+            self._figure_start = None
+
+    def set_coordinate_system(self, xmin, xmax, ymin, ymax, axis=False,
+                              instruction_file=None, new_figure=True,
+                              xkcd=False):
+        DrawingTool.set_coordinate_system(self, xmin, xmax, ymin, ymax,
+                                          axis)
+        self.erase()
+
+    def erase(self):
+        self._figure_start = time.time()
+
+    def _count(self, curves, points, arrow, fillcolor, fillpattern,
+               shadow):
+        counts = self.counts
+        counts['curves'] += curves
+        counts['points'] += points
+        if arrow:
+            if not arrow in ('->', '<-', '<->'):
+                raise ValueError("arrow argument must be '->', '<-', or '<->', not %s" % repr(arrow))
+            counts['arrows'] += curves
+        if fillcolor is None:
+            fillcolor = self.fillcolor
+        if fillpattern is None:
+            fillpattern = self.fillpattern
+        if fillcolor or fillpattern:
+            counts['fills'] += curves
+        if shadow:
+            counts['shadows'] += curves
+
+    def plot_curve(self, x, y,
+                   linestyle=None, linewidth=None,
+                   linecolor=None, arrow=None,
+                   fillcolor=None, fillpattern=None,
+                   shadow=0, name=None):
+        self._count(1, len(x), arrow, fillcolor, fillpattern, shadow)
+
+    def plot_curves(self, segments,
+                    linestyle=None, linewidth=None,
+                    linecolor=None, arrow=None,
+                    fillcolor=None, fillpattern=None,
+                    shadow=0):
+        self._count(len(segments), sum(len(xy) for xy in segments),
+                    arrow, fillcolor, fillpattern, shadow)
+
+    def text(self, text, position, alignment='center', fontsize=0,
+             arrow_tip=None, bgcolor=None, fgcolor=None, fontfamily=None):
+        self.counts['texts'] += 1
+        if arrow_tip is not None:
+            if not len(arrow_tip) == 2:
+                raise ValueError('arrow_tip=%s must be (x,y) pt.' % arrow_tip)
+            self.counts['arrows'] += 1
+
+    def display(self, title=None, show=True):
+        self._figure_done()
+
+    def end_frame(self, blit=False):
+        self.counts['frames'] += 1
+        self._figure_done()
+
+    def savefig(self, filename, dpi=None, crop=True):
+        self.counts['files'] += 1
+        self._figure_done()
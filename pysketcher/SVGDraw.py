@@ -0,0 +1,382 @@
+from __future__ import division
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import absolute_import
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from builtins import object
+
+import os, io
+import numpy as np
+from xml.sax.saxutils import escape, quoteattr
+from .DrawingTool import DrawingTool
+
+# Sizes in Matplotlib are given in points (1/72 inch), and pysketcher
+# figures are 800 pixels wide at 100 dpi
+_pixels_per_point = 100/72.
+
+
+class SVGDraw(DrawingTool):
+    """
+    Drawing tool that writes SVG files directly from the coordinate
+    arrays of the curves, without Matplotlib. Each curve becomes a
+    ``<path>`` element (curves of the same style drawn by
+    ``plot_curves`` share one element), and the coordinates are
+    formatted all at once by one string formatting operation.
+    Fill colors, hatch patterns, arrows and shadows are supported, with
+    the same sizes as in MatplotlibDraw. Texts are written as ``<text>``
+    elements: LaTeX math is shown without the $ signs (and is not
+    typeset), and background colors of texts are not supported.
+
+    ============ ====================================================
+    Attribute    Description
+    ============ ====================================================
+    precision    no of decimals in the coordinates (in pixels)
+    ============ ====================================================
+    """
+    svg_colors = {'r': 'red', 'g': 'green', 'b': 'blue', 'c': 'cyan',
+                  'm': 'magenta', 'p': 'purple', 'y': 'yellow',
+                  'k': 'black', 'w': 'white'}
+    # Dash patterns in units of the line width (as in Matplotlib)
+    dashes = {'solid': None, 'dashed': (3.7, 1.6),
+              'dashdot': (6.4, 1.6, 1, 1.6), 'dotted': (1, 1.65)}
+
+    def __init__(self, precision=2):
+        DrawingTool.__init__(self)
+        self.precision = precision
+        self.erase()
+
+    def set_coordinate_system(self, xmin, xmax, ymin, ymax, axis=False,
+                              instruction_file=None, new_figure=True,
+                              xkcd=False):
+        """
+        Define the drawing area [xmin,xmax]x[ymin,ymax]. The `axis`,
+        `instruction_file` and `xkcd` arguments are ignored (the SVG
+        file is itself a readable record of the drawing).
+        """
+        DrawingTool.set_coordinate_system(self, xmin, xmax, ymin, ymax,
+                                          axis)
+        self.erase()
+
+    def adjust_coordinate_system(self, minmax, occupation_percent=80):
+        DrawingTool.adjust_coordinate_system(self, minmax,
+                                             occupation_percent)
+        self.ysize = self.xsize*self.yrange/self.xrange
+
+    def erase(self):
+        """Erase the current figure."""
+        self._elements = []
+        self._patterns = {}  # (pattern, color): id of <pattern>
+        self._bounds = [np.inf, -np.inf, np.inf, -np.inf]  # in pixels
+        self.title = None
+
+    def _pixels(self, x, y):
+        """Convert coordinates to pixels (y axis pointing down)."""
+        s = self.xsize/self.xrange
+        return (np.asarray(x, dtype=float) - self.xmin)*s, \
+               (self.ymax - np.asarray(y, dtype=float))*s
+
+    def _extend_bounds(self, xmin, xmax, ymin, ymax):
+        b = self._bounds
+        b[0] = min(b[0], xmin);  b[1] = max(b[1], xmax)
+        b[2] = min(b[2], ymin);  b[3] = max(b[3], ymax)
+
+    def _color(self, color):
+        if color == '' or color is None:
+            return 'none'
+        return self.svg_colors.get(color, color)
+
+    def _stroke(self, linestyle, linewidth, linecolor):
+        """Return SVG attributes for the lines."""
+        width = linewidth*_pixels_per_point
+        attributes = 'fill="none" stroke="%s" stroke-width="%g"' % \
+                     (self._color(linecolor), width)
+        dashes = self.dashes.get(linestyle)
+        if dashes:
+            attributes += ' stroke-dasharray="%s"' % \
+                          ','.join('%g' % (d*width) for d in dashes)
+        return attributes
+
+    def plot_curve(self, x, y,
+                   linestyle=None, linewidth=None,
+                   linecolor=None, arrow=None,
+                   fillcolor=None, fillpattern=None,
+                   shadow=0, name=None):
+        """Define a curve with coordinates x and y (arrays)."""
+        if linestyle is None:
+            # use "global" linestyle
+            linestyle = self.linestyle
+        if linecolor is None:
+            linecolor = self.linecolor
+        if linewidth is None:
+            linewidth = self.linewidth
+        if fillcolor is None:
+            fillcolor = self.fillcolor
+        if fillpattern is None:
+            fillpattern = self.fillpattern
+        if shadow == 1:
+            shadow = 3   # smallest displacement that is visible
+
+        if len(x) == 0:
+            return  # nothing to draw
+        px, py = self._pixels(x, y)
+        self._extend_bounds(px.min(), px.max(), py.min(), py.max())
+        d = _path_data([px], [py], self.precision)
+        if shadow:
+            offset = shadow*_pixels_per_point
+            self._elements.append(
+                '<path d="%s" %s transform="translate(%g,%g)"/>' %
+                (d, self._stroke('solid', linewidth, 'gray'),
+                 offset, offset))
+
+        stroke = self._stroke(linestyle, linewidth, linecolor)
+        if fillcolor or fillpattern:
+            if fillpattern != '':
+                fill = 'url(#%s)' % self._pattern(fillpattern, linecolor)
+            else:
+                fill = self._color(fillcolor)
+            stroke = stroke.replace('fill="none"', 'fill="%s"' % fill)
+            d += 'Z'
+        if name is not None:
+            stroke += ' data-name=%s' % quoteattr(str(name))
+        self._elements.append('<path d="%s" %s/>' % (d, stroke))
+
+        if arrow:
+            if not arrow in ('->', '<-', '<->'):
+                raise ValueError("arrow argument must be '->', '<-', or '<->', not %s" % repr(arrow))
+            if arrow in ('<-', '<->'):
+                self._arrow_head(x[1], y[1], x[0], y[0], linewidth,
+                                 linecolor)
+            if arrow in ('->', '<->'):
+                self._arrow_head(x[-2], y[-2], x[-1], y[-1], linewidth,
+                                 linecolor)
+
+    def plot_curves(self, segments,
+                    linestyle=None, linewidth=None,
+                    linecolor=None, arrow=None,
+                    fillcolor=None, fillpattern=None,
+                    shadow=0):
+        """
+        Define several curves with the same style. `segments` is a
+        list of arrays with the (x,y) points of each curve. Curves
+        without filling, arrows and shadow become one ``<path>``.
+        """
+        if linestyle is None:
+            linestyle = self.linestyle
+        if linecolor is None:
+            linecolor = self.linecolor
+        if linewidth is None:
+            linewidth = self.linewidth
+        if fillcolor is None:
+            fillcolor = self.fillcolor
+        if fillpattern is None:
+            fillpattern = self.fillpattern
+        if arrow or shadow or fillcolor or fillpattern:
+            DrawingTool.plot_curves(
+                self, segments, linestyle, linewidth, linecolor, arrow,
+                fillcolor, fillpattern, shadow)
+            return
+        segments = [segment for segment in segments if len(segment)]
+        if not segments:
+            return
+        xy = np.concatenate(segments)
+        px, py = self._pixels(xy[:,0], xy[:,1])
+        self._extend_bounds(px.min(), px.max(), py.min(), py.max())
+        splits = np.cumsum([len(segment) for segment in segments[:-1]])
+        d = _path_data(np.split(px, splits), np.split(py, splits),
+                       self.precision)
+        self._elements.append('<path d="%s" %s/>' %
+                              (d, self._stroke(linestyle, linewidth,
+                                               linecolor)))
+
+    def _arrow_head(self, x0, y0, x1, y1, linewidth, linecolor,
+                    head_width=None):
+        """Draw a filled arrow head at (x1,y1) pointing from (x0,y0)."""
+        if head_width is None:
+            head_width = self.arrow_head_width
+        u = np.array([x1 - x0, y1 - y0], dtype=float)
+        length = np.sqrt(u.dot(u))
+        if length == 0:
+            return
+        u /= length
+        n = np.array([-u[1], u[0]])
+        tip = np.array([x1, y1], dtype=float)
+        base = tip - 1.5*head_width*u  # head length as in Matplotlib
+        corners = np.array([tip, base + 0.5*head_width*n,
+                            base - 0.5*head_width*n])
+        px, py = self._pixels(corners[:,0], corners[:,1])
+        self._extend_bounds(px.min(), px.max(), py.min(), py.max())
+        color = self._color(linecolor)
+        self._elements.append(
+            '<path d="%sZ" fill="%s" stroke="%s" stroke-width="%g"/>' %
+            (_path_data([px], [py], self.precision), color, color,
+             linewidth*_pixels_per_point))
+
+    def _pattern(self, pattern, color):
+        """Return id of the <pattern> element for a hatch pattern."""
+        key = (pattern, color)
+        if key not in self._patterns:
+            self._patterns[key] = 'hatch%d' % len(self._patterns)
+        return self._patterns[key]
+
+    def _pattern_element(self, pattern, color, id):
+        # Matplotlib has about 6 hatch lines per inch per character
+        # (e.g. '//' gives twice as many lines as '/')
+        density = max(pattern.count(c) for c in set(pattern))
+        t = 100./(6*density)
+        h = t/2.
+        shapes = {
+            '/': 'M0,%(t)g L%(t)g,0 M-%(h)g,%(h)g L%(h)g,-%(h)g '
+                 'M%(h)g,%(u)g L%(u)g,%(h)g',
+            '\\': 'M0,0 L%(t)g,%(t)g M-%(h)g,%(h)g L%(h)g,%(u)g '
+                  'M%(h)g,-%(h)g L%(u)g,%(h)g',
+            '|': 'M%(h)g,0 L%(h)g,%(t)g',
+            '-': 'M0,%(h)g L%(t)g,%(h)g',
+            '+': 'M%(h)g,0 L%(h)g,%(t)g M0,%(h)g L%(t)g,%(h)g',
+            'x': 'M0,0 L%(t)g,%(t)g M0,%(t)g L%(t)g,0',
+            }
+        values = {'t': t, 'h': h, 'u': t + h}
+        color = self._color(color)
+        lines = ' '.join(shapes[c] % values for c in sorted(set(pattern))
+                         if c in shapes)
+        elements = ['<rect width="%g" height="%g" fill="white"/>' % (t, t)]
+        if lines:
+            elements.append('<path d="%s" stroke="%s" stroke-width="1"/>'
+                            % (lines, color))
+        for c in set(pattern) & set('oO.*'):
+            r = t/4. if c in 'oO' else t/8.
+            fill = 'none' if c in 'oO' else color
+            elements.append(
+                '<circle cx="%g" cy="%g" r="%g" fill="%s" stroke="%s"/>'
+                % (h, h, r, fill, color))
+        return '<pattern id="%s" patternUnits="userSpaceOnUse" ' \
+               'width="%g" height="%g">%s</pattern>' % \
+               (id, t, t, ''.join(elements))
+
+    def text(self, text, position, alignment='center', fontsize=0,
+             arrow_tip=None, bgcolor=None, fgcolor=None, fontfamily=None):
+        """
+        Write `text` string at a position (centered, left, right -
+        according to the `alignment` string). If ``arrow_tip`` is
+        given, an arrow is drawn from the text to that (x,y) point.
+        """
+        if fontsize == 0:
+            fontsize = self.fontsize
+        x, y = position
+        px, py = self._pixels(x, y)
+        size = fontsize*_pixels_per_point
+        anchor = {'left': 'start', 'right': 'end'}.get(alignment, 'middle')
+        attributes = 'x="%g" y="%g" font-size="%g" text-anchor="%s"' % \
+                     (px, py, size, anchor)
+        if fgcolor is not None:
+            attributes += ' fill="%s"' % self._color(fgcolor)
+        if fontfamily is not None:
+            attributes += ' font-family="%s"' % escape(fontfamily)
+        text = text.replace('$', '')
+        self._elements.append('<text %s>%s</text>' %
+                              (attributes, escape(text)))
+        # Approximate extent of the text
+        width = 0.6*size*len(text)
+        left = {'start': 0, 'middle': 0.5, 'end': 1}[anchor]*width
+        self._extend_bounds(px - left, px - left + width, py - size, py)
+
+        if arrow_tip is not None:
+            if not len(arrow_tip) == 2:
+                raise ValueError('arrow_tip=%s must be (x,y) pt.' % arrow_tip)
+            # As Matplotlib's annotate: from the text (shrunk 5 points)
+            tx, ty = arrow_tip
+            shrink = 5*self.xrange/(self.xsize/_pixels_per_point)
+            u = np.array([tx - x, ty - y], dtype=float)
+            length = np.sqrt(u.dot(u))
+            if length > 2*shrink:
+                u /= length
+                start = np.array([x, y]) + shrink*u
+                end = np.array([tx, ty]) - shrink*u
+                self.plot_curve([start[0], end[0]], [start[1], end[1]],
+                                'solid', 1, 'k')
+                self._arrow_head(start[0], start[1], end[0], end[1], 1, 'k',
+                                 head_width=self.arrow_head_width/2.)
+
+    def display(self, title=None, show=True):
+        """Set the title (an SVG file is only shown by ``savefig``)."""
+        if title is not None:
+            self.title = title
+
+    def savefig(self, filename, dpi=None, crop=True):
+        """
+        Save the figure as an SVG file (the extension .svg is added
+        if `filename` has no extension). With `crop` true, the figure
+        only covers the drawing, otherwise the whole coordinate system.
+        """
+        ext = os.path.splitext(filename)[1]
+        if not ext:
+            filename += '.svg'
+        elif ext != '.svg':
+            raise ValueError('%s can only make .svg files, not %s' %
+                             (self.__class__.__name__, filename))
+        with io.open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.svg(crop))
+
+    def figure_bytes(self, formats=('svg',), dpi=None, crop=True):
+        """Return dict with the SVG document (bytes) for 'svg'."""
+        for format in formats:
+            if format != 'svg':
+                raise ValueError('%s can only make svg, not %s' %
+                                 (self.__class__.__name__, format))
+        return {'svg': self.svg(crop).encode('utf-8')}
+
+    def svg(self, crop=True):
+        """Return the SVG document with the current figure."""
+        elements = self._elements[:]
+        if self.title is not None:
+            px, py = self._pixels(self.xmin + self.xrange/2., self.ymax)
+            size = 1.2*self.fontsize*_pixels_per_point
+            elements.append(
+                '<text x="%g" y="%g" font-size="%g" text-anchor="middle">'
+                '%s</text>' % (px, py - 0.5*size, size,
+                               escape(self.title.replace('$', ''))))
+            self._extend_bounds(px, px, py - 1.5*size, py)
+        xmin, xmax, ymin, ymax = self._bounds
+        if crop and xmin <= xmax:
+            margin = self.linewidth*_pixels_per_point + 2
+            xmin -= margin;  ymin -= margin
+            width = xmax - xmin + margin
+            height = ymax - ymin + margin
+        else:
+            xmin = ymin = 0
+            width, height = self.xsize, self.ysize
+        defs = ''
+        if self._patterns:
+            defs = '<defs>\n%s\n</defs>\n' % '\n'.join(
+                self._pattern_element(pattern, color, id)
+                for (pattern, color), id in sorted(self._patterns.items(),
+                                                   key=lambda i: i[1]))
+        return '''\
+<?xml version="1.0" encoding="utf-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" width="%gpx" height="%gpx" \
+viewBox="%g %g %g %g" stroke-linejoin="round">
+%s<rect x="%g" y="%g" width="%g" height="%g" fill="white"/>
+%s
+</svg>
+''' % (width, height, xmin, ymin, width, height, defs,
+       xmin, ymin, width, height, '\n'.join(elements))
+
+
+def _path_data(xs, ys, precision):
+    """
+    Return SVG path data ("M x,y L x,y x,y ...") for the curves with
+    pixel coordinates xs[i], ys[i], made by one formatting operation.
+    """
+    point = '%%.%df,%%.%df' % (precision, precision)
+    formats = []
+    for x in xs:
+        if len(x) == 0:
+            continue
+        formats.append('M' + point)
+        if len(x) > 1:
+            formats.append('L' + ' '.join([point]*(len(x) - 1)))
+    xy = np.empty(2*sum(len(x) for x in xs))
+    xy[0::2] = np.concatenate(xs)
+    xy[1::2] = np.concatenate(ys)
+    return ''.join(formats) % tuple(xy.tolist())
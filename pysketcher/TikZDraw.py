@@ -0,0 +1,299 @@
+from __future__ import division
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import absolute_import
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from builtins import object
+
+import os, io, re
+import numpy as np
+from .DrawingTool import DrawingTool
+
+
+class TikZDraw(DrawingTool):
+    """
+    Drawing tool that writes the figure as a TikZ picture, to be
+    included in LaTeX documents by ``\\input``. The document needs::
+
+        \\usepackage{tikz}
+        \\usetikzlibrary{patterns}
+
+    Coordinates are written in the coordinate system of the figure,
+    rounded to `precision` decimals (points that coincide after the
+    rounding are dropped), and the picture is scaled to `width` cm.
+    Each combination of line and fill properties gets a named style,
+    defined once by ``\\tikzset`` at the top of the picture, and
+    curves of the same style drawn by ``plot_curves`` share one
+    ``\\path`` command. Texts are typeset by LaTeX, as the rest of
+    the document.
+
+    ============ ====================================================
+    Attribute    Description
+    ============ ====================================================
+    precision    no of decimals in the coordinates
+    width        width (cm) of the coordinate system in the picture
+    ============ ====================================================
+    """
+    tikz_colors = {'r': 'red', 'g': 'green', 'b': 'blue', 'c': 'cyan',
+                   'm': 'magenta', 'p': 'purple', 'y': 'yellow',
+                   'k': 'black', 'w': 'white'}
+    tikz_linestyles = {'solid': None, 'dashed': 'dashed',
+                       'dashdot': 'dash dot', 'dotted': 'dotted'}
+    # Patterns of the TikZ patterns library for Matplotlib's hatches
+    tikz_patterns = {'/': 'north east lines', '\\': 'north west lines',
+                     '|': 'vertical lines', '-': 'horizontal lines',
+                     '+': 'grid', 'x': 'crosshatch', '.': 'dots',
+                     'o': 'dots', 'O': 'dots', '*': 'crosshatch dots'}
+    tikz_arrows = {'->': '-latex', '<-': 'latex-', '<->': 'latex-latex'}
+    tikz_anchors = {'center': 'base', 'left': 'base west',
+                    'right': 'base east'}
+
+    def __init__(self, precision=3, width=12):
+        DrawingTool.__init__(self)
+        self.precision = precision
+        self.width = width
+        self.erase()
+
+    def set_coordinate_system(self, xmin, xmax, ymin, ymax, axis=False,
+                              instruction_file=None, new_figure=True,
+                              xkcd=False):
+        """
+        Define the drawing area [xmin,xmax]x[ymin,ymax]. The `axis`,
+        `instruction_file` and `xkcd` arguments are ignored (the TikZ
+        code is itself a readable record of the drawing).
+        """
+        DrawingTool.set_coordinate_system(self, xmin, xmax, ymin, ymax,
+                                          axis)
+        self.erase()
+
+    def erase(self):
+        """Erase the current figure."""
+        self._commands = []
+        self._styles = {}  # options: style name
+        self.title = None
+
+    def _color(self, color):
+        return self.tikz_colors.get(color, color)
+
+    def _style(self, options):
+        """Return the name of the style with `options` (list)."""
+        options = ','.join(options)
+        if options not in self._styles:
+            self._styles[options] = 's%d' % len(self._styles)
+        return self._styles[options]
+
+    def _line_options(self, linestyle, linewidth, linecolor):
+        if linecolor == '':
+            options = ['draw=none']
+        else:
+            options = ['draw=%s' % self._color(linecolor),
+                       'line width=%gpt' % linewidth]
+            dashes = self.tikz_linestyles.get(linestyle)
+            if dashes:
+                options.append(dashes)
+        return options
+
+    def _path(self, xs, ys, closed=False):
+        """Return TikZ path "(x,y)--(x,y)..." for curves xs[i], ys[i]."""
+        return _path_data(xs, ys, self.precision,
+                          '--cycle' if closed else '')
+
+    def plot_curve(self, x, y,
+                   linestyle=None, linewidth=None,
+                   linecolor=None, arrow=None,
+                   fillcolor=None, fillpattern=None,
+                   shadow=0, name=None):
+        """Define a curve with coordinates x and y (arrays)."""
+        if linestyle is None:
+            # use "global" linestyle
+            linestyle = self.linestyle
+        if linecolor is None:
+            linecolor = self.linecolor
+        if linewidth is None:
+            linewidth = self.linewidth
+        if fillcolor is None:
+            fillcolor = self.fillcolor
+        if fillpattern is None:
+            fillpattern = self.fillpattern
+        if shadow == 1:
+            shadow = 3   # smallest displacement that is visible
+
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        filled = bool(fillcolor or fillpattern)
+        path = self._path([x], [y], closed=filled)
+        if name is not None:
+            self._commands.append('%% %s' % name)
+        if shadow:
+            options = self._line_options('solid', linewidth, 'gray')
+            options.append('shift={(%gpt,-%gpt)}' % (shadow, shadow))
+            self._commands.append('\\path[%s] %s;' %
+                                  (self._style(options), path))
+
+        options = self._line_options(linestyle, linewidth, linecolor)
+        if fillpattern:
+            options += ['pattern=%s' % self.tikz_patterns.get(
+                            fillpattern[0], 'north east lines'),
+                        'pattern color=%s' % self._color(linecolor)]
+        elif fillcolor:
+            options.append('fill=%s' % self._color(fillcolor))
+        if arrow:
+            if not arrow in self.tikz_arrows:
+                raise ValueError("arrow argument must be '->', '<-', or '<->', not %s" % repr(arrow))
+            options.append(self.tikz_arrows[arrow])
+        self._commands.append('\\path[%s] %s;' %
+                              (self._style(options), path))
+
+    def plot_curves(self, segments,
+                    linestyle=None, linewidth=None,
+                    linecolor=None, arrow=None,
+                    fillcolor=None, fillpattern=None,
+                    shadow=0):
+        """
+        Define several curves with the same style. `segments` is a
+        list of arrays with the (x,y) points of each curve. Curves
+        without filling, arrows and shadow become one ``\\path``.
+        """
+        if linestyle is None:
+            linestyle = self.linestyle
+        if linecolor is None:
+            linecolor = self.linecolor
+        if linewidth is None:
+            linewidth = self.linewidth
+        if fillcolor is None:
+            fillcolor = self.fillcolor
+        if fillpattern is None:
+            fillpattern = self.fillpattern
+        if arrow or shadow or fillcolor or fillpattern:
+            DrawingTool.plot_curves(
+                self, segments, linestyle, linewidth, linecolor, arrow,
+                fillcolor, fillpattern, shadow)
+            return
+        options = self._line_options(linestyle, linewidth, linecolor)
+        path = self._path([xy[:,0] for xy in segments],
+                          [xy[:,1] for xy in segments])
+        self._commands.append('\\path[%s] %s;' %
+                              (self._style(options), path))
+
+    def text(self, text, position, alignment='center', fontsize=0,
+             arrow_tip=None, bgcolor=None, fgcolor=None, fontfamily=None):
+        """
+        Write `text` string (LaTeX) at a position (centered, left,
+        right - according to the `alignment` string). If ``arrow_tip``
+        is given, an arrow is drawn from the text to that (x,y) point.
+        """
+        if fontsize == 0:
+            fontsize = self.fontsize
+        anchor = self.tikz_anchors.get(alignment, 'base')
+        if arrow_tip is not None:
+            if not len(arrow_tip) == 2:
+                raise ValueError('arrow_tip=%s must be (x,y) pt.' % arrow_tip)
+            # The text hangs below the position (as in MatplotlibDraw)
+            anchor = anchor.replace('base', 'north')
+        font = '\\fontsize{%g}{%g}\\selectfont' % (fontsize, 1.2*fontsize)
+        if fontfamily is not None:
+            # \fontfamily takes effect at the \selectfont after it
+            font = '\\fontfamily{%s}' % fontfamily + font
+        options = ['anchor=%s' % anchor, 'inner sep=0pt', 'font=' + font]
+        if fgcolor is not None:
+            options.append('text=%s' % self._color(fgcolor))
+        if bgcolor is not None:
+            options += ['fill=%s' % self._color(bgcolor), 'inner sep=1pt']
+        at = self._path([np.array([position[0]], dtype=float)],
+                        [np.array([position[1]], dtype=float)])
+        if arrow_tip is None:
+            self._commands.append('\\node[%s] at %s {%s};' %
+                                  (self._style(options), at, text))
+        else:
+            tip = self._path([np.array([arrow_tip[0]], dtype=float)],
+                             [np.array([arrow_tip[1]], dtype=float)])
+            arrow = ['draw=black', 'line width=1pt', '-latex',
+                     'shorten >=5pt', 'shorten <=5pt']
+            self._commands.append(
+                '\\node[%s] at %s {%s}; \\path[%s] %s--%s;' %
+                (self._style(options), at, text, self._style(arrow),
+                 at, tip))
+
+    def display(self, title=None, show=True):
+        """Set the title (a TikZ picture is only made by ``savefig``)."""
+        if title is not None:
+            self.title = title
+
+    def savefig(self, filename, dpi=None, crop=True):
+        """
+        Save the figure as a TikZ picture in a .tex or .tikz file
+        (the extension .tex is added if `filename` has no extension).
+        With `crop` true, the picture only covers the drawing,
+        otherwise the whole coordinate system.
+        """
+        ext = os.path.splitext(filename)[1]
+        if not ext:
+            filename += '.tex'
+        elif ext not in ('.tex', '.tikz'):
+            raise ValueError('%s can only make .tex or .tikz files, not %s'
+                             % (self.__class__.__name__, filename))
+        with io.open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.tikz(crop))
+
+    def figure_bytes(self, formats=('tex',), dpi=None, crop=True):
+        """Return dict with the TikZ picture (bytes) for 'tex', 'tikz'."""
+        data = {}
+        for format in formats:
+            if format not in ('tex', 'tikz'):
+                raise ValueError('%s can only make tex or tikz, not %s' %
+                                 (self.__class__.__name__, format))
+            data[format] = self.tikz(crop).encode('utf-8')
+        return data
+
+    def tikz(self, crop=True):
+        """Return the tikzpicture environment with the current figure."""
+        commands = self._commands[:]
+        if self.title is not None:
+            commands.append(
+                '\\node[anchor=south,font=\\large] at (%g,%g) {%s};' %
+                (self.xmin + self.xrange/2., self.ymax, self.title))
+        if not crop:
+            commands.insert(0, '\\useasboundingbox (%g,%g) rectangle (%g,%g);'
+                            % (self.xmin, self.ymin, self.xmax, self.ymax))
+        styles = sorted(self._styles.items(), key=lambda s: int(s[1][1:]))
+        lines = ['%% Made by pysketcher. Needs \\usepackage{tikz} and '
+                 '\\usetikzlibrary{patterns}',
+                 '\\begin{tikzpicture}[x=%gcm,y=%gcm,line join=round]' %
+                 ((self.width/self.xrange,)*2)]
+        if styles:
+            lines.append('\\tikzset{%s}' % ',\n  '.join(
+                '%s/.style={%s}' % (name, options)
+                for options, name in styles))
+        lines += commands
+        lines.append('\\end{tikzpicture}\n')
+        return '\n'.join(lines)
+
+
+# Trailing zeros of the decimals, and a decimal point without decimals
+_trailing_zeros = re.compile(r'(\.\d*?)0+(?=[,)])')
+_bare_point = re.compile(r'\.(?=[,)])')
+
+def _path_data(xs, ys, precision, end=''):
+    """
+    Return TikZ path "(x,y)--(x,y)... (x,y)--..." for the curves with
+    coordinates xs[i], ys[i], rounded to `precision` decimals and
+    made by one formatting operation.
+    """
+    point = '(%%.%df,%%.%df)' % (precision, precision)
+    formats = []
+    coordinates = []
+    for x, y in zip(xs, ys):
+        xy = np.round(np.column_stack((x, y)), precision)
+        if len(xy) > 1:
+            # Drop points that coincide with the previous one
+            keep = np.ones(len(xy), dtype=bool)
+            keep[1:] = (xy[1:] != xy[:-1]).any(axis=1)
+            xy = xy[keep]
+        formats.append('--'.join([point]*len(xy)) + end)
+        coordinates.append(xy.ravel())
+    # -0 is written as 0
+    values = np.concatenate(coordinates) + 0.
+    data = ' '.join(formats) % tuple(values.tolist())
+    return _bare_point.sub('', _trailing_zeros.sub(r'\1', data))
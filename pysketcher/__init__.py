@@ -13,3 +13,4 @@ __version__ = '0.1'
 __author__ = 'Hans Petter Langtangen <hpl@simula.no>'
 
 from .shapes import *
+from .scenefile import load
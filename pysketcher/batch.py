@@ -0,0 +1,287 @@
+"""
+Rendering of many independent sketches ("scenes") by a pool of
+workers, for jobs that make a large number of parameterized figures::
+
+    import functools
+    from pysketcher import *
+    from pysketcher.batch import render_many
+
+    def beam(load):
+        return Composition(dict(
+            beam=Rectangle((1, 2), 8, 0.5),
+            load=Force((5, 4), (5, 2.5), '%g N' % load)))
+
+    scenes = [(functools.partial(beam, load), (0, 10, 0, 5))
+              for load in range(1, 1001)]
+    batch = render_many(scenes, formats=('png', 'pdf'), workers=4)
+    for result in batch:
+        with open('beam%04d.png' % result['index'], 'wb') as f:
+            f.write(result['data']['png'])
+    print(batch.report())
+
+A scene is a tuple (build, coordinates) or (build, coordinates,
+name). ``build()`` constructs the shapes and returns the shape to
+draw (or draws the shapes itself and returns None). `coordinates` is
+(xmin, xmax, ymin, ymax) or a dict with the keyword arguments of
+``set_coordinate_system``. Each scene is rendered with a new drawing
+tool in a ``drawing_context``: for Matplotlib, a Figure of its own
+that is unknown to pyplot, so the scenes share no state. The output
+is made in memory (``figure_bytes``) and returned as bytes, or written
+to files in `directory`.
+
+The workers are threads by default. Pysketcher's own work and most
+of Matplotlib's drawing hold the GIL, so threads mainly pay off when
+the scenes wait for something else (e.g. an external program); use
+``processes=True`` for a pool of forked processes that renders on
+several CPUs (only the results are pickled). Run this module to
+benchmark 1, 2, 4 and 8 workers::
+
+    python -m pysketcher.batch              # 64 scenes, threads
+    python -m pysketcher.batch --scenes 200 --processes --tool svg
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import absolute_import
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from builtins import object
+
+import os, time, functools, threading, multiprocessing
+from .shapes import drawing_context
+
+def render_scene(build, coordinates, formats=('png',), tool='matplotlib',
+                 dpi=None, crop=True):
+    """
+    Render the scene made by ``build()`` in the coordinate system
+    `coordinates` (see the module doc string) with a new drawing tool
+    in the current thread. `tool` is a name in ``drawing_tools`` or a
+    callable that returns a new drawing tool object. Return dict with
+    the figure in each of the `formats`, as bytes.
+    """
+    if not isinstance(tool, str):
+        tool = tool()
+    with drawing_context(tool) as t:
+        try:
+            t.use_offscreen_figure()  # Matplotlib: no pyplot, no window
+            if isinstance(coordinates, dict):
+                t.set_coordinate_system(**coordinates)
+            else:
+                t.set_coordinate_system(*coordinates)
+            shape = build()
+            if shape is not None:
+                shape.draw()
+            return t.figure_bytes(formats, dpi=dpi, crop=crop)
+        finally:
+            if hasattr(t, 'close'):
+                t.close()  # e.g. the Gnuplot process
+
+def _render_task(options, task):
+    """Render scene `task` = (index, build, coordinates[, name])."""
+    formats, tool, directory, dpi, crop = options
+    index, build, coordinates = task[:3]
+    name = task[3] if len(task) > 3 else 'scene%04d' % index
+    t0 = time.time()
+    data = render_scene(build, coordinates, formats, tool, dpi, crop)
+    result = {'index': index, 'name': name,
+              'worker': '%d:%s' % (os.getpid(),
+                                   threading.current_thread().name)}
+    if directory is None:
+        result['data'] = data
+    else:
+        result['files'] = {}
+        for format in formats:
+            filename = os.path.join(directory, '%s.%s' % (name, format))
+            with open(filename, 'wb') as f:
+                f.write(data[format])
+            result['files'][format] = filename
+    result['bytes'] = sum(len(data[format]) for format in formats)
+    result['time'] = time.time() - t0
+    return result
+
+# Scenes and options in a worker process of render_many (set by
+# _set_forked_batch when the worker starts)
+_forked_batch = None
+
+def _set_forked_batch(batch):
+    """Pool initializer: store (options, tasks) in the worker process."""
+    global _forked_batch
+    _forked_batch = batch
+
+def _render_forked(index):
+    """Render scene no `index` of _forked_batch in a worker process."""
+    options, tasks = _forked_batch
+    return _render_task(options, tasks[index])
+
+
+class Batch(object):
+    """
+    The scenes being rendered by ``render_many``. Iterating gives the
+    result of each scene as it is done (in the order of the scenes,
+    or as they complete with ``ordered=False``): a dict with index,
+    name, data (dict format: bytes) or files (dict format: filename),
+    bytes (total size), time (s) and worker (process id:thread name).
+
+    ============ ====================================================
+    Attribute    Description
+    ============ ====================================================
+    workers      no of workers in the pool
+    processes    True if the workers are processes
+    scenes       no of scenes done so far
+    bytes        total size of the output so far
+    render_time  sum of the times of the scenes done so far (s)
+    time         wall time (s) from the start until the last scene
+    ============ ====================================================
+    """
+    def __init__(self, pool, results, workers, processes):
+        self._pool = pool
+        self._results = results
+        self.workers = workers
+        self.processes = processes
+        self.scenes = 0
+        self.bytes = 0
+        self.render_time = 0.
+        self._start = time.time()
+        self.time = 0.
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._pool is None:
+            raise StopIteration
+        try:
+            result = next(self._results)
+        except StopIteration:
+            self.close()
+            raise
+        except BaseException:
+            self.close(terminate=True)
+            raise
+        self.scenes += 1
+        self.bytes += result['bytes']
+        self.render_time += result['time']
+        self.time = time.time() - self._start
+        return result
+
+    def results(self):
+        """Wait for all scenes and return the list of results."""
+        return list(self)
+
+    def close(self, terminate=False):
+        """Stop the pool (the scenes not yet rendered are dropped)."""
+        if self._pool is not None:
+            if terminate:
+                self._pool.terminate()
+            else:
+                self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def stats(self):
+        """Return dict with the counts, times and throughput so far."""
+        stats = dict(workers=self.workers, processes=self.processes,
+                     scenes=self.scenes, bytes=self.bytes,
+                     render_time=self.render_time, time=self.time)
+        stats['scenes_per_second'] = self.scenes/self.time \
+                                     if self.time > 0 else 0.
+        stats['bytes_per_second'] = self.bytes/self.time \
+                                    if self.time > 0 else 0.
+        return stats
+
+    def report(self):
+        """Return a line with the throughput so far."""
+        return '%d scenes in %.2f s with %d %s: %.1f scenes/s, ' \
+               '%.1f ms per scene in the workers, %.2f MB/s' % \
+               (self.scenes, self.time, self.workers,
+                'processes' if self.processes else 'threads',
+                self.scenes/self.time if self.time > 0 else 0.,
+                1000*self.render_time/max(self.scenes, 1),
+                self.bytes/self.time/1e6 if self.time > 0 else 0.)
+
+
+def render_many(scenes, formats=('png',), workers=None, tool='matplotlib',
+                directory=None, processes=False, ordered=True, dpi=None,
+                crop=True):
+    """
+    Render `scenes` (see the module doc string) by a pool of
+    `workers` threads, or forked processes if `processes` is true
+    (default: one worker per CPU). Each scene is saved in all
+    `formats` (e.g. 'png', 'pdf', 'svg' for Matplotlib) with
+    resolution `dpi` and, with `crop` true, without the white space
+    around the drawing, by a new `tool` (name or callable, see
+    ``render_scene``). Return a ``Batch``, which gives the result of
+    each scene when iterated over; the results hold bytes, or the
+    names of the files written in `directory`.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if isinstance(formats, str):
+        formats = (formats,)
+    options = (tuple(formats), tool, directory, dpi, crop)
+    tasks = ((index,) + tuple(scene) for index, scene in enumerate(scenes))
+    if processes:
+        if not hasattr(os, 'fork'):
+            raise ValueError('render_many: processes=True requires os.fork')
+        # Workers are forked so that the scenes need not be picklable:
+        # the initializer's arguments are inherited, also by the
+        # workers that the pool starts in place of exited ones
+        if hasattr(multiprocessing, 'get_context'):
+            context = multiprocessing.get_context('fork')
+        else:
+            context = multiprocessing  # Python 2 always forks
+        tasks = list(tasks)
+        pool = context.Pool(workers, initializer=_set_forked_batch,
+                            initargs=((options, tasks),))
+        task_ids = range(len(tasks))
+        results = pool.imap(_render_forked, task_ids) if ordered else \
+                  pool.imap_unordered(_render_forked, task_ids)
+    else:
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(workers)
+        render = functools.partial(_render_task, options)
+        results = pool.imap(render, tasks) if ordered else \
+                  pool.imap_unordered(render, tasks)
+    return Batch(pool, results, workers, processes)
+
+
+def _bench_scene(i):
+    """A spring with i % 10 + 5 windings under a force (benchmark)."""
+    from .shapes import Composition, Spring, Rectangle, Force
+    return Composition(dict(
+        wall=Rectangle((1, 0.5), 2, 0.5).set_filled_curves(pattern='/'),
+        spring=Spring((2, 1), 2.5, num_windings=i % 10 + 5, width=0.4),
+        force=Force((2, 5), (2, 3.5), '$F_{%d}$' % i)))
+
+def main(args=None):
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Benchmark of render_many with 1, 2, 4 and 8 workers.')
+    parser.add_argument('--scenes', type=int, default=64,
+                        help='number of scenes (default 64)')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[1, 2, 4, 8])
+    parser.add_argument('--tool', default='matplotlib',
+                        help='drawing tool (default matplotlib)')
+    parser.add_argument('--formats', nargs='+', default=None,
+                        help='default: png for matplotlib, svg for svg, ...')
+    parser.add_argument('--processes', action='store_true',
+                        help='pool of processes instead of threads')
+    args = parser.parse_args(args)
+    formats = args.formats or {'matplotlib': ['png'], 'svg': ['svg'],
+                               'tikz': ['tex']}.get(args.tool, ['png'])
+    scenes = [(functools.partial(_bench_scene, i), (0, 4, 0, 6))
+              for i in range(args.scenes)]
+    render_scene(scenes[0][0], scenes[0][1], formats, args.tool)  # warm up
+    print('%d CPUs, %d scenes by %s, formats %s' %
+          (multiprocessing.cpu_count(), args.scenes, args.tool,
+           ', '.join(formats)))
+    for workers in args.workers:
+        batch = render_many(scenes, formats, workers, args.tool,
+                            processes=args.processes)
+        batch.results()
+        print(batch.report())
+
+if __name__ == '__main__':
+    main()
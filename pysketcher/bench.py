@@ -0,0 +1,321 @@
+"""
+Benchmarks of pysketcher.
+
+Example scripts: measure the cost of pysketcher itself (constructing,
+transforming and traversing shapes) by running the scripts with the
+NullDraw drawing tool, which draws nothing but counts the curves,
+points, texts etc. that the shapes send to it::
+
+    python -m pysketcher.bench                  # all scripts in examples/
+    python -m pysketcher.bench --repeat 5 examples/beam2.py
+    python -m pysketcher.bench --json results.json
+
+Each script runs in a temporary directory, with an endless supply of
+empty lines as standard input (for ``input()`` calls), standard output
+discarded, and ``time.sleep`` doing nothing. The best time of `repeat`
+runs is reported.
+
+Shape classes: time the construction, translate, rotate, draw with
+NullDraw and with MatplotlibDraw (Agg), and savefig (PNG) of one
+instance of each class in ``shape_cases``, and record the peak memory
+allocated when constructing and drawing it (Python 3)::
+
+    python -m pysketcher.bench --shapes         # all shape classes
+    python -m pysketcher.bench --shapes Spring Wheel --json shapes.json
+
+Each operation is repeated until it has run for at least 0.05 s, and
+the best time per operation of `repeat` such runs is reported. With
+``--json``, the results are stored together with the versions of
+pysketcher, Python, numpy and matplotlib, for comparing releases.
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import absolute_import
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+
+import os, sys, io, glob, time, json, runpy, shutil, tempfile, platform
+import numpy as np
+from . import shapes
+from .shapes import use_drawing_tool, drawing_tool
+from .NullDraw import NullDraw
+
+# examples/ of the source tree (not installed with the package)
+examples_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            os.pardir, 'examples')
+
+class _EmptyLines(io.StringIO):
+    """Standard input where every line is empty."""
+    def readline(self, size=-1):
+        return '\n'
+
+def run_example(filename, repeat=3):
+    """
+    Run the script `filename` `repeat` times with NullDraw. Return
+    dict with the name, the best time (s), and the counts and figure
+    times of NullDraw in the best run, or with the error message if
+    the script failed.
+    """
+    filename = os.path.abspath(filename)
+    result = {'name': os.path.splitext(os.path.basename(filename))[0]}
+    previous = drawing_tool._tool
+    tool = use_drawing_tool(NullDraw())
+    saved = sys.stdin, sys.stdout, time.sleep
+    sys.stdin, sys.stdout = _EmptyLines(), io.StringIO()
+    time.sleep = lambda seconds: None
+    cwd = os.getcwd()
+    directory = tempfile.mkdtemp()
+    os.chdir(directory)  # files made by the script end up here
+    sys.path.insert(0, os.path.dirname(filename))
+    try:
+        for i in range(repeat):
+            tool.reset()
+            t0 = time.time()
+            runpy.run_path(filename, run_name='__main__')
+            t = time.time() - t0
+            if 'time' not in result or t < result['time']:
+                result.update(tool.counts)
+                result['time'] = t
+                result['figure_time'] = sum(tool.times)
+    except BaseException as e:
+        if isinstance(e, KeyboardInterrupt):
+            raise
+        result['error'] = '%s: %s' % (e.__class__.__name__, e)
+    finally:
+        sys.path.remove(os.path.dirname(filename))
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+        sys.stdin, sys.stdout, time.sleep = saved
+        use_drawing_tool(previous)
+    return result
+
+def run_examples(filenames=None, repeat=3):
+    """Run the scripts (default: all in examples/), return results."""
+    if not filenames:
+        filenames = sorted(glob.glob(os.path.join(examples_dir, '*.py')))
+    return [run_example(filename, repeat) for filename in filenames]
+
+def report(results):
+    """Return the results of run_examples as a table (string)."""
+    columns = ('curves', 'points', 'texts', 'figures')
+    lines = ['%-28s %9s %9s' % ('script', 'time (ms)', 'figs (ms)') +
+             ''.join(' %8s' % c for c in columns)]
+    for r in results:
+        if 'error' in r:
+            lines.append('%-28s %s' % (r['name'], r['error']))
+        else:
+            lines.append('%-28s %9.1f %9.1f' %
+                         (r['name'], 1000*r['time'], 1000*r['figure_time']) +
+                         ''.join(' %8d' % r[c] for c in columns))
+    return '\n'.join(lines)
+
+# Coordinate system of the shape cases
+shape_area = dict(xmin=0, xmax=10, ymin=0, ymax=10)
+
+def _profile(y):
+    return (0.1*y*(4 - y), 0)
+
+# One instance of each public shape class, made by a function
+shape_cases = {
+    'Curve': lambda: shapes.Curve(np.linspace(0, 10, 1001),
+                                  5 + np.sin(np.linspace(0, 10, 1001))),
+    'Spline': lambda: shapes.Spline([1, 3, 5, 7, 9], [4, 6, 5, 7, 4]),
+    'SketchyFunc1': lambda: shapes.SketchyFunc1('f'),
+    'SketchyFunc2': lambda: shapes.SketchyFunc2('f'),
+    'SketchyFunc3': lambda: shapes.SketchyFunc3('f'),
+    'SketchyFunc4': lambda: shapes.SketchyFunc4('f'),
+    'Rectangle': lambda: shapes.Rectangle((2, 2), 4, 3),
+    'Triangle': lambda: shapes.Triangle((2, 2), (6, 2), (4, 6)),
+    'Line': lambda: shapes.Line((2, 2), (8, 6)),
+    'Circle': lambda: shapes.Circle((5, 5), 2),
+    'Arc': lambda: shapes.Arc((5, 5), 2, 0, 120),
+    'Parabola': lambda: shapes.Parabola((2, 2), (5, 7), (8, 2)),
+    'Wall': lambda: shapes.Wall([[1, 3], [5, 8]], [[2, 3], [2, 4]], 0.5),
+    'Wall2': lambda: shapes.Wall2([1, 3, 5, 8], [2, 3, 2, 4], 0.5),
+    'VelocityProfile': lambda: shapes.VelocityProfile(
+        (2, 2), 4, _profile, 8),
+    'Arrow1': lambda: shapes.Arrow1((2, 2), (8, 6)),
+    'Arrow3': lambda: shapes.Arrow3((5, 2), 4, 30),
+    'Text': lambda: shapes.Text('$x$', (5, 5)),
+    'Text_wArrow': lambda: shapes.Text_wArrow('$x$', (3, 7), (5, 5)),
+    'Axis': lambda: shapes.Axis((2, 2), 6, '$x$'),
+    'Force': lambda: shapes.Force((2, 2), (6, 5), '$F$'),
+    'Axis2': lambda: shapes.Axis2((2, 2), 6, '$x$'),
+    'Gravity': lambda: shapes.Gravity((5, 8), 4),
+    'Distance_wText': lambda: shapes.Distance_wText((2, 2), (8, 2), '$L$'),
+    'Arc_wText': lambda: shapes.Arc_wText('$a$', (5, 5), 2, 0, 90),
+    'Composition': lambda: shapes.Composition(dict(
+        (name, shape_cases[name]()) for name in
+        ('Rectangle', 'Circle', 'Arrow1', 'Text', 'Spring'))),
+    'SimplySupportedBeam': lambda: shapes.SimplySupportedBeam((5, 5), 2),
+    'ConstantBeamLoad': lambda: shapes.ConstantBeamLoad((2, 5), 6, 1),
+    'Moment': lambda: shapes.Moment('$M$', (5, 5), 2),
+    'Wheel': lambda: shapes.Wheel((5, 5), 2),
+    'SineWave': lambda: shapes.SineWave(1, 9, 1, 0.5, 5),
+    'Spring': lambda: shapes.Spring((5, 1), 6),
+    'Dashpot': lambda: shapes.Dashpot((5, 1), 6),
+    'Wavy': lambda: shapes.Wavy(lambda x: 5 + 0.1*x, [1, 9], 0.5, 0.2, 1),
+    'StochasticWavyCurve': lambda:
+        shapes.StochasticWavyCurve().shapes['wavy'].scale(0.19).translate(
+            (0.2, 5)),
+    'ArbitraryVolume': lambda: shapes.ArbitraryVolume((5, 5), 3,
+                                                      vector_field_symbol='v'),
+    }
+
+def _timeit(func, repeat, min_time=0.05):
+    """Return best time per call of func() in `repeat` runs."""
+    best = None
+    for i in range(repeat):
+        n = 0
+        t0 = time.time()
+        while True:
+            func()
+            n += 1
+            t = time.time() - t0
+            if t >= min_time:
+                break
+        best = t/n if best is None else min(best, t/n)
+    return best
+
+def _peak_memory(func):
+    """Return peak memory (bytes) allocated by func(), None if unknown."""
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_shape(name, repeat=3, directory=None):
+    """
+    Time the operations on shape_cases[name] (see module doc string).
+    Return dict with the name and the times (s) of construct,
+    translate, rotate, draw_null, draw_agg, savefig, and the peak
+    memory (bytes) in memory, or with the error message if an
+    operation failed (the operations that went well are kept).
+    """
+    from .MatplotlibDraw import MatplotlibDraw
+    make = shape_cases[name]
+    result = {'name': name}
+    previous = drawing_tool._tool
+    null, agg = NullDraw(), MatplotlibDraw(backend='Agg')
+    cleanup = directory is None
+    if cleanup:
+        directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, '%s.png' % name)
+
+    def draw():
+        drawing_tool.erase()
+        shape.draw()
+
+    def construct_and_draw():
+        make().draw()
+
+    # Transformations are done back and forth (2 operations) such that
+    # the shape stays inside the area
+    def translate():
+        shape.translate((0.1, 0))
+        shape.translate((-0.1, 0))
+
+    def rotate():
+        shape.rotate(10, (5, 5))
+        shape.rotate(-10, (5, 5))
+
+    phases = [('construct', null, make, 1),
+              ('translate', null, translate, 2),
+              ('rotate', null, rotate, 2),
+              ('draw_null', null, draw, 1),
+              ('draw_agg', agg, draw, 1),
+              ('savefig', agg, lambda: drawing_tool.savefig(filename), 1)]
+    try:
+        for phase, tool, func, operations in phases:
+            if drawing_tool._tool is not tool:
+                use_drawing_tool(tool)
+                drawing_tool.set_coordinate_system(**shape_area)
+                shape = make()
+                shape.draw()
+            result[phase] = _timeit(func, repeat)/operations
+        use_drawing_tool(null)
+        result['memory'] = _peak_memory(construct_and_draw)
+    except Exception as e:
+        result['error'] = '%s: %s' % (e.__class__.__name__, e)
+    finally:
+        use_drawing_tool(previous)
+        if cleanup:
+            shutil.rmtree(directory, ignore_errors=True)
+    return result
+
+def run_shapes(names=None, repeat=3):
+    """Run shape cases (default: all), return list of results."""
+    if not names:
+        names = sorted(shape_cases)
+    for name in names:
+        if name not in shape_cases:
+            raise ValueError('no shape case %s (choose among %s)' %
+                             (name, ', '.join(sorted(shape_cases))))
+    return [run_shape(name, repeat) for name in names]
+
+def shape_report(results):
+    """Return the results of run_shapes as a table (string)."""
+    columns = ('construct', 'translate', 'rotate', 'draw_null',
+               'draw_agg', 'savefig')
+    lines = ['%-20s' % 'time (ms)' + ''.join(' %9s' % c for c in columns) +
+             ' %9s' % 'mem (kB)']
+    for r in results:
+        line = '%-20s' % r['name']
+        for c in columns:
+            line += ' %9.3f' % (1000*r[c]) if c in r else ' %9s' % '-'
+        if r.get('memory') is not None:
+            line += ' %9.1f' % (r['memory']/1024.)
+        if 'error' in r:
+            line += ' %s' % r['error']
+        lines.append(line)
+    return '\n'.join(lines)
+
+def versions():
+    """Return dict with the versions of pysketcher and its tools."""
+    from . import __version__
+    v = {'pysketcher': __version__, 'python': platform.python_version(),
+         'numpy': np.__version__}
+    try:
+        import matplotlib
+        v['matplotlib'] = matplotlib.__version__
+    except ImportError:
+        pass
+    return v
+
+def main(args=None):
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='python -m pysketcher.bench',
+        description='Time example scripts with the NullDraw drawing '
+        'tool, or operations on shape classes.')
+    parser.add_argument('scripts', nargs='*',
+                        help='scripts to run (default: examples/*.py), '
+                        'or shape classes with --shapes (default: all)')
+    parser.add_argument('--shapes', action='store_true',
+                        help='time operations on shape classes')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='no of runs of each case (best is reported)')
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args(args)
+    if args.shapes:
+        results = run_shapes(args.scripts, args.repeat)
+        print(shape_report(results))
+    else:
+        results = run_examples(args.scripts, args.repeat)
+        print(report(results))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'versions': versions(), 'results': results}, f,
+                      indent=1, sort_keys=True)
+    return 1 if any('error' in r for r in results) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Persistent cache of arrays on disk, shared by all processes that use
+the same directory. Used by ``MatplotlibDraw.text`` to store the
+outlines of texts rendered by LaTeX.
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import absolute_import
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from builtins import object
+
+import os, hashlib, tempfile
+import numpy as np
+
+# Atomic overwrite of an existing file (os.rename on Python 2)
+_replace = getattr(os, 'replace', os.rename)
+
+def default_cache_dir():
+    """
+    Directory for pysketcher's caches: $PYSKETCHER_CACHE_DIR, or
+    pysketcher in $XDG_CACHE_HOME (default ~/.cache).
+    """
+    directory = os.environ.get('PYSKETCHER_CACHE_DIR')
+    if not directory:
+        directory = os.path.join(
+            os.environ.get('XDG_CACHE_HOME',
+                           os.path.join(os.path.expanduser('~'), '.cache')),
+            'pysketcher')
+    return directory
+
+class DiskCache(object):
+    """
+    Content-addressed cache of dicts of numpy arrays, stored as one
+    .npz file per entry in `directory`. A key is any tuple of strings
+    and numbers; its SHA-1 hash names the file. Entries are written
+    atomically (rename of a complete temporary file) so that several
+    processes can share the cache.
+
+    The total size of the files is kept below `maxsize` bytes by
+    removing the least recently used entries (a hit updates the
+    modification time of the file).
+
+    ============ ====================================================
+    Attribute    Description
+    ============ ====================================================
+    directory    where the entries are stored
+    maxsize      max total size (bytes) of the entries
+    hits         no of lookups that found an entry (in this process)
+    misses       no of lookups that found no entry (in this process)
+    evictions    no of entries removed to respect maxsize
+    ============ ====================================================
+    """
+    suffix = '.npz'
+
+    def __init__(self, directory, maxsize=50*1024**2):
+        self.directory = directory
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+
+    def _filename(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + self.suffix)
+
+    def get(self, key):
+        """Return the dict of arrays stored under `key`, or None."""
+        filename = self._filename(key)
+        try:
+            with np.load(filename, allow_pickle=False) as data:
+                arrays = dict((name, data[name]) for name in data.files)
+            os.utime(filename, None)  # most recently used
+        except (IOError, OSError, ValueError):
+            # Missing, removed by another process or incomplete
+            self.misses += 1
+            return None
+        self.hits += 1
+        return arrays
+
+    def put(self, key, arrays):
+        """Store the dict `arrays` of numpy arrays under `key`."""
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:
+                if not os.path.isdir(self.directory):
+                    raise
+        fd, tmpname = tempfile.mkstemp(suffix=self.suffix,
+                                       dir=self.directory, prefix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            _replace(tmpname, self._filename(key))
+        except:
+            os.remove(tmpname)
+            raise
+        self._evict()
+
+    def _entries(self):
+        """Return list of (mtime, size, filename) for all entries."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix) and not name.startswith('.'):
+                filename = os.path.join(self.directory, name)
+                try:
+                    s = os.stat(filename)
+                except OSError:
+                    continue
+                entries.append((s.st_mtime, s.st_size, filename))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        size = sum(entry[1] for entry in entries)
+        for mtime, nbytes, filename in sorted(entries):
+            if size <= self.maxsize:
+                break
+            try:
+                os.remove(filename)
+                self.evictions += 1
+            except OSError:
+                pass  # removed by another process
+            size -= nbytes
+
+    def clear(self):
+        """Remove all entries."""
+        if os.path.isdir(self.directory):
+            for mtime, nbytes, filename in self._entries():
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
+
+    def stats(self):
+        """Return dict with hits, misses, evictions, entries and size."""
+        entries = self._entries() if os.path.isdir(self.directory) else []
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'entries': len(entries),
+                'size': sum(entry[1] for entry in entries)}
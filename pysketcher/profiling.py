@@ -0,0 +1,156 @@
+"""
+Opt-in profiling of the traversal of shape trees. When profiling is
+on (``drawing_tool.profile()``), ``Shape._for_all_shapes`` records the
+wall time and the number of calls of each operation (``draw``,
+``rotate``, ...) on each shape, and ``Curve.draw`` counts the points,
+per shape class and per path of the shape in the tree (such as
+``['body']['wheel']``). The shape the operation was called on is
+recorded with the path ``(root)``. ``drawing_tool.profile_report()``
+shows the result as a table.
+
+Profiling is per thread (as ``drawing_context``): it records the
+shapes drawn in the thread that turned it on.
+
+When profiling is off, the only cost is a call of
+``current_profile()`` in ``_for_all_shapes`` and ``draw``.
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import absolute_import
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from builtins import object
+
+import time, threading, contextlib
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+class _Local(threading.local):
+    active = None  # the Profile being recorded (None: profiling is off)
+    last = None    # the most recent Profile
+
+_local = _Local()
+
+def current_profile():
+    """Return the Profile being recorded in this thread (or None)."""
+    return _local.active
+
+def last_profile():
+    """Return the most recent Profile of this thread (or None)."""
+    return _local.last
+
+class Profile(object):
+    """
+    Calls, wall time (s) and points per shape class and per path.
+    Times and points are inclusive: they cover the whole subtree of
+    a shape (a class that occurs at several levels of a path is
+    therefore counted more than once). A subtree drawn from packed
+    coordinates (see ``Shape.pack``) is timed as a whole.
+
+    ============ ====================================================
+    Attribute    Description
+    ============ ====================================================
+    classes      dict (operation, class name): [calls, time, points]
+    paths        dict (operation, path): [calls, time, points]
+    ============ ====================================================
+    """
+    def __init__(self):
+        self.classes = {}
+        self.paths = {}
+        self._stack = [['', 0]]  # [path, points] of shapes in progress
+
+    def idle(self):
+        """Return True if no shape operation is in progress."""
+        return len(self._stack) == 1
+
+    def call(self, name, shape, func, args, kwargs):
+        """Run shape.func(*args, **kwargs), where shape is `name` in
+        its parent, and record it."""
+        parent = self._stack[-1]
+        if isinstance(name, str):
+            path = "%s['%s']" % (parent[0], name)
+        else:
+            path = '%s[%d]' % (parent[0], name)
+        frame = [path, 0]
+        self._stack.append(frame)
+        t0 = _clock()
+        try:
+            return getattr(shape, func)(*args, **kwargs)
+        finally:
+            self._record(frame, parent, shape, func, path, _clock() - t0)
+
+    @contextlib.contextmanager
+    def root(self, shape, func):
+        """Record the operation `func` on `shape`, the root of the tree,
+        run in the with block."""
+        parent = self._stack[-1]
+        frame = ['', 0]
+        self._stack.append(frame)
+        t0 = _clock()
+        try:
+            yield
+        finally:
+            self._record(frame, parent, shape, func, '(root)',
+                         _clock() - t0)
+
+    def _record(self, frame, parent, shape, func, path, t):
+        """Pop `frame` and add its time `t` and points to the tables."""
+        self._stack.pop()
+        parent[1] += frame[1]
+        for table, key in ((self.classes, (func, shape.__class__.__name__)),
+                           (self.paths, (func, path))):
+            entry = table.get(key)
+            if entry is None:
+                entry = table[key] = [0, 0., 0]
+            entry[0] += 1
+            entry[1] += t
+            entry[2] += frame[1]
+
+    def points(self, n):
+        """Count `n` points drawn by the current shape."""
+        self._stack[-1][1] += n
+
+    def rows(self, by='class', operation='draw', sort='time'):
+        """
+        Return list of (name, calls, time, points) for `operation`,
+        per class (`by` is 'class') or path (`by` is 'path'), sorted
+        by 'time', 'calls', 'points' (decreasing) or 'name'.
+        """
+        if by not in ('class', 'path'):
+            raise ValueError("by=%r must be 'class' or 'path'" % by)
+        columns = ('name', 'calls', 'time', 'points')
+        if sort not in columns:
+            raise ValueError('sort=%r must be one of %s' %
+                             (sort, ', '.join(columns)))
+        table = self.classes if by == 'class' else self.paths
+        rows = [(key[1],) + tuple(value) for key, value in table.items()
+                if key[0] == operation]
+        column = columns.index(sort)
+        rows.sort(key=lambda row: row[column], reverse=sort != 'name')
+        return rows
+
+    def report(self, by='class', operation='draw', sort='time',
+               limit=None):
+        """Return table (string) with the `limit` first rows."""
+        rows = self.rows(by, operation, sort)[:limit]
+        width = max([len(row[0]) for row in rows] + [len(by)])
+        lines = ['%-*s %8s %10s %10s' % (width, by, 'calls', 'time (ms)',
+                                         'points')]
+        for name, calls, t, points in rows:
+            lines.append('%-*s %8d %10.3f %10d' %
+                         (width, name, calls, 1000*t, points))
+        return '\n'.join(lines)
+
+def start():
+    """Turn profiling on in this thread with a new Profile, which is
+    returned."""
+    _local.active = _local.last = Profile()
+    return _local.active
+
+def stop():
+    """Turn profiling off in this thread and return the Profile
+    (or None)."""
+    profile, _local.active = _local.active, None
+    return profile
@@ -0,0 +1,267 @@
+"""
+Compact binary files with a shape tree (``Shape.save``, ``load``).
+
+A scene file is an (uncompressed) zip archive, as made by
+``numpy.savez``, with the members
+
+  * ``scene.json``: the classes of the shapes, as [module, class
+    name, attribute names], and the tree as a list of nodes, one per
+    shape: [class no, attribute values], and for a Curve also the
+    first and last row of its coordinates in xy. A node with other
+    attributes than the first node of its class has a dict of
+    attributes. A sub shape is {"@": node no}, a tuple {"(": list},
+    a dict that is not a JSON object {"{": [[key, value], ...]}, a
+    small array {"#": list, "dtype": type} and a large array
+    {"$": n}.
+  * ``xy.npy``: the coordinates of all Curve objects in one (N,2)
+    array, stored column by column as in ``Shape.pack``.
+  * ``a0.npy``, ``a1.npy``, ...: the arrays with more than 16
+    elements in the attributes.
+
+``load`` makes the objects without calling their constructors, so
+that scenes built by expensive constructors (``Spring``, ``Dashpot``,
+``ArbitraryVolume``, ...) are reloaded in milliseconds. By default
+xy is memory-mapped (copy-on-write): the curves are views of the
+file, and changes of the coordinates are not written back.
+
+Attributes that cannot be stored (functions, objects of other
+packages such as a scipy spline) are left out; they are listed in
+the node, and only the methods that need them fail after loading.
+
+Only subclasses of Shape in the pysketcher package are made by
+``load``, such that a file from an untrusted source cannot import
+other modules or make objects of other classes.
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import absolute_import
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from builtins import object
+
+import io, json, struct, zipfile, importlib
+import numpy as np
+from .shapes import Shape, Curve
+
+format_version = 1
+
+class _Unstorable(Exception):
+    pass
+
+# Modules whose Shape classes load accepts
+_package = __name__.rpartition('.')[0] + '.'
+
+# Keys of the JSON objects that stand for other values (see above)
+_markers = frozenset(('@', '(', '{', '#', '$'))
+
+class _Writer(object):
+    """Convert a shape tree to nodes (JSON) and arrays."""
+    def __init__(self):
+        self.classes = []
+        self.class_numbers = {}  # class: class no
+        self.nodes = []
+        self.numbers = {}   # id(shape): node no
+        self.curves = []    # (x, y, node) of the curves
+        self.rows = 0       # no of rows in xy so far
+        self.arrays = []
+
+    def node(self, shape):
+        """Return the node no of `shape` (added if it is new)."""
+        number = self.numbers.get(id(shape))
+        if number is not None:
+            return number
+        number = self.numbers[id(shape)] = len(self.nodes)
+        node = [None, None]
+        self.nodes.append(node)
+        attributes = {}
+        dropped = []
+        if '_shapes' in shape.__dict__:
+            attributes['shapes'] = self.value(shape.shapes)
+        for name in shape.__dict__:
+            if name.startswith('_'):
+                continue  # caches, pack and lazy mode data
+            try:
+                attributes[name] = self.value(shape.__dict__[name])
+            except _Unstorable:
+                dropped.append(name)
+        cls = shape.__class__
+        class_number = self.class_numbers.get(cls)
+        if class_number is None:
+            class_number = self.class_numbers[cls] = len(self.classes)
+            self.classes.append([cls.__module__, cls.__name__,
+                                 sorted(attributes)])
+        names = self.classes[class_number][2]
+        node[0] = class_number
+        if len(names) == len(attributes) and \
+               all(name in attributes for name in names):
+            node[1] = [attributes[name] for name in names]
+        else:
+            node[1] = attributes
+            if dropped:
+                attributes['@dropped'] = dropped
+        if isinstance(shape, Curve):
+            x, y = shape.x, shape.y
+            self.curves.append((x, y))
+            node += [self.rows, self.rows + x.size]
+            self.rows += x.size
+        return number
+
+    def value(self, value):
+        """Return `value` as a JSON value (arrays and shapes by number)."""
+        if isinstance(value, Shape):
+            return {'@': self.node(value)}
+        if isinstance(value, np.ndarray):
+            if value.dtype.hasobject:
+                raise _Unstorable()
+            if value.size <= 16:
+                return {'#': value.tolist(), 'dtype': value.dtype.str}
+            self.arrays.append(value)
+            return {'$': len(self.arrays) - 1}
+        if isinstance(value, np.generic):
+            value = value.item()
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, list):
+            return [self.value(v) for v in value]
+        if isinstance(value, tuple):
+            return {'(': [self.value(v) for v in value]}
+        if isinstance(value, dict):
+            if all(isinstance(k, str) and k not in _markers for k in value):
+                return dict((k, self.value(v)) for k, v in value.items())
+            return {'{': [[self.value(k), self.value(v)]
+                          for k, v in value.items()]}
+        raise _Unstorable()
+
+
+def save(shape, filename):
+    """Save `shape` and all its sub shapes in the file `filename`."""
+    writer = _Writer()
+    writer.node(shape)
+    xy = np.zeros((writer.rows, 2), order='F')
+    start = 0
+    for x, y in writer.curves:
+        xy[start:start+x.size,0] = x
+        xy[start:start+x.size,1] = y
+        start += x.size
+    scene = {'format': 'pysketcher scene', 'version': format_version,
+             'classes': writer.classes, 'nodes': writer.nodes}
+    with zipfile.ZipFile(filename, 'w', zipfile.ZIP_STORED) as z:
+        z.writestr('scene.json', json.dumps(scene, separators=(',', ':')))
+        for name, array in [('xy', xy)] + \
+                [('a%d' % i, a) for i, a in enumerate(writer.arrays)]:
+            buf = io.BytesIO()
+            np.lib.format.write_array(buf, np.asanyarray(array),
+                                      allow_pickle=False)
+            z.writestr(name + '.npy', buf.getvalue())
+
+
+_npy_headers = {(1, 0): np.lib.format.read_array_header_1_0,
+                (2, 0): np.lib.format.read_array_header_2_0}
+
+def _memmap(filename, z, member):
+    """
+    Return the .npy `member` of the zip file `z` memory-mapped
+    (copy-on-write), or None if the member is compressed.
+    """
+    info = z.getinfo(member)
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(filename, 'rb') as f:
+        # The data follows the local file header (30 bytes + file
+        # name + extra field)
+        f.seek(info.header_offset)
+        header = struct.unpack('<4s22xHH', f.read(30))
+        f.seek(info.header_offset + 30 + header[1] + header[2])
+        version = np.lib.format.read_magic(f)
+        shape, fortran_order, dtype = _npy_headers[version](f)
+        offset = f.tell()
+    if dtype.hasobject:
+        return None
+    if 0 in shape:
+        return np.zeros(shape, dtype=dtype)  # mmap cannot map 0 bytes
+    array = np.memmap(filename, dtype=dtype, mode='c', offset=offset,
+                      shape=shape, order='F' if fortran_order else 'C')
+    # An ndarray view of the map (slicing a memmap object is slower)
+    return array.view(np.ndarray)
+
+def _read(filename, z, member, mmap):
+    array = _memmap(filename, z, member) if mmap else None
+    if array is None:
+        with z.open(member) as f:
+            array = np.lib.format.read_array(io.BytesIO(f.read()),
+                                             allow_pickle=False)
+    return array
+
+
+def _shape_class(filename, module, name):
+    """Return the Shape subclass `name` in pysketcher module `module`."""
+    cls = None
+    if module.startswith(_package):
+        cls = getattr(importlib.import_module(module), name, None)
+    if not (isinstance(cls, type) and issubclass(cls, Shape)):
+        raise ValueError('%s: %s.%s is not a shape class in pysketcher'
+                         % (filename, module, name))
+    return cls
+
+def load(filename, mmap=True):
+    """
+    Return the shape saved in the file `filename` by ``Shape.save``.
+    With `mmap` true, the coordinates of the curves are memory-mapped
+    from the file instead of read into memory.
+    """
+    with zipfile.ZipFile(filename) as z:
+        scene = json.loads(z.read('scene.json').decode('utf-8'))
+        if scene.get('format') != 'pysketcher scene':
+            raise ValueError('%s is not a pysketcher scene file' % filename)
+        if scene['version'] > format_version:
+            raise ValueError('%s has scene file format version %d, '
+                             'this pysketcher reads version %d or older'
+                             % (filename, scene['version'], format_version))
+        xy = _read(filename, z, 'xy.npy', mmap)
+        arrays = {}
+        def value(v):
+            t = type(v)  # JSON values have exact types
+            if t is list:
+                return [value(e) for e in v]
+            if t is not dict:
+                return v
+            if '@' in v:
+                return objects[v['@']]
+            if '(' in v:
+                return tuple(value(e) for e in v['('])
+            if '{' in v:
+                return dict((value(k), value(e)) for k, e in v['{'])
+            if '#' in v:
+                return np.array(v['#'], dtype=v['dtype'])
+            if '$' in v:
+                number = v['$']
+                if number not in arrays:
+                    arrays[number] = _read(filename, z, 'a%d.npy' % number,
+                                           mmap)
+                return arrays[number]
+            return dict((k, value(e)) for k, e in v.items())
+
+        # Make all objects first, since attributes refer to other nodes
+        classes = [_shape_class(filename, module, name)
+                   for module, name, names in scene['classes']]
+        objects = [classes[node[0]].__new__(classes[node[0]])
+                   for node in scene['nodes']]
+        for node, obj in zip(scene['nodes'], objects):
+            attributes = node[1]
+            if isinstance(attributes, list):
+                attributes = zip(scene['classes'][node[0]][2], attributes)
+            else:
+                attributes = [(name, v) for name, v in attributes.items()
+                              if name != '@dropped']
+            d = obj.__dict__
+            for name, v in attributes:
+                d['_shapes' if name == 'shapes' else name] = value(v)
+            if len(node) > 2:
+                # Curve: coordinates are views of xy
+                start, stop = node[2], node[3]
+                d['_pack'] = d['_matrix'] = d['_xy'] = d['_bbox'] = None
+                d['_x'] = xy[start:stop,0]
+                d['_y'] = xy[start:stop,1]
+    return objects[0]
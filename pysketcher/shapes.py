@@ -11,11 +11,114 @@ from builtins import range
 from builtins import *
 from builtins import object
 from numpy import linspace, sin, cos, pi, array, asarray, ndarray, sqrt, abs
+from numpy import zeros, cumsum, minimum, maximum, flatnonzero, split
+from numpy import concatenate, broadcast_to, vectorize
 import pprint, copy, glob, os
-from math import radians
+from math import radians, ceil
 
 from .MatplotlibDraw import MatplotlibDraw
-drawing_tool = MatplotlibDraw()
+from . import profiling
+import importlib, contextlib, threading
+
+# Drawing tools that can be selected by name in use_drawing_tool
+# (module, class); the module is imported when the tool is selected
+drawing_tools = {
+    'matplotlib': ('.MatplotlibDraw', 'MatplotlibDraw'),
+    'svg': ('.SVGDraw', 'SVGDraw'),
+    'tikz': ('.TikZDraw', 'TikZDraw'),
+    'gnuplot': ('.GnuplotDraw', 'GnuplotDraw'),
+    'null': ('.NullDraw', 'NullDraw'),
+    'cached': ('.CachedDraw', 'CachedDraw'),
+    }
+
+# The drawing tool of all threads (set by use_drawing_tool), and the
+# tool of the innermost drawing_context in each thread (if any)
+_default_tool = None
+
+class _Local(threading.local):
+    tool = None   # (class attribute: the value in new threads)
+
+_local = _Local()
+
+def current_drawing_tool():
+    """Return the drawing tool that shapes are drawn with (in this thread)."""
+    tool = _local.tool
+    return _default_tool if tool is None else tool
+
+class _DrawingToolProxy(object):
+    """
+    The module-level ``drawing_tool``: forwards all attribute access
+    to the current drawing tool (see ``current_drawing_tool``), such
+    that ``use_drawing_tool`` and ``drawing_context`` can replace the
+    tool for all modules that imported ``drawing_tool``.
+    """
+    __slots__ = ()
+
+    _tool = property(lambda self: current_drawing_tool())
+
+    def __getattr__(self, name):
+        tool = _local.tool
+        return getattr(_default_tool if tool is None else tool, name)
+
+    def __setattr__(self, name, value):
+        setattr(current_drawing_tool(), name, value)
+
+    def __repr__(self):
+        return repr(current_drawing_tool())
+
+def _make_tool(tool, args, kwargs):
+    """Return `tool`, or a new tool if `tool` is a name."""
+    if isinstance(tool, str):
+        if tool not in drawing_tools:
+            raise ValueError('drawing tool %s not in %s' %
+                             (tool, ', '.join(sorted(drawing_tools))))
+        modulename, classname = drawing_tools[tool]
+        module = importlib.import_module(modulename, __package__)
+        tool = getattr(module, classname)(*args, **kwargs)
+    return tool
+
+def use_drawing_tool(tool, *args, **kwargs):
+    """
+    Draw all shapes with `tool`: a drawing tool object, or the name
+    of one in `drawing_tools` ('matplotlib', 'svg', 'tikz',
+    'gnuplot', 'null' or 'cached'), which is then
+    constructed with `args` and `kwargs`. Return the new tool.
+    The tool is used in all threads, except inside a
+    ``drawing_context``.
+    The default tool is given by $PYSKETCHER_DRAWING_TOOL
+    (default 'matplotlib').
+    """
+    global _default_tool
+    _default_tool = _make_tool(tool, args, kwargs)
+    return _default_tool
+
+@contextlib.contextmanager
+def drawing_context(tool, *args, **kwargs):
+    """
+    Draw shapes with `tool` (given as in ``use_drawing_tool``) inside
+    the with block, in the current thread only. Each thread can then
+    draw its own figure, with its own coordinate system::
+
+        with drawing_context('svg') as tool:
+            tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+            sketch = Wheel((5, 2), 1)
+            sketch.draw()
+            tool.savefig('wheel.svg')
+
+    Also shapes that use the drawing tool when they are constructed
+    (e.g. ``drawing_tool.xrange`` for text positions) must be made
+    inside the block. Contexts can be nested.
+    """
+    tool = _make_tool(tool, args, kwargs)
+    previous = _local.tool
+    _local.tool = tool
+    try:
+        yield tool
+    finally:
+        _local.tool = previous
+
+drawing_tool = _DrawingToolProxy()
+use_drawing_tool(os.environ.get('PYSKETCHER_DRAWING_TOOL', 'matplotlib'))
 
 def point(x, y, check_inside=False):
     for obj, name in zip([x, y], ['x', 'y']):
@@ -111,8 +214,27 @@ def is_sequence(*sequences, **kwargs):
 
 def animate(fig, time_points, action, moviefiles=False,
             pause_per_frame=0.5, show_screen_graphics=True,
-            title=None,
-            **action_kwargs):
+            title=None, reuse_artists=False, blit=False,
+            parallel=0, verbose=False, **action_kwargs):
+    """
+    Run an animation: for each t in `time_points`, call
+    ``action(t, fig, **action_kwargs)``, which modifies `fig`, and
+    draw `fig`. With `reuse_artists` true, the figure is not erased
+    and redrawn from scratch in every frame, but the plotting
+    objects from the previous frame are given new coordinates (see
+    ``MatplotlibDraw.begin_frame``). With `blit` true (implies
+    `reuse_artists`), only the changing parts of the figure are
+    redrawn on the screen.
+
+    With `moviefiles` true, each frame is saved to a PNG file
+    ``tmp_frame_%04d.png``. The frames can then be rendered by
+    `parallel` worker processes (with no screen graphics). This
+    requires that ``action(t, fig)`` sets up the complete figure
+    for time `t`, i.e., it cannot depend on the frames before.
+    With `verbose` true, the time of each frame rendered by the
+    processes is printed.
+    """
+    reuse_artists = reuse_artists or blit
     if moviefiles:
         # Clean up old frame files
         framefilestem = 'tmp_frame_'
@@ -120,8 +242,19 @@ def animate(fig, time_points, action, moviefiles=False,
         for framefile in framefiles:
             os.remove(framefile)
 
+        if parallel > 1:
+            if hasattr(os, 'fork'):
+                _animate_parallel(fig, time_points, action, action_kwargs,
+                                  title, framefilestem, parallel, verbose)
+                return '%s%%04d.png' % framefilestem
+            print('animate: parallel=%d requires os.fork, '
+                  'rendering frames sequentially' % parallel)
+
     for n, t in enumerate(time_points):
-        drawing_tool.erase()
+        if reuse_artists:
+            drawing_tool.begin_frame()
+        else:
+            drawing_tool.erase()
 
         action(t, fig, **action_kwargs)
         #could demand returning fig, but in-place modifications
@@ -133,15 +266,206 @@ def animate(fig, time_points, action, moviefiles=False,
         #        '(a Shape object with the whole figure)')
 
         fig.draw()
-        drawing_tool.display(title=title, show=show_screen_graphics)
+        if reuse_artists:
+            drawing_tool.end_frame(blit=blit)
+        # With blitting, end_frame has already updated the screen
+        drawing_tool.display(title=title,
+                             show=show_screen_graphics and not blit)
 
         if moviefiles:
             drawing_tool.savefig('%s%04d.png' % (framefilestem, n),
                                  crop=False)
 
+    if reuse_artists:
+        drawing_tool.end_animation()
+
     if moviefiles:
         return '%s%%04d.png' % framefilestem
 
+# Data for the worker processes in _animate_parallel (inherited by fork)
+_parallel_animation = None
+
+def _animate_parallel(fig, time_points, action, action_kwargs,
+                      title, framefilestem, num_processes, verbose=False):
+    """Render the movie frames in animate by a pool of processes."""
+    import multiprocessing, time
+    global _parallel_animation
+    _parallel_animation = (fig, action, action_kwargs, title, framefilestem)
+    # Workers are forked so that fig and action need not be picklable
+    if hasattr(multiprocessing, 'get_context'):
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing  # Python 2 always forks
+    t0 = time.time()
+    pool = context.Pool(num_processes, initializer=_init_frame_worker)
+    try:
+        frames = pool.imap_unordered(_render_frame,
+                                     list(enumerate(time_points)))
+        for n, t, frame_time, pid in frames:
+            if verbose:
+                print('frame %4d  t=%-10g %7.3f s  (process %d)' %
+                      (n, t, frame_time, pid))
+    finally:
+        pool.close()
+        pool.join()
+        _parallel_animation = None
+    total_time = time.time() - t0
+    if verbose:
+        print('%d frames in %.2f s with %d processes (%.3f s per frame)' %
+              (len(time_points), total_time, num_processes,
+               total_time/max(len(time_points), 1)))
+
+def _init_frame_worker():
+    """Give a worker process in _animate_parallel its own figure."""
+    drawing_tool.instruction_file = None  # belongs to the parent process
+    drawing_tool.use_offscreen_figure()
+
+def _render_frame(frame):
+    """Draw and save a movie frame in a worker process."""
+    import time
+    t0 = time.time()
+    n, t = frame
+    fig, action, action_kwargs, title, framefilestem = _parallel_animation
+    drawing_tool.erase()
+    action(t, fig, **action_kwargs)
+    fig.draw()
+    drawing_tool.display(title=title, show=False)
+    drawing_tool.savefig('%s%04d.png' % (framefilestem, n), crop=False)
+    return n, t, time.time() - t0, os.getpid()
+
+
+def _inside_plot_area(xmin, xmax, ymin, ymax, verbose=True):
+    """Check that the given bounds are within drawing_tool's area."""
+    t = current_drawing_tool()
+    inside = True
+    if not hasattr(t, 'xmin'):
+        return None  # drawing area is not defined
+
+    if xmin < t.xmin:
+        inside = False
+        if verbose:
+            print('x_min=%g < plot area x_min=%g' % (xmin, t.xmin))
+    if xmax > t.xmax:
+        inside = False
+        if verbose:
+            print('x_max=%g > plot area x_max=%g' % (xmax, t.xmax))
+    if ymin < t.ymin:
+        inside = False
+        if verbose:
+            print('y_min=%g < plot area y_min=%g' % (ymin, t.ymin))
+    if ymax > t.ymax:
+        inside = False
+        if verbose:
+            print('y_max=%g > plot area y_max=%g' % (ymax, t.ymax))
+    return inside
+
+def _rotate_coordinates(xy, angle, center):
+    """
+    Rotate the (N,2) array `xy` in-place an `angle` (in degrees)
+    around `center`.
+    """
+    angle = radians(angle)
+    x, y = center
+    c = cos(angle);  s = sin(angle)
+    dx = xy[:,0] - x
+    dy = xy[:,1] - y
+    xy[:,0] = x + dx*c - dy*s
+    xy[:,1] = y + dx*s + dy*c
+
+def _displace(displacement_function, x, y, vectorized=None):
+    """
+    Return the new coordinates displacement_function(x,y) of the points
+    in the arrays `x` and `y`. With `vectorized` true, the function is
+    called with the arrays and must return two arrays (or scalars).
+    With `vectorized` false, the function works with one point at a time
+    and is called through ``numpy.vectorize``. With `vectorized` None,
+    the function is first called with the arrays, and if that raises
+    a ValueError or TypeError (as array arguments do in ``if x > 0:``
+    or ``math.sin(x)``), with one point at a time. The function is then
+    called twice, so give `vectorized` if it has side effects.
+    """
+    if vectorized or vectorized is None:
+        try:
+            xnew, ynew = displacement_function(x.copy(), y.copy())
+        except (ValueError, TypeError):
+            if vectorized:
+                raise
+        else:
+            return _broadcast(xnew, x.shape), _broadcast(ynew, y.shape)
+    if len(x) == 0:
+        return x, y
+    f = vectorize(displacement_function, otypes=[float, float])
+    return f(x, y)
+
+def _broadcast(values, shape):
+    """Return `values` as a float array of `shape` (scalars are repeated)."""
+    values = asarray(values, dtype=float)
+    if values.ndim == 0:
+        values = array(broadcast_to(values, shape))
+    elif values.shape != shape:
+        raise ValueError(
+            'displacement function returned coordinates of shape %s, '
+            'expected %s' % (values.shape, shape))
+    return values
+
+def _rotation_matrix(angle, center):
+    """3x3 affine matrix for rotation `angle` degrees around `center`."""
+    angle = radians(angle)
+    x, y = center
+    c = cos(angle);  s = sin(angle)
+    return array([[c, -s, x - c*x + s*y],
+                  [s,  c, y - s*x - c*y],
+                  [0,  0, 1]])
+
+def _translation_matrix(vec):
+    return array([[1, 0, vec[0]],
+                  [0, 1, vec[1]],
+                  [0, 0, 1]], dtype=float)
+
+def _scaling_matrix(factor):
+    return array([[factor, 0, 0],
+                  [0, factor, 0],
+                  [0, 0, 1]], dtype=float)
+
+def _adaptive_resolution(length, curvature, default, minimum=4):
+    """
+    Return the number of line segments needed for a curve of `length`
+    and maximum `curvature` (in data units) such that no point on the
+    curve is farther than drawing_tool.chord_tolerance pixels from the
+    segments: a segment of length h deviates h**2*curvature/8 from a
+    circular arc. Return `default` if no tolerance is set.
+    """
+    tol = drawing_tool.tolerance()
+    if tol is None:
+        return default
+    if curvature <= 0:
+        return minimum
+    h = sqrt(8*tol/curvature)
+    return max(minimum, int(ceil(length/h)))
+
+# A bounding box is a tuple (xmin, xmax, ymin, ymax)
+_empty_bbox = (1E+20, -1E+20, 1E+20, -1E+20)
+
+def _transformed_bbox(box, matrix):
+    """
+    Return the bounding box `box` transformed by the affine `matrix`,
+    or None if the matrix rotates (the new box must then be computed
+    from the coordinates).
+    """
+    if box is None or matrix[0,1] != 0 or matrix[1,0] != 0:
+        return None
+    if box == _empty_bbox:
+        return box
+    x1, x2 = matrix[0,0]*box[0] + matrix[0,2], matrix[0,0]*box[1] + matrix[0,2]
+    y1, y2 = matrix[1,1]*box[2] + matrix[1,2], matrix[1,1]*box[3] + matrix[1,2]
+    return (min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2))
+
+def _merge_bboxes(boxes):
+    if not boxes:
+        return _empty_bbox
+    return (min(box[0] for box in boxes), max(box[1] for box in boxes),
+            min(box[2] for box in boxes), max(box[3] for box in boxes))
+
 
 class Shape(object):
     """
@@ -175,8 +499,207 @@ class Shape(object):
         return [self]  # Make the iteration work
 
     def copy(self):
+        """
+        Return a copy of the shape tree. The coordinate arrays of the
+        curves are shared with the copy (copy-on-write): rotate,
+        translate, scale and deform give a curve new arrays and leave
+        the other objects unchanged, so only the curves that are
+        moved take up memory of their own. Assign to ``curve.x`` and
+        ``curve.y`` rather than changing the arrays in place.
+        """
         return copy.deepcopy(self)
 
+    # Attributes of Curve that are shared by a copy (see copy)
+    _shared_attributes = frozenset(('_x', '_y', '_xy'))
+    # Attributes that tie a shape to a PackedCoordinates object
+    _pack_attributes = frozenset(('_pack', '_pack_curves', '_pack_points',
+                                  '_start', '_stop', '_index'))
+
+    def __deepcopy__(self, memo):
+        cls = self.__class__
+        new = cls.__new__(cls)
+        memo[id(self)] = new
+        d = new.__dict__
+        for name, value in self.__dict__.items():
+            if name in self._shared_attributes:
+                d[name] = value
+            elif name in self._pack_attributes:
+                continue  # the copy is not packed
+            elif name == '_bbox':
+                d[name] = None  # computed again when needed (see bbox)
+            elif name == '_bbox_parents':
+                # Parents (maybe outside the copied tree) are not copied;
+                # the copy's parents are registered by their bbox calls
+                continue
+            else:
+                d[name] = copy.deepcopy(value, memo)
+        if '_pack' in self.__dict__:
+            d['_pack'] = None
+            if self._pack is not None and isinstance(self, Curve):
+                # The packed array changes in place: the copy needs
+                # arrays of its own
+                d['_x'], d['_y'] = self.x.copy(), self.y.copy()
+        return new
+
+    def save(self, filename):
+        """
+        Save the shape tree in a compact binary file, which is read
+        by ``load(filename)`` (see pysketcher.scenefile).
+        """
+        from .scenefile import save
+        save(self, filename)
+
+    # self.shapes is a property such that transformations that are
+    # pending in lazy mode (see set_lazy_transforms) are passed on to
+    # the children before anyone looks at them
+
+    def _get_shapes(self):
+        try:
+            shapes = self.__dict__['_shapes']
+        except KeyError:
+            raise AttributeError('%s object has no attribute shapes' %
+                                 self.__class__.__name__)
+        if self.__dict__.get('_matrix') is not None:
+            matrix = self._matrix
+            self._matrix = None
+            bbox = self.__dict__.get('_bbox')  # is already transformed
+            for shape in (shapes.values() if isinstance(shapes, dict)
+                          else shapes):
+                if isinstance(shape, Shape):
+                    shape._transform(matrix)
+            self._bbox = bbox
+        return shapes
+
+    def _set_shapes(self, shapes):
+        self.__dict__['_shapes'] = shapes
+        self._bbox = None
+        self._bbox_changed()
+
+    shapes = property(_get_shapes, _set_shapes,
+                      doc='dict (or list) of the Shape objects in this shape.')
+
+    def set_lazy_transforms(self, lazy=True):
+        """
+        Turn lazy transformations on or off for this shape and all its
+        sub shapes. In lazy mode, rotate, translate and scale only
+        update a 3x3 affine matrix in the shape. The matrix is passed
+        on to the sub shapes when they are accessed, and the curves
+        compute their coordinates from the original coordinates and
+        the accumulated matrix only when the coordinates are needed
+        (by draw, minmax_coordinates, geometric_features, etc.).
+        A long chain of transformations then costs one matrix product
+        per curve, and repeated small transformations (as in
+        animations) do not accumulate round-off errors in the
+        coordinates.
+
+        The coordinate arrays of a transformed curve in lazy mode are
+        read-only: assign new arrays to ``x`` and ``y`` to change them.
+        Lazy mode is turned off by ``pack``. A sub shape that is
+        accessed directly, not through the ``shapes`` attribute of its
+        parent, does not see the pending transformations of the parent.
+        """
+        self._lazy = lazy
+        self._for_all_shapes('set_lazy_transforms', lazy)
+        return self
+
+    def _transform(self, matrix):
+        """Apply the 3x3 affine `matrix` to all coordinates."""
+        bbox = self._cached_bbox()
+        if getattr(self, '_lazy', False):
+            if getattr(self, '_matrix', None) is not None:
+                self._matrix = matrix.dot(self._matrix)
+            else:
+                self._matrix = matrix
+        else:
+            packed = self._packed()
+            if packed is None:
+                self._for_all_shapes('_transform', matrix)
+            else:
+                xy, points = packed
+                xy[:] = xy.dot(matrix[:2,:2].T) + matrix[:2,2]
+                self._pack.changed()
+                for pt in points:
+                    pt._transform(matrix)
+        self._moved(_transformed_bbox(bbox, matrix))
+
+    # Bounding boxes (see bbox) are cached in self._bbox together
+    # with the version of the PackedCoordinates object (if packed).
+    # A shape that computes its box from the boxes of its sub shapes
+    # is registered in their self._bbox_parents lists such that a
+    # change in a sub shape removes the cached boxes of all shapes
+    # that contain it (see _bbox_changed).
+
+    def bbox(self):
+        """
+        Return the bounding box (xmin, xmax, ymin, ymax) of all
+        coordinates in the shape. The box is cached and computed again
+        only when some sub shape has been changed by a transformation,
+        deform, or assignment of a new sub shape (``__setitem__``).
+        Translation and scaling update the cached box directly.
+        (Changing the elements of coordinate arrays in-place is not
+        detected.)
+        """
+        box = self._cached_bbox()
+        if box is not None:
+            return box
+        packed = self._packed()
+        if packed is None:
+            boxes = []
+            self._for_all_shapes('_bbox_of_child', self, boxes)
+        else:
+            xy, points = packed
+            boxes = [pt._bbox_of_child(self) for pt in points]
+            if len(xy) > 0:
+                xmin, ymin = xy.min(axis=0)
+                xmax, ymax = xy.max(axis=0)
+                boxes.append((xmin, xmax, ymin, ymax))
+        box = _merge_bboxes(boxes)
+        self._set_bbox(box)
+        return box
+
+    def _bbox_of_child(self, parent, boxes=None):
+        """Return the box of this shape, which `parent` depends on."""
+        parents = self.__dict__.setdefault('_bbox_parents', [])
+        if not any(p is parent for p in parents):
+            parents.append(parent)
+        box = self.bbox()
+        if boxes is not None:
+            boxes.append(box)
+        return box
+
+    def _cached_bbox(self):
+        """Return the cached bounding box, or None if it is not valid."""
+        cache = self.__dict__.get('_bbox')
+        if cache is None:
+            return None
+        box, version = cache
+        pack = self.__dict__.get('_pack')
+        if version != (None if pack is None else pack.version):
+            return None
+        return box
+
+    def _set_bbox(self, box):
+        if box is None:
+            self._bbox = None
+        else:
+            pack = self.__dict__.get('_pack')
+            self._bbox = (box, None if pack is None else pack.version)
+
+    def _bbox_changed(self):
+        """Remove the cached boxes of all shapes containing this shape."""
+        for parent in self.__dict__.get('_bbox_parents', ()):
+            if parent.__dict__.get('_bbox') is not None:
+                parent._bbox = None
+                parent._bbox_changed()
+
+    def _moved(self, box):
+        """
+        The coordinates have changed and the new bounding box is `box`
+        (None if unknown).
+        """
+        self._bbox_changed()
+        self._set_bbox(box)
+
     def __getitem__(self, name):
         """
         Allow indexing like::
@@ -211,6 +734,9 @@ class Shape(object):
         """
         if hasattr(self, 'shapes'):
             self.shapes[name] = value
+            if getattr(self, '_pack', None) is not None:
+                self._pack.changed(valid=False)  # the tree has changed
+            self._moved(None)
         else:
             raise Exception('Cannot assign')
 
@@ -228,6 +754,11 @@ class Shape(object):
                 raise AttributeError('class %s has no shapes attribute!' %
                                      self.__class__.__name__)
 
+        profile = profiling.current_profile()
+        if profile is not None and profile.idle():
+            # self is the root of the tree: time the whole operation
+            with profile.root(self, func):
+                return self._for_all_shapes(func, *args, **kwargs)
         is_dict = True if isinstance(self.shapes, dict) else False
         for k, shape in enumerate(self.shapes):
             if is_dict:
@@ -268,10 +799,37 @@ class Shape(object):
                 shape.name = shape_name
             if verbose > 0:
                 print('calling %s.%s' % (shape_name, func))
-            getattr(shape, func)(*args, **kwargs)
+            if profile is None:
+                getattr(shape, func)(*args, **kwargs)
+            else:
+                profile.call(shape_name, shape, func, args, kwargs)
 
-    def draw(self, verbose=0):
-        self._for_all_shapes('draw', verbose=verbose)
+    def draw(self, verbose=0, tool=None):
+        """
+        Draw the shape with the current drawing tool, or with `tool`
+        (as in ``drawing_context``) if given.
+        """
+        if tool is not None:
+            with drawing_context(tool):
+                return self.draw(verbose)
+        profile = profiling.current_profile()
+        if profile is not None and profile.idle():
+            with profile.root(self, 'draw'):
+                return self.draw(verbose)
+        packed = self._packed()
+        if packed is None or verbose:
+            self._for_all_shapes('draw', verbose=verbose)
+        else:
+            # Check each curve against the plotting area only if
+            # the whole shape is not inside
+            inside = _inside_plot_area(*self.bbox(), verbose=False)
+            self._pack.draw(*self._pack_curves, check=inside is False)
+            if profile is not None:
+                first, last = self._pack_curves
+                profile.points(self._pack.offsets[last] -
+                               self._pack.offsets[first])
+            for pt in self._pack_points:
+                pt.draw()
         return self
 
     def draw_dimensions(self):
@@ -285,29 +843,144 @@ class Shape(object):
 
     def rotate(self, angle, center):
         is_sequence(center, length=2)
-        self._for_all_shapes('rotate', angle, center)
+        if getattr(self, '_lazy', False):
+            self._transform(_rotation_matrix(angle, center))
+            return self
+        packed = self._packed()
+        if packed is None:
+            self._for_all_shapes('rotate', angle, center)
+        else:
+            xy, points = packed
+            _rotate_coordinates(xy, angle, center)
+            self._pack.changed()
+            for pt in points:
+                pt.rotate(angle, center)
+        self._moved(None)
         return self
 
     def translate(self, vec):
         is_sequence(vec, length=2)
-        self._for_all_shapes('translate', vec)
+        if getattr(self, '_lazy', False):
+            self._transform(_translation_matrix(vec))
+            return self
+        bbox = self._cached_bbox()
+        packed = self._packed()
+        if packed is None:
+            self._for_all_shapes('translate', vec)
+        else:
+            xy, points = packed
+            xy += vec
+            self._pack.changed()
+            for pt in points:
+                pt.translate(vec)
+        self._moved(_transformed_bbox(bbox, _translation_matrix(vec)))
         return self
 
     def scale(self, factor):
-        self._for_all_shapes('scale', factor)
+        if getattr(self, '_lazy', False):
+            self._transform(_scaling_matrix(factor))
+            return self
+        bbox = self._cached_bbox()
+        packed = self._packed()
+        if packed is None:
+            self._for_all_shapes('scale', factor)
+        else:
+            xy, points = packed
+            xy *= factor
+            self._pack.changed()
+            for pt in points:
+                pt.scale(factor)
+        self._moved(_transformed_bbox(bbox, _scaling_matrix(factor)))
         return self
 
-    def deform(self, displacement_function):
-        self._for_all_shapes('deform', displacement_function)
+    def deform(self, displacement_function, vectorized=None):
+        """
+        Displace all coordinates according to displacement_function(x,y),
+        which returns the new (x,y). The coordinates of all curves and
+        points in the shape are collected in two arrays such that the
+        function is called only once (see ``_displace`` for the
+        meaning of `vectorized`).
+        """
+        packed = self._packed()
+        if packed is None:
+            curves = []; points = []
+            self._pack_leaves(curves, points, [])
+            xs = [curve.x for curve in curves]
+            ys = [curve.y for curve in curves]
+        else:
+            curves = None
+            xy, points = packed
+            xs = [xy[:,0]]
+            ys = [xy[:,1]]
+        xs.append(array([pt.x for pt in points], dtype=float))
+        ys.append(array([pt.y for pt in points], dtype=float))
+        offsets = [0] + cumsum([len(x) for x in xs]).tolist()
+        x, y = _displace(displacement_function,
+                         concatenate(xs), concatenate(ys), vectorized)
+
+        if curves is None:
+            xy[:,0] = x[:offsets[1]]
+            xy[:,1] = y[:offsets[1]]
+            self._pack.changed()
+        else:
+            for curve, start, stop in zip(curves, offsets[:-1], offsets[1:]):
+                curve.x = x[start:stop]
+                curve.y = y[start:stop]
+        for i, pt in enumerate(points):
+            pt.x, pt.y = x[offsets[-2]+i], y[offsets[-2]+i]
+            pt._moved(None)
+        self._moved(None)
         return self
 
     def minmax_coordinates(self, minmax=None):
         if minmax is None:
             minmax = {'xmin': 1E+20, 'xmax': -1E+20,
                       'ymin': 1E+20, 'ymax': -1E+20}
-        self._for_all_shapes('minmax_coordinates', minmax)
+        xmin, xmax, ymin, ymax = self.bbox()
+        minmax['xmin'] = min(xmin, minmax['xmin'])
+        minmax['xmax'] = max(xmax, minmax['xmax'])
+        minmax['ymin'] = min(ymin, minmax['ymin'])
+        minmax['ymax'] = max(ymax, minmax['ymax'])
         return minmax
 
+    def pack(self):
+        """
+        Compile the shape tree into a PackedCoordinates object: the
+        coordinates of all Curve objects in the tree are stored in one
+        contiguous (N,2) array and each Curve's x and y become views of
+        this array. Thereafter, rotate, translate, scale, draw and
+        minmax_coordinates on this object or any of its sub shapes
+        work on a slice of the array with one vectorized operation
+        instead of a recursive call for each curve.
+
+        The packing is abandoned (and the ordinary recursive methods
+        are used) if the tree is changed by assignment (``__setitem__``)
+        or if a curve gets a new number of points. Call ``pack`` again
+        to repack the tree. Line styles must be changed by the ``set_*``
+        methods after packing.
+        """
+        return PackedCoordinates(self)
+
+    def _pack_leaves(self, curves, points, nodes):
+        """Collect all Curve and Point objects in the tree (for pack)."""
+        first = len(curves)
+        npoints = len(points)
+        self._for_all_shapes('_pack_leaves', curves, points, nodes)
+        nodes.append((self, first, len(curves), points[npoints:]))
+
+    def _packed(self):
+        """
+        Return the slice of the packed coordinate array holding all
+        curves in this shape and a list of the Point objects in the
+        shape, or None if the shape is not (validly) packed.
+        """
+        pack = getattr(self, '_pack', None)
+        if pack is None or not pack.valid:
+            return None
+        first, last = self._pack_curves
+        return (pack.xy[pack.offsets[first]:pack.offsets[last]],
+                self._pack_points)
+
     def recurse(self, name, indent=0):
         if not isinstance(self.shapes, dict):
             raise TypeError('recurse works only with dict self.shape, not %s' %
@@ -476,6 +1149,9 @@ class Curve(Shape):
         """
         `x`, `y`: arrays holding the coordinates of the curve.
         """
+        self._pack = None  # PackedCoordinates object (see Shape.pack)
+        self._matrix = self._xy = None  # lazy mode (set_lazy_transforms)
+        self._bbox = None  # cached bounding box (see Shape.bbox)
         self.x = asarray(x, dtype=float)
         self.y = asarray(y, dtype=float)
         #self.shapes must not be defined in this class
@@ -491,46 +1167,148 @@ class Curve(Shape):
         self.shadow = False
         self.name = None  # name of object that this Curve represents
 
+    # The coordinates are stored in self._x and self._y, or in
+    # a PackedCoordinates object if the curve is packed. In lazy
+    # mode, self._x and self._y are transformed by self._matrix
+    # when the coordinates are needed (the result is in self._xy).
+
+    def _get_x(self):
+        if self._pack is not None:
+            return self._pack.xy[self._start:self._stop,0]
+        if self._matrix is not None:
+            return self._transformed()[0]
+        return self._x
+
+    def _set_x(self, x):
+        self._set_coordinates(0, x)
+
+    x = property(_get_x, _set_x, doc='x coordinates of the curve.')
+
+    def _get_y(self):
+        if self._pack is not None:
+            return self._pack.xy[self._start:self._stop,1]
+        if self._matrix is not None:
+            return self._transformed()[1]
+        return self._y
+
+    def _set_y(self, y):
+        self._set_coordinates(1, y)
+
+    y = property(_get_y, _set_y, doc='y coordinates of the curve.')
+
+    def _set_coordinates(self, i, values):
+        values = asarray(values, dtype=float)
+        self._moved(None)
+        if self._pack is not None:
+            if values.shape == (self._stop - self._start,):
+                # Same number of points: update the packed array
+                self._pack.xy[self._start:self._stop,i] = values
+                self._pack.changed()
+                return
+            self._unpack()
+        if self._matrix is not None:
+            self._apply_matrix()
+        if i == 0:
+            self._x = values
+        else:
+            self._y = values
+
+    def _transformed(self):
+        """Return the (read-only) coordinates in lazy mode."""
+        if self._xy is None:
+            m = self._matrix
+            x = m[0,0]*self._x + m[0,1]*self._y + m[0,2]
+            y = m[1,0]*self._x + m[1,1]*self._y + m[1,2]
+            x.flags.writeable = False
+            y.flags.writeable = False
+            self._xy = (x, y)
+        return self._xy
+
+    def _apply_matrix(self):
+        """Let the pending transformation change self._x and self._y."""
+        x, y = self._transformed()
+        self._x, self._y = x.copy(), y.copy()
+        self._matrix = self._xy = None
+
+    def _transform(self, matrix):
+        bbox = self._cached_bbox()
+        if getattr(self, '_lazy', False):
+            if self._matrix is not None:
+                self._matrix = matrix.dot(self._matrix)
+            else:
+                self._matrix = matrix
+            self._xy = None
+        else:
+            # Both results before the assignments: x and y may be views
+            # of a packed array, which self.x = ... changes in place
+            x, y = self.x, self.y
+            xnew = matrix[0,0]*x + matrix[0,1]*y + matrix[0,2]
+            ynew = matrix[1,0]*x + matrix[1,1]*y + matrix[1,2]
+            self.x = xnew
+            self.y = ynew
+        self._moved(_transformed_bbox(bbox, matrix))
+
+    def set_lazy_transforms(self, lazy=True):
+        if lazy and self._pack is not None:
+            self._unpack()
+        if not lazy and self._matrix is not None:
+            self._apply_matrix()
+        self._lazy = lazy
+        return self
+
+    def _unpack(self):
+        """Give a packed curve its own coordinate arrays again."""
+        xy = self._pack.xy[self._start:self._stop]
+        self._x, self._y = xy[:,0].copy(), xy[:,1].copy()
+        self._pack.changed(valid=False)  # the array is no longer complete
+        self._pack = None
+
+    def _pack_leaves(self, curves, points, nodes):
+        curves.append(self)
+
+    def _style(self):
+        """Line style arguments to drawing_tool.plot_curve."""
+        return (self.linestyle, self.linewidth, self.linecolor,
+                self.arrow, self.fillcolor, self.fillpattern, self.shadow)
+
+    def _restyle(self):
+        if self._pack is not None:
+            self._pack.set_style(self._index, self._style())
+
+    def bbox(self):
+        box = self._cached_bbox()
+        if box is None:
+            x, y = self.x, self.y
+            box = (x.min(), x.max(), y.min(), y.max())
+            self._set_bbox(box)
+        return box
+
     def inside_plot_area(self, verbose=True):
         """Check that all coordinates are within drawing_tool's area."""
-        xmin, xmax = self.x.min(), self.x.max()
-        ymin, ymax = self.y.min(), self.y.max()
-        t = drawing_tool
-        inside = True
-        if not hasattr(t, 'xmin'):
-            return None  # drawing area is not defined
-
-        if xmin < t.xmin:
-            inside = False
-            if verbose:
-                print('x_min=%g < plot area x_min=%g' % (xmin, t.xmin))
-        if xmax > t.xmax:
-            inside = False
-            if verbose:
-                print('x_max=%g > plot area x_max=%g' % (xmax, t.xmax))
-        if ymin < t.ymin:
-            inside = False
-            if verbose:
-                print('y_min=%g < plot area y_min=%g' % (ymin, t.ymin))
-        if ymax > t.ymax:
-            inside = False
-            if verbose:
-                print('y_max=%g > plot area y_max=%g' % (ymax, t.ymax))
-        return inside
+        return _inside_plot_area(*self.bbox(), verbose=verbose)
 
-    def draw(self, verbose=0):
+    def draw(self, verbose=0, tool=None):
         """
         Send the curve to the plotting engine. That is, convert
         coordinate information in self.x and self.y, together
         with optional settings of linestyles, etc., to
-        plotting commands for the chosen engine.
+        plotting commands for the chosen engine (`tool`, if given).
         """
+        if tool is not None:
+            with drawing_context(tool):
+                return self.draw(verbose)
+        profile = profiling.current_profile()
+        if profile is not None and profile.idle():
+            with profile.root(self, 'draw'):
+                return self.draw(verbose)
         self.inside_plot_area()
         drawing_tool.plot_curve(
             self.x, self.y,
             self.linestyle, self.linewidth, self.linecolor,
             self.arrow, self.fillcolor, self.fillpattern,
             self.shadow, self.name)
+        if profile is not None:
+            profile.points(self.x.size)
         if verbose:
             print('drawing Curve object with %d points' % len(self.x))
 
@@ -539,6 +1317,9 @@ class Curve(Shape):
         Rotate all coordinates: `angle` is measured in degrees and
         (`x`,`y`) is the "origin" of the rotation.
         """
+        if getattr(self, '_lazy', False):
+            self._transform(_rotation_matrix(angle, center))
+            return self
         angle = radians(angle)
         x, y = center
         c = cos(angle);  s = sin(angle)
@@ -550,31 +1331,36 @@ class Curve(Shape):
 
     def scale(self, factor):
         """Scale all coordinates by `factor`: ``x = factor*x``, etc."""
+        if getattr(self, '_lazy', False):
+            self._transform(_scaling_matrix(factor))
+            return self
+        bbox = self._cached_bbox()
         self.x = factor*self.x
         self.y = factor*self.y
+        self._set_bbox(_transformed_bbox(bbox, _scaling_matrix(factor)))
         return self
 
     def translate(self, vec):
         """Translate all coordinates by a vector `vec`."""
-        self.x += vec[0]
-        self.y += vec[1]
+        if getattr(self, '_lazy', False):
+            self._transform(_translation_matrix(vec))
+            return self
+        bbox = self._cached_bbox()
+        self.x = self.x + vec[0]  # (x may be shared with other objects)
+        self.y = self.y + vec[1]
+        self._set_bbox(_transformed_bbox(bbox, _translation_matrix(vec)))
         return self
 
-    def deform(self, displacement_function):
-        """Displace all coordinates according to displacement_function(x,y)."""
-        for i in range(len(self.x)):
-            self.x[i], self.y[i] = displacement_function(self.x[i], self.y[i])
+    def deform(self, displacement_function, vectorized=None):
+        """
+        Displace all coordinates according to displacement_function(x,y)
+        (see ``_displace`` for the meaning of `vectorized`).
+        """
+        x, y = _displace(displacement_function, self.x, self.y, vectorized)
+        self.x = x
+        self.y = y
         return self
 
-    def minmax_coordinates(self, minmax=None):
-        if minmax is None:
-            minmax = {'xmin': [], 'xmax': [], 'ymin': [], 'ymax': []}
-        minmax['xmin'] = min(self.x.min(), minmax['xmin'])
-        minmax['xmax'] = max(self.x.max(), minmax['xmax'])
-        minmax['ymin'] = min(self.y.min(), minmax['ymin'])
-        minmax['ymax'] = max(self.y.max(), minmax['ymax'])
-        return minmax
-
     def recurse(self, name, indent=0):
         space = ' '*indent
         print(space, 'reached "bottom" object %s' % \
@@ -585,27 +1371,33 @@ class Curve(Shape):
 
     def set_linecolor(self, color):
         self.linecolor = color
+        self._restyle()
         return self
 
     def set_linewidth(self, width):
         self.linewidth = width
+        self._restyle()
         return self
 
     def set_linestyle(self, style):
         self.linestyle = style
+        self._restyle()
         return self
 
     def set_arrow(self, style=None):
         self.arrow = style
+        self._restyle()
         return self
 
     def set_filled_curves(self, color='', pattern=''):
         self.fillcolor = color
         self.fillpattern = pattern
+        self._restyle()
         return self
 
     def set_shadow(self, pixel_displacement=3):
         self.shadow = pixel_displacement
+        self._restyle()
         return self
 
     def show_hierarchy(self, indent=0, format='std'):
@@ -636,6 +1428,116 @@ class Curve(Shape):
         return str(self)
 
 
+class PackedCoordinates(object):
+    """
+    The coordinates of all Curve objects in a shape tree stored in
+    one contiguous array, made by ``Shape.pack``.
+
+    ============ ====================================================
+    Attribute    Description
+    ============ ====================================================
+    xy           (N,2) array with the coordinates of all the curves
+                 (stored column by column)
+    offsets      curve no. i has coordinates xy[offsets[i]:offsets[i+1]]
+    styles       list of the distinct line styles of the curves
+    style_index  curve no. i has line style styles[style_index[i]]
+    valid        False when the tree has changed since it was packed
+    version      increased by every change of xy (or of the tree)
+    ============ ====================================================
+    """
+    def __init__(self, shape):
+        curves = []; points = []; nodes = []
+        shape._pack_leaves(curves, points, nodes)
+        objects = set(id(obj) for obj in curves + [n[0] for n in nodes])
+        if len(objects) < len(curves) + len(nodes):
+            raise ValueError(
+                '%s: some object occurs more than once in the tree and '
+                'the tree cannot be packed (use copy() to make the '
+                'objects distinct)' % shape.__class__.__name__)
+
+        self.offsets = zeros(len(curves)+1, dtype=int)
+        self.offsets[1:] = cumsum([curve.x.size for curve in curves])
+        # Column-major storage makes x and y of each curve contiguous
+        self.xy = zeros((self.offsets[-1], 2), order='F')
+        self.styles = []
+        self._style_numbers = {}
+        self.style_index = zeros(len(curves), dtype=int)
+        self.valid = True
+        self.version = 0
+
+        for i, curve in enumerate(curves):
+            start, stop = self.offsets[i], self.offsets[i+1]
+            self.xy[start:stop,0] = curve.x
+            self.xy[start:stop,1] = curve.y
+            if curve._pack is not None:
+                curve._pack.changed(valid=False)  # curve is moved here
+            curve._pack = self
+            curve._start, curve._stop, curve._index = start, stop, i
+            curve._x = curve._y = curve._matrix = curve._xy = None
+            curve._bbox = None
+            curve._lazy = False
+            self.set_style(i, curve._style())
+        for node, first, last, node_points in nodes:
+            if getattr(node, '_pack', None) is not None:
+                node._pack.changed(valid=False)
+            node._pack = self
+            node._lazy = False
+            node._pack_curves = (first, last)
+            node._pack_points = node_points
+            node._bbox = None
+
+    def changed(self, valid=True):
+        """
+        Mark that the coordinates in xy have changed, which makes all
+        bounding boxes computed from xy obsolete (see ``Shape.bbox``).
+        `valid` is False when the tree is no longer represented by xy.
+        """
+        self.version += 1
+        if not valid:
+            self.valid = False
+
+    def set_style(self, i, style):
+        """Set the line style (tuple) of curve no. `i`."""
+        number = self._style_numbers.get(style)
+        if number is None:
+            number = self._style_numbers[style] = len(self.styles)
+            self.styles.append(style)
+        self.style_index[i] = number
+
+    def draw(self, first, last, check=True):
+        """
+        Draw curve no. `first` up to (but not including) `last`, as
+        ``Curve.draw`` would do. Consecutive curves with the same line
+        style are sent to the drawing tool in one ``plot_curves`` call.
+        The check of each curve against the plotting area is skipped
+        if `check` is False.
+        """
+        if first == last:
+            return
+        start = self.offsets[first]
+        xy = self.xy[start:self.offsets[last]].copy()
+        offsets = self.offsets[first:last+1] - start
+
+        # Check each curve against the plotting area (Curve.inside_plot_area)
+        t = current_drawing_tool()
+        if check and hasattr(t, 'xmin'):
+            xmin = minimum.reduceat(xy[:,0], offsets[:-1])
+            xmax = maximum.reduceat(xy[:,0], offsets[:-1])
+            ymin = minimum.reduceat(xy[:,1], offsets[:-1])
+            ymax = maximum.reduceat(xy[:,1], offsets[:-1])
+            outside = (xmin < t.xmin) | (xmax > t.xmax) | \
+                      (ymin < t.ymin) | (ymax > t.ymax)
+            for i in flatnonzero(outside):
+                _inside_plot_area(xmin[i], xmax[i], ymin[i], ymax[i])
+
+        segments = split(xy, offsets[1:-1])
+        index = self.style_index[first:last]
+        runs = [0] + (flatnonzero(index[1:] != index[:-1]) + 1).tolist() + \
+               [len(index)]
+        for i, j in zip(runs[:-1], runs[1:]):
+            drawing_tool.plot_curves(segments[i:j], *self.styles[index[i]])
+
+
 class Spline(Shape):
     # Note: UnivariateSpline interpolation may not work if
     # the x[i] points are far from uniformly spaced
@@ -757,7 +1659,7 @@ class Point(Shape):
 
     # class Point is an abstract class - only subclasses are useful
     # and must implement draw
-    def draw(self, verbose=0):
+    def draw(self, verbose=0, tool=None):
         raise NotImplementedError(
             'class %s must implement the draw method' %
             self.__class__.__name__)
@@ -771,34 +1673,55 @@ class Point(Shape):
         ynew = y + (self.x - x)*s + (self.y - y)*c
         self.x = xnew
         self.y = ynew
+        self._moved(None)
         return self
 
     def scale(self, factor):
         """Scale point coordinates by `factor`: ``x = factor*x``, etc."""
         self.x = factor*self.x
         self.y = factor*self.y
+        self._moved(None)
         return self
 
     def translate(self, vec):
         """Translate point by a vector `vec`."""
         self.x += vec[0]
         self.y += vec[1]
+        self._moved(None)
         return self
 
-    def deform(self, displacement_function):
-        """Displace coordinates according to displacement_function(x,y)."""
-        for i in range(len(self.x)):
+    def deform(self, displacement_function, vectorized=None):
+        """
+        Displace coordinates according to displacement_function(x,y).
+        With `vectorized` true, the function is called with arrays of
+        length 1 (as for the points of a curve), else with the
+        coordinates of the point.
+        """
+        if vectorized:
+            x, y = _displace(displacement_function,
+                             array([self.x], dtype=float),
+                             array([self.y], dtype=float), vectorized)
+            self.x, self.y = float(x[0]), float(y[0])
+        else:
             self.x, self.y = displacement_function(self.x, self.y)
+        self._moved(None)
         return self
 
-    def minmax_coordinates(self, minmax=None):
-        if minmax is None:
-            minmax = {'xmin': [], 'xmax': [], 'ymin': [], 'ymax': []}
-        minmax['xmin'] = min(self.x, minmax['xmin'])
-        minmax['xmax'] = max(self.x, minmax['xmax'])
-        minmax['ymin'] = min(self.y, minmax['ymin'])
-        minmax['ymax'] = max(self.y, minmax['ymax'])
-        return minmax
+    def _pack_leaves(self, curves, points, nodes):
+        points.append(self)
+
+    def _transform(self, matrix):
+        x, y = self.x, self.y
+        self.x = matrix[0,0]*x + matrix[0,1]*y + matrix[0,2]
+        self.y = matrix[1,0]*x + matrix[1,1]*y + matrix[1,2]
+        self._moved(None)
+
+    def set_lazy_transforms(self, lazy=True):
+        return self  # a point is always transformed right away
+
+    def bbox(self):
+        # Not cached (x and y are ordinary attributes)
+        return (self.x, self.x, self.y, self.y)
 
     def recurse(self, name, indent=0):
         space = ' '*indent
@@ -1023,10 +1946,19 @@ class Circle(Shape):
 
 
 class Arc(Shape):
+    """
+    Arc of a circle. `resolution` is the number of line segments, by
+    default 180, or just enough to keep the curve within
+    drawing_tool.chord_tolerance pixels from the exact arc if this
+    tolerance is set.
+    """
     def __init__(self, center, radius,
                  start_angle, arc_angle,
-                 resolution=180):
+                 resolution=None):
         is_sequence(center)
+        if resolution is None:
+            resolution = _adaptive_resolution(
+                abs(radians(arc_angle)*radius), 1./abs(radius), 180)
 
         # Must record some parameters for __call__
         self.center = arr2D(center)
@@ -1092,10 +2024,10 @@ class Parabola(Shape):
             self.x_of_y = False
 
         if self.y_of_x:
-            x = linspace(start[0], end[0], resolution)
+            x = linspace(start[0], stop[0], resolution)
             y = self(x=x)
         elif self.x_of_y:
-            y = linspace(start[1], end[1], resolution)
+            y = linspace(start[1], stop[1], resolution)
             x = self(y=y)
         else:
             raise ValueError(
@@ -1105,13 +2037,13 @@ class Parabola(Shape):
 
     def __call__(self, x=None, y=None):
         if x is not None and self.y_of_x:
-            return self._L2x(self.p1, self.p2)*self.p3[1] + \
-                   self._L2x(self.p2, self.p3)*self.p1[1] + \
-                   self._L2x(self.p3, self.p1)*self.p2[1]
+            return self._L2x(x, self.p1, self.p2, self.p3)*self.p3[1] + \
+                   self._L2x(x, self.p2, self.p3, self.p1)*self.p1[1] + \
+                   self._L2x(x, self.p3, self.p1, self.p2)*self.p2[1]
         elif y is not None and self.x_of_y:
-            return self._L2y(self.p1, self.p2)*self.p3[0] + \
-                   self._L2y(self.p2, self.p3)*self.p1[0] + \
-                   self._L2y(self.p3, self.p1)*self.p2[0]
+            return self._L2y(y, self.p1, self.p2, self.p3)*self.p3[0] + \
+                   self._L2y(y, self.p2, self.p3, self.p1)*self.p1[0] + \
+                   self._L2y(y, self.p3, self.p1, self.p2)*self.p2[0]
         else:
             raise ValueError(
                 'Parabola.__call__(x=%s, y=%s) not meaningful' % \
@@ -1125,7 +2057,7 @@ class Parabola(Shape):
 
 
 class Circle(Arc):
-    def __init__(self, center, radius, resolution=180):
+    def __init__(self, center, radius, resolution=None):
         Arc.__init__(self, center, radius, 0, 360, resolution)
 
 
@@ -1148,7 +2080,6 @@ class Wall(Shape):
         x2 = x1
         y2 = y1 + thickness
         # Combine x1,y1 with x2,y2 reversed
-        from numpy import concatenate
         x = concatenate((x1, x2[-1::-1]))
         y = concatenate((y1, y2[-1::-1]))
         wall = Curve(x, y)
@@ -1200,22 +2131,21 @@ class Wall2(Shape):
             x2[idx], y2[idx] = displaced_pt
 
         for i in range(1, len(x1)-1):
-            displace(i-1, i+1, i)  # centered difference for normal comp.
+            displace(i, i+1, i-1)  # centered difference for normal comp.
         # One-sided differences at the end points
         i = 0
         displace(i, i+1, i)
         i = len(x1)-1
-        displace(i-1, i, i)
+        displace(i, i, i-1)
 
         # Combine x1,y1 with x2,y2 reversed
-        from numpy import concatenate
         x = concatenate((x1, x2[-1::-1]))
         y = concatenate((y1, y2[-1::-1]))
         wall = Curve(x, y)
         wall.set_filled_curves(color='white', pattern=pattern)
         x = [x1[-1]] + x2[-1::-1].tolist() + [x1[0]]
         y = [y1[-1]] + y2[-1::-1].tolist() + [y1[0]]
-        self.shapes['wall'] = wall
+        self.shapes = {'wall': wall}
 
     def geometric_features(self):
         d = {'start': point(self.x1[0], self.y1[0]),
@@ -1334,7 +2264,10 @@ class Text(Point):
         Point.__init__(self, position[0], position[1])
         #no need for self.shapes here
 
-    def draw(self, verbose=0):
+    def draw(self, verbose=0, tool=None):
+        if tool is not None:
+            with drawing_context(tool):
+                return self.draw(verbose)
         drawing_tool.text(
             self.text, (self.x, self.y),
             self.alignment, self.fontsize,
@@ -1362,7 +2295,10 @@ class Text_wArrow(Text):
         self.arrow_tip = arrow_tip
         Text.__init__(self, text, position, alignment, fontsize)
 
-    def draw(self, verbose=0):
+    def draw(self, verbose=0, tool=None):
+        if tool is not None:
+            with drawing_context(tool):
+                return self.draw(verbose)
         drawing_tool.text(
             self.text, self.position,
             self.alignment, self.fontsize,
@@ -1480,7 +2416,8 @@ class Axis2(Force):
                  label_spacing=1./45, label_alignment='left'):
         direction = point(cos(radians(rotation_angle)),
                           sin(radians(rotation_angle)))
-        Force.__init__(start=start, end=length*direction, text=label,
+        Force.__init__(self, start=start, end=start + length*direction,
+                       text=label,
                        text_spacing=label_spacing,
                        fontsize=fontsize, text_pos='end',
                        text_alignment=label_alignment)
@@ -1488,7 +2425,10 @@ class Axis2(Force):
         self.shapes['label'] = self.shapes['text']
         del self.shapes['text']
 
-    # geometric features from Force is ok
+    def geometric_features(self):
+        d = Arrow1.geometric_features(self)
+        d['symbol_location'] = self.shapes['label'].position
+        return d
 
 class Gravity(Axis):
     """Downward-pointing gravity arrow with the symbol g."""
@@ -1565,7 +2505,7 @@ class Distance_wText(Shape):
 class Arc_wText(Shape):
     def __init__(self, text, center, radius,
                  start_angle, arc_angle, fontsize=0,
-                 resolution=180, text_spacing=1/60.):
+                 resolution=None, text_spacing=1/60.):
         arc = Arc(center, radius, start_angle, arc_angle,
                   resolution)
         mid = arr2D(arc(arc_angle/2.))
@@ -1657,8 +2597,7 @@ class Moment(Arc_wText):
         Arc_wText.__init__(self, text, center, radius,
                            start_angle=start_angle,
                            arc_angle=180, fontsize=fontsize,
-                           text_spacing=text_spacing,
-                           resolution=180)
+                           text_spacing=text_spacing)
         self.shapes['arc']['arc'].set_arrow(style)  # Curve object
 
 
@@ -1672,7 +2611,7 @@ class Wheel(Shape):
         lines = []
         # Draw nlines+1 since the first and last coincide
         # (then nlines lines will be visible)
-        t = linspace(0, 2*pi, self.nlines+1)
+        t = linspace(0, 2*pi, nlines+1)
 
         Ri = inner_radius;  Ro = radius
         x0 = center[0];  y0 = center[1]
@@ -1696,7 +2635,7 @@ class SineWave(Shape):
         self.amplitude = amplitude
         self.mean_level = mean_level
 
-        npoints = (self.xstop - self.xstart)/(self.wavelength/61.0)
+        npoints = int((self.xstop - self.xstart)/(self.wavelength/61.0))
         x = linspace(self.xstart, self.xstop, npoints)
         k = 2*pi/self.wavelength # frequency
         y = self.mean_level + self.amplitude*sin(k*x)
@@ -1767,7 +2706,9 @@ class Spring(Shape):
         if teeth:
             resolution = 4
         else:
-            resolution = 90
+            # x = w*sin(2*pi*y/t) has max curvature w*(2*pi/t)**2
+            resolution = _adaptive_resolution(
+                sqrt(t**2 + (4*w)**2), w*(2*pi/t)**2, 90, minimum=8)
         q = linspace(0, n, n*resolution + 1)
         x = P0[0] + w*sin(2*pi*q)
         y = P0[1] + q*t
@@ -1982,7 +2923,13 @@ class Wavy(Shape):
         A_p = 0.3*A_0
         A_k = k_0/2
 
-        x = linspace(xmin, xmax, 2001)
+        # Resolution from the curvature of the perturbations
+        # (main_curve is assumed to be smooth in comparison)
+        A_max, k_max = A_0 + A_p, k_0 + k_p
+        n = _adaptive_resolution(
+            (xmax - xmin)*sqrt(1 + (A_max*k_max)**2), A_max*k_max**2, 2000,
+            minimum=int(ceil(8*(xmax - xmin)*k_max/(2*pi))))
+        x = linspace(xmin, xmax, n+1)
 
         def w(x):
             A = A_0 + A_p*sin(A_k*x)
@@ -1995,6 +2942,22 @@ class Wavy(Shape):
         # to store all the parameters A_0, A_k, etc. as attributes
         self.__call__ = w
 
+_road_profiles_array = None
+
+def _road_profiles():
+    """
+    Return the coordinates of the curves in StochasticWavyCurve as a
+    read-only (4,n) array: x and y of curve 0, 1 and 2. The array is
+    memory-mapped from road_profiles.npy the first time it is needed.
+    """
+    global _road_profiles_array
+    if _road_profiles_array is None:
+        from numpy import load
+        _road_profiles_array = load(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'road_profiles.npy'), mmap_mode='r')
+    return _road_profiles_array
+
 class StochasticWavyCurve(object):
     """
     Precomputed stochastic wavy graphs.
@@ -2505,8 +3468,9 @@ See also hplgit.github.io/pysketcher/doc/src/tut/fig-tut/StochasticWavyCurve.png
 
     """
     # The curves were generated by the script generate_road_profiles.py and
-    # the code below were generated by plot_roads.py. Both scripts are
-    # found doc/src/src-bumpy in the repo git@github.com:hplgit/bumpy.git
+    # stored by plot_roads.py. Both scripts are found doc/src/src-bumpy
+    # in the repo git@github.com:hplgit/bumpy.git. The coordinates are
+    # now stored in road_profiles.npy (see _road_profiles).
 
     def __init__(self, curve_no=0, percentage=100):
         """
@@ -2517,22 +3481,19 @@ See also hplgit.github.io/pysketcher/doc/src/tut/fig-tut/StochasticWavyCurve.png
         percentage     The percentage of the defined curve to be used.
         =============  ===================================================
         """
-        self._define_curves()
+        profiles = _road_profiles()
+        self.x = profiles[0]
+        self.y = profiles[1:]
         self.curve_no = curve_no
-        m = int(len(self.x)/float(percentage)*100)
+        m = int(round(len(self.x)*percentage/100.))
 
+        # The curve shares the (read-only) coordinate arrays until
+        # it is transformed
         self.shapes = {'wavy': Curve(self.x[:m], self.y[curve_no][:m])}
 
     def __call__(self, x):
         raise NotImplementedError
 
-    def _define_curves(self):
-        self.x = array([0.0000, 0.0606, 0.1212, 0.1818, 0.2424, 0.3030, 0.3636, 0.4242, 0.4848, 0.5455, 0.6061, 0.6667, 0.7273, 0.7879, 0.8485, 0.9091, 0.9697, 1.0303, 1.0909, 1.1515, 1.2121, 1.2727, 1.3333, 1.3939, 1.4545, 1.5152, 1.5758, 1.6364, 1.6970, 1.7576, 1.8182, 1.8788, 1.9394, 2.0000, 2.0606, 2.1212, 2.1818, 2.2424, 2.3030, 2.3636, 2.4242, 2.4848, 2.5455, 2.6061, 2.6667, 2.7273, 2.7879, 2.8485, 2.9091, 2.9697, 3.0303, 3.0909, 3.1515, 3.2121, 3.2727, 3.3333, 3.3939, 3.4545, 3.5152, 3.5758, 3.6364, 3.6970, 3.7576, 3.8182, 3.8788, 3.9394, 4.0000, 4.0606, 4.1212, 4.1818, 4.2424, 4.3030, 4.3636, 4.4242, 4.4848, 4.5455, 4.6061, 4.6667, 4.7273, 4.7879, 4.8485, 4.9091, 4.9697, 5.0303, 5.0909, 5.1515, 5.2121, 5.2727, 5.3333, 5.3939, 5.4545, 5.5152, 5.5758, 5.6364, 5.6970, 5.7576, 5.8182, 5.8788, 5.9394, 6.0000, 6.0606, 6.1212, 6.1818, 6.2424, 6.3030, 6.3636, 6.4242, 6.4848, 6.5455, 6.6061, 6.6667, 6.7273, 6.7879, 6.8485, 6.9091, 6.9697, 7.0303, 7.0909, 7.1515, 7.2121, 7.2727, 7.3333, 7.3939, 7.4545, 7.5152, 7.5758, 7.6364, 7.6970, 7.7576, 7.8182, 7.8788, 7.9394, 8.0000, 8.0606, 8.1212, 8.1818, 8.2424, 8.3030, 8.3636, 8.4242, 8.4848, 8.5455, 8.6061, 8.6667, 8.7273, 8.7879, 8.8485, 8.9091, 8.9697, 9.0303, 9.0909, 9.1515, 9.2121, 9.2727, 9.3333, 9.3939, 9.4545, 9.5152, 9.5758, 9.6364, 9.6970, 9.7576, 9.8182, 9.8788, 9.9394, 10.0000, 10.0606, 10.1212, 10.1818, 10.2424, 10.3030, 10.3636, 10.4242, 10.4848, 10.5455, 10.6061, 10.6667, 10.7273, 10.7879, 10.8485, 10.9091, 10.9697, 11.0303, 11.0909, 11.1515, 11.2121, 11.2727, 11.3333, 11.3939, 11.4545, 11.5152, 11.5758, 11.6364, 11.6970, 11.7576, 11.8182, 11.8788, 11.9394, 12.0000, 12.0606, 12.1212, 12.1818, 12.2424, 12.3030, 12.3636, 12.4242, 12.4848, 12.5455, 12.6061, 12.6667, 12.7273, 12.7879, 12.8485, 12.9091, 12.9697, 13.0303, 13.0909, 13.1515, 13.2121, 13.2727, 13.3333, 13.3939, 13.4545, 13.5152, 13.5758, 13.6364, 13.6970, 13.7576, 13.8182, 13.8788, 13.9394, 14.0000, 14.0606, 14.1212, 14.1818, 14.2424, 14.3030, 14.3636, 14.4242, 14.4848, 14.5455, 14.6061, 14.6667, 14.7273, 14.7879, 14.8485, 14.9091, 14.9697, 15.0303, 15.0909, 15.1515, 15.2121, 15.2727, 15.3333, 15.3939, 15.4545, 15.5152, 15.5758, 15.6364, 15.6970, 15.7576, 15.8182, 15.8788, 15.9394, 16.0000, 16.0606, 16.1212, 16.1818, 16.2424, 16.3030, 16.3636, 16.4242, 16.4848, 16.5455, 16.6061, 16.6667, 16.7273, 16.7879, 16.8485, 16.9091, 16.9697, 17.0303, 17.0909, 17.1515, 17.2121, 17.2727, 17.3333, 17.3939, 17.4545, 17.5152, 17.5758, 17.6364, 17.6970, 17.7576, 17.8182, 17.8788, 17.9394, 18.0000, 18.0606, 18.1212, 18.1818, 18.2424, 18.3030, 18.3636, 18.4242, 18.4848, 18.5455, 18.6061, 18.6667, 18.7273, 18.7879, 18.8485, 18.9091, 18.9697, 19.0303, 19.0909, 19.1515, 19.2121, 19.2727, 19.3333, 19.3939, 19.4545, 19.5152, 19.5758, 19.6364, 19.6970, 19.7576, 19.8182, 19.8788, 19.9394, 20.0000, 20.0606, 20.1212, 20.1818, 20.2424, 20.3030, 20.3636, 20.4242, 20.4848, 20.5455, 20.6061, 20.6667, 20.7273, 20.7879, 20.8485, 20.9091, 20.9697, 21.0303, 21.0909, 21.1515, 21.2121, 21.2727, 21.3333, 21.3939, 21.4545, 21.5152, 21.5758, 21.6364, 21.6970, 21.7576, 21.8182, 21.8788, 21.9394, 22.0000, 22.0606, 22.1212, 22.1818, 22.2424, 22.3030, 22.3636, 22.4242, 22.4848, 22.5455, 22.6061, 22.6667, 22.7273, 22.7879, 22.8485, 22.9091, 22.9697, 23.0303, 23.0909, 23.1515, 23.2121, 23.2727, 23.3333, 23.3939, 23.4545, 23.5152, 23.5758, 23.6364, 23.6970, 23.7576, 23.8182, 23.8788, 23.9394, 24.0000, 24.0606, 24.1212, 24.1818, 24.2424, 24.3030, 24.3636, 24.4242, 24.4848, 24.5455, 24.6061, 24.6667, 24.7273, 24.7879, 24.8485, 24.9091, 24.9697, 25.0303, 25.0909, 25.1515, 25.2121, 25.2727, 25.3333, 25.3939, 25.4545, 25.5152, 25.5758, 25.6364, 25.6970, 25.7576, 25.8182, 25.8788, 25.9394, 26.0000, 26.0606, 26.1212, 26.1818, 26.2424, 26.3030, 26.3636, 26.4242, 26.4848, 26.5455, 26.6061, 26.6667, 26.7273, 26.7879, 26.8485, 26.9091, 26.9697, 27.0303, 27.0909, 27.1515, 27.2121, 27.2727, 27.3333, 27.3939, 27.4545, 27.5152, 27.5758, 27.6364, 27.6970, 27.7576, 27.8182, 27.8788, 27.9394, 28.0000, 28.0606, 28.1212, 28.1818, 28.2424, 28.3030, 28.3636, 28.4242, 28.4848, 28.5455, 28.6061, 28.6667, 28.7273, 28.7879, 28.8485, 28.9091, 28.9697, 29.0303, 29.0909, 29.1515, 29.2121, 29.2727, 29.3333, 29.3939, 29.4545, 29.5152, 29.5758, 29.6364, 29.6970, 29.7576, 29.8182, 29.8788, 29.9394, 30.0000, 30.0606, 30.1212, 30.1818, 30.2424, 30.3030, 30.3636, 30.4242, 30.4848, 30.5455, 30.6061, 30.6667, 30.7273, 30.7879, 30.8485, 30.9091, 30.9697, 31.0303, 31.0909, 31.1515, 31.2121, 31.2727, 31.3333, 31.3939, 31.4545, 31.5152, 31.5758, 31.6364, 31.6970, 31.7576, 31.8182, 31.8788, 31.9394, 32.0000, 32.0606, 32.1212, 32.1818, 32.2424, 32.3030, 32.3636, 32.4242, 32.4848, 32.5455, 32.6061, 32.6667, 32.7273, 32.7879, 32.8485, 32.9091, 32.9697, 33.0303, 33.0909, 33.1515, 33.2121, 33.2727, 33.3333, 33.3939, 33.4545, 33.5152, 33.5758, 33.6364, 33.6970, 33.7576, 33.8182, 33.8788, 33.9394, 34.0000, 34.0606, 34.1212, 34.1818, 34.2424, 34.3030, 34.3636, 34.4242, 34.4848, 34.5455, 34.6061, 34.6667, 34.7273, 34.7879, 34.8485, 34.9091, 34.9697, 35.0303, 35.0909, 35.1515, 35.2121, 35.2727, 35.3333, 35.3939, 35.4545, 35.5152, 35.5758, 35.6364, 35.6970, 35.7576, 35.8182, 35.8788, 35.9394, 36.0000, 36.0606, 36.1212, 36.1818, 36.2424, 36.3030, 36.3636, 36.4242, 36.4848, 36.5455, 36.6061, 36.6667, 36.7273, 36.7879, 36.8485, 36.9091, 36.9697, 37.0303, 37.0909, 37.1515, 37.2121, 37.2727, 37.3333, 37.3939, 37.4545, 37.5152, 37.5758, 37.6364, 37.6970, 37.7576, 37.8182, 37.8788, 37.9394, 38.0000, 38.0606, 38.1212, 38.1818, 38.2424, 38.3030, 38.3636, 38.4242, 38.4848, 38.5455, 38.6061, 38.6667, 38.7273, 38.7879, 38.8485, 38.9091, 38.9697, 39.0303, 39.0909, 39.1515, 39.2121, 39.2727, 39.3333, 39.3939, 39.4545, 39.5152, 39.5758, 39.6364, 39.6970, 39.7576, 39.8182, 39.8788, 39.9394, 40.0000, 40.0606, 40.1212, 40.1818, 40.2424, 40.3030, 40.3636, 40.4242, 40.4848, 40.5455, 40.6061, 40.6667, 40.7273, 40.7879, 40.8485, 40.9091, 40.9697, 41.0303, 41.0909, 41.1515, 41.2121, 41.2727, 41.3333, 41.3939, 41.4545, 41.5152, 41.5758, 41.6364, 41.6970, 41.7576, 41.8182, 41.8788, 41.9394, 42.0000, 42.0606, 42.1212, 42.1818, 42.2424, 42.3030, 42.3636, 42.4242, 42.4848, 42.5455, 42.6061, 42.6667, 42.7273, 42.7879, 42.8485, 42.9091, 42.9697, 43.0303, 43.0909, 43.1515, 43.2121, 43.2727, 43.3333, 43.3939, 43.4545, 43.5152, 43.5758, 43.6364, 43.6970, 43.7576, 43.8182, 43.8788, 43.9394, 44.0000, 44.0606, 44.1212, 44.1818, 44.2424, 44.3030, 44.3636, 44.4242, 44.4848, 44.5455, 44.6061, 44.6667, 44.7273, 44.7879, 44.8485, 44.9091, 44.9697, 45.0303, 45.0909, 45.1515, 45.2121, 45.2727, 45.3333, 45.3939, 45.4545, 45.5152, 45.5758, 45.6364, 45.6970, 45.7576, 45.8182, 45.8788, 45.9394, 46.0000, 46.0606, 46.1212, 46.1818, 46.2424, 46.3030, 46.3636, 46.4242, 46.4848, 46.5455, 46.6061, 46.6667, 46.7273, 46.7879, 46.8485, 46.9091, 46.9697, 47.0303, 47.0909, 47.1515, 47.2121, 47.2727, 47.3333, 47.3939, 47.4545, 47.5152, 47.5758, 47.6364, 47.6970, 47.7576, 47.8182, 47.8788, 47.9394, 48.0000, 48.0606, 48.1212, 48.1818, 48.2424, 48.3030, 48.3636, 48.4242, 48.4848, 48.5455, 48.6061, 48.6667, 48.7273, 48.7879, 48.8485, 48.9091, 48.9697, 49.0303, 49.0909, 49.1515, 49.2121, 49.2727, 49.3333, 49.3939, 49.4545, 49.5152, 49.5758, 49.6364, 49.6970, 49.7576, 49.8182, 49.8788, 49.9394, ])
-        self.y = [None]*3
-        self.y[0] = array([0.0000, 0.0005, 0.0006, 0.0004, -0.0004, -0.0007, -0.0022, -0.0027, -0.0036, -0.0042, -0.0050, -0.0049, -0.0060, -0.0072, -0.0085, -0.0092, -0.0104, -0.0116, -0.0133, -0.0148, -0.0160, -0.0177, -0.0186, -0.0191, -0.0192, -0.0187, -0.0187, -0.0187, -0.0192, -0.0198, -0.0201, -0.0208, -0.0216, -0.0227, -0.0242, -0.0260, -0.0277, -0.0299, -0.0319, -0.0328, -0.0333, -0.0338, -0.0347, -0.0360, -0.0363, -0.0365, -0.0370, -0.0373, -0.0364, -0.0355, -0.0343, -0.0329, -0.0317, -0.0312, -0.0309, -0.0306, -0.0301, -0.0290, -0.0275, -0.0259, -0.0238, -0.0222, -0.0200, -0.0176, -0.0154, -0.0130, -0.0108, -0.0081, -0.0046, -0.0001, 0.0035, 0.0061, 0.0083, 0.0105, 0.0130, 0.0156, 0.0170, 0.0181, 0.0196, 0.0212, 0.0231, 0.0247, 0.0262, 0.0277, 0.0293, 0.0309, 0.0325, 0.0336, 0.0348, 0.0360, 0.0378, 0.0401, 0.0423, 0.0443, 0.0457, 0.0473, 0.0488, 0.0500, 0.0511, 0.0518, 0.0528, 0.0534, 0.0547, 0.0561, 0.0577, 0.0585, 0.0594, 0.0606, 0.0611, 0.0614, 0.0617, 0.0612, 0.0607, 0.0608, 0.0603, 0.0599, 0.0588, 0.0577, 0.0557, 0.0543, 0.0532, 0.0520, 0.0505, 0.0496, 0.0499, 0.0490, 0.0489, 0.0496, 0.0504, 0.0504, 0.0509, 0.0512, 0.0512, 0.0504, 0.0499, 0.0498, 0.0493, 0.0491, 0.0483, 0.0478, 0.0474, 0.0468, 0.0462, 0.0460, 0.0462, 0.0467, 0.0472, 0.0476, 0.0483, 0.0491, 0.0502, 0.0510, 0.0504, 0.0503, 0.0514, 0.0527, 0.0538, 0.0547, 0.0554, 0.0561, 0.0561, 0.0558, 0.0548, 0.0540, 0.0531, 0.0524, 0.0516, 0.0513, 0.0511, 0.0520, 0.0519, 0.0513, 0.0512, 0.0525, 0.0535, 0.0545, 0.0552, 0.0566, 0.0577, 0.0591, 0.0602, 0.0605, 0.0609, 0.0615, 0.0627, 0.0638, 0.0644, 0.0652, 0.0661, 0.0670, 0.0678, 0.0692, 0.0706, 0.0729, 0.0757, 0.0786, 0.0805, 0.0825, 0.0846, 0.0870, 0.0897, 0.0921, 0.0947, 0.0968, 0.0997, 0.1018, 0.1027, 0.1025, 0.1018, 0.1004, 0.1000, 0.0994, 0.0980, 0.0972, 0.0960, 0.0941, 0.0927, 0.0916, 0.0902, 0.0896, 0.0890, 0.0892, 0.0896, 0.0908, 0.0919, 0.0922, 0.0937, 0.0948, 0.0957, 0.0960, 0.0961, 0.0963, 0.0965, 0.0970, 0.0983, 0.0994, 0.0997, 0.0993, 0.0984, 0.0965, 0.0951, 0.0934, 0.0916, 0.0897, 0.0870, 0.0840, 0.0813, 0.0791, 0.0766, 0.0751, 0.0730, 0.0707, 0.0683, 0.0644, 0.0616, 0.0592, 0.0562, 0.0545, 0.0531, 0.0519, 0.0504, 0.0490, 0.0468, 0.0451, 0.0432, 0.0414, 0.0403, 0.0394, 0.0386, 0.0380, 0.0370, 0.0364, 0.0367, 0.0374, 0.0385, 0.0390, 0.0390, 0.0381, 0.0380, 0.0377, 0.0381, 0.0380, 0.0377, 0.0374, 0.0376, 0.0378, 0.0380, 0.0382, 0.0385, 0.0381, 0.0377, 0.0373, 0.0367, 0.0365, 0.0358, 0.0351, 0.0342, 0.0336, 0.0334, 0.0326, 0.0322, 0.0329, 0.0327, 0.0321, 0.0310, 0.0297, 0.0293, 0.0290, 0.0283, 0.0279, 0.0272, 0.0271, 0.0271, 0.0279, 0.0282, 0.0302, 0.0325, 0.0351, 0.0375, 0.0393, 0.0406, 0.0416, 0.0422, 0.0428, 0.0430, 0.0434, 0.0443, 0.0447, 0.0457, 0.0465, 0.0479, 0.0494, 0.0514, 0.0527, 0.0539, 0.0557, 0.0571, 0.0572, 0.0563, 0.0539, 0.0504, 0.0469, 0.0441, 0.0412, 0.0385, 0.0359, 0.0334, 0.0308, 0.0282, 0.0260, 0.0232, 0.0211, 0.0196, 0.0180, 0.0169, 0.0154, 0.0137, 0.0121, 0.0105, 0.0088, 0.0067, 0.0044, 0.0027, -0.0000, -0.0024, -0.0048, -0.0066, -0.0082, -0.0111, -0.0136, -0.0158, -0.0179, -0.0201, -0.0218, -0.0235, -0.0242, -0.0245, -0.0236, -0.0231, -0.0237, -0.0237, -0.0233, -0.0229, -0.0233, -0.0239, -0.0241, -0.0244, -0.0247, -0.0251, -0.0259, -0.0270, -0.0288, -0.0295, -0.0305, -0.0311, -0.0322, -0.0327, -0.0343, -0.0352, -0.0361, -0.0358, -0.0362, -0.0365, -0.0365, -0.0358, -0.0353, -0.0348, -0.0355, -0.0365, -0.0373, -0.0373, -0.0375, -0.0365, -0.0345, -0.0327, -0.0322, -0.0327, -0.0335, -0.0337, -0.0337, -0.0348, -0.0359, -0.0361, -0.0364, -0.0371, -0.0366, -0.0361, -0.0358, -0.0353, -0.0348, -0.0345, -0.0335, -0.0320, -0.0300, -0.0281, -0.0257, -0.0233, -0.0208, -0.0179, -0.0146, -0.0104, -0.0062, -0.0031, -0.0007, 0.0023, 0.0049, 0.0077, 0.0099, 0.0125, 0.0147, 0.0177, 0.0202, 0.0232, 0.0264, 0.0291, 0.0322, 0.0346, 0.0365, 0.0386, 0.0403, 0.0415, 0.0425, 0.0428, 0.0436, 0.0447, 0.0457, 0.0465, 0.0475, 0.0494, 0.0516, 0.0534, 0.0555, 0.0574, 0.0591, 0.0616, 0.0638, 0.0655, 0.0660, 0.0657, 0.0656, 0.0650, 0.0647, 0.0637, 0.0623, 0.0613, 0.0611, 0.0611, 0.0618, 0.0633, 0.0652, 0.0665, 0.0677, 0.0690, 0.0700, 0.0712, 0.0713, 0.0710, 0.0709, 0.0695, 0.0675, 0.0655, 0.0626, 0.0598, 0.0566, 0.0533, 0.0501, 0.0470, 0.0437, 0.0405, 0.0372, 0.0342, 0.0323, 0.0305, 0.0289, 0.0267, 0.0250, 0.0229, 0.0204, 0.0183, 0.0164, 0.0152, 0.0148, 0.0141, 0.0135, 0.0139, 0.0148, 0.0160, 0.0179, 0.0193, 0.0210, 0.0234, 0.0266, 0.0291, 0.0314, 0.0337, 0.0358, 0.0375, 0.0395, 0.0412, 0.0417, 0.0424, 0.0428, 0.0428, 0.0418, 0.0415, 0.0398, 0.0373, 0.0347, 0.0328, 0.0318, 0.0301, 0.0284, 0.0258, 0.0240, 0.0214, 0.0188, 0.0168, 0.0148, 0.0137, 0.0122, 0.0109, 0.0101, 0.0093, 0.0093, 0.0096, 0.0089, 0.0104, 0.0123, 0.0141, 0.0150, 0.0159, 0.0165, 0.0174, 0.0185, 0.0205, 0.0225, 0.0247, 0.0269, 0.0290, 0.0308, 0.0331, 0.0357, 0.0379, 0.0392, 0.0405, 0.0423, 0.0440, 0.0465, 0.0484, 0.0503, 0.0506, 0.0506, 0.0504, 0.0504, 0.0513, 0.0521, 0.0537, 0.0555, 0.0577, 0.0595, 0.0619, 0.0636, 0.0654, 0.0666, 0.0674, 0.0672, 0.0667, 0.0664, 0.0660, 0.0648, 0.0645, 0.0642, 0.0645, 0.0651, 0.0653, 0.0643, 0.0629, 0.0621, 0.0607, 0.0597, 0.0585, 0.0574, 0.0553, 0.0539, 0.0525, 0.0516, 0.0508, 0.0505, 0.0500, 0.0500, 0.0490, 0.0475, 0.0464, 0.0452, 0.0440, 0.0427, 0.0416, 0.0403, 0.0393, 0.0377, 0.0360, 0.0349, 0.0343, 0.0332, 0.0325, 0.0313, 0.0305, 0.0287, 0.0263, 0.0237, 0.0211, 0.0194, 0.0182, 0.0180, 0.0184, 0.0186, 0.0186, 0.0192, 0.0198, 0.0203, 0.0200, 0.0196, 0.0177, 0.0156, 0.0130, 0.0110, 0.0087, 0.0064, 0.0049, 0.0029, 0.0011, -0.0016, -0.0042, -0.0064, -0.0080, -0.0100, -0.0118, -0.0133, -0.0147, -0.0160, -0.0170, -0.0176, -0.0188, -0.0206, -0.0209, -0.0201, -0.0200, -0.0198, -0.0191, -0.0181, -0.0170, -0.0165, -0.0161, -0.0159, -0.0157, -0.0156, -0.0156, -0.0150, -0.0137, -0.0131, -0.0128, -0.0129, -0.0124, -0.0119, -0.0106, -0.0096, -0.0086, -0.0084, -0.0075, -0.0069, -0.0070, -0.0075, -0.0092, -0.0109, -0.0124, -0.0137, -0.0140, -0.0146, -0.0146, -0.0144, -0.0144, -0.0155, -0.0160, -0.0167, -0.0174, -0.0187, -0.0198, -0.0208, -0.0217, -0.0226, -0.0229, -0.0226, -0.0219, -0.0194, -0.0173, -0.0155, -0.0143, -0.0129, -0.0120, -0.0126, -0.0137, -0.0148, -0.0153, -0.0166, -0.0182, -0.0197, -0.0216, -0.0230, -0.0244, -0.0255, -0.0270, -0.0275, -0.0280, -0.0277, -0.0276, -0.0272, -0.0272, -0.0276, -0.0284, -0.0292, -0.0300, -0.0299, -0.0305, -0.0315, -0.0316, -0.0313, -0.0320, -0.0324, -0.0326, -0.0339, -0.0354, -0.0368, -0.0376, -0.0379, -0.0381, -0.0377, -0.0373, -0.0374, -0.0380, -0.0382, -0.0394, -0.0402, -0.0415, -0.0429, -0.0439, -0.0442, -0.0455, -0.0472, -0.0487, -0.0504, -0.0515, -0.0537, -0.0555, -0.0570, -0.0583, -0.0589, -0.0601, -0.0606, -0.0614, -0.0617, -0.0621, -0.0620, -0.0614, -0.0616, -0.0618, -0.0620, -0.0622, -0.0628, -0.0623, -0.0617, -0.0602, -0.0590, -0.0584, -0.0577, -0.0572, -0.0555, -0.0536, -0.0511, -0.0488, -0.0468, -0.0448, -0.0427, -0.0401, -0.0378, -0.0358, ])
-        self.y[1] = array([0.0000, 0.0002, 0.0002, 0.0001, 0.0001, 0.0003, 0.0008, 0.0009, 0.0009, 0.0015, 0.0019, 0.0027, 0.0033, 0.0037, 0.0041, 0.0052, 0.0055, 0.0050, 0.0048, 0.0054, 0.0054, 0.0059, 0.0061, 0.0060, 0.0054, 0.0050, 0.0047, 0.0042, 0.0033, 0.0031, 0.0027, 0.0021, 0.0015, 0.0008, -0.0002, -0.0011, -0.0015, -0.0015, -0.0021, -0.0025, -0.0027, -0.0013, 0.0005, 0.0030, 0.0049, 0.0074, 0.0099, 0.0119, 0.0142, 0.0166, 0.0186, 0.0205, 0.0229, 0.0247, 0.0266, 0.0286, 0.0307, 0.0327, 0.0346, 0.0368, 0.0379, 0.0393, 0.0409, 0.0434, 0.0457, 0.0478, 0.0499, 0.0520, 0.0534, 0.0544, 0.0561, 0.0576, 0.0587, 0.0593, 0.0597, 0.0599, 0.0594, 0.0588, 0.0588, 0.0595, 0.0609, 0.0628, 0.0651, 0.0673, 0.0693, 0.0721, 0.0760, 0.0798, 0.0837, 0.0881, 0.0931, 0.0977, 0.1023, 0.1076, 0.1127, 0.1175, 0.1223, 0.1264, 0.1302, 0.1333, 0.1373, 0.1408, 0.1441, 0.1472, 0.1497, 0.1516, 0.1523, 0.1527, 0.1532, 0.1537, 0.1542, 0.1549, 0.1551, 0.1543, 0.1536, 0.1532, 0.1524, 0.1512, 0.1497, 0.1484, 0.1473, 0.1460, 0.1445, 0.1429, 0.1411, 0.1398, 0.1395, 0.1395, 0.1388, 0.1386, 0.1380, 0.1369, 0.1355, 0.1341, 0.1319, 0.1293, 0.1266, 0.1240, 0.1215, 0.1189, 0.1160, 0.1135, 0.1111, 0.1079, 0.1049, 0.1016, 0.0995, 0.0972, 0.0948, 0.0927, 0.0914, 0.0904, 0.0892, 0.0878, 0.0862, 0.0848, 0.0829, 0.0809, 0.0792, 0.0776, 0.0760, 0.0754, 0.0740, 0.0724, 0.0700, 0.0680, 0.0668, 0.0658, 0.0655, 0.0653, 0.0648, 0.0636, 0.0613, 0.0589, 0.0573, 0.0559, 0.0552, 0.0558, 0.0571, 0.0587, 0.0602, 0.0608, 0.0613, 0.0607, 0.0601, 0.0595, 0.0595, 0.0590, 0.0591, 0.0598, 0.0603, 0.0603, 0.0610, 0.0610, 0.0607, 0.0603, 0.0601, 0.0607, 0.0608, 0.0616, 0.0627, 0.0640, 0.0653, 0.0662, 0.0669, 0.0673, 0.0667, 0.0654, 0.0646, 0.0635, 0.0624, 0.0604, 0.0583, 0.0562, 0.0547, 0.0537, 0.0524, 0.0522, 0.0516, 0.0515, 0.0518, 0.0515, 0.0504, 0.0501, 0.0501, 0.0501, 0.0498, 0.0494, 0.0489, 0.0485, 0.0483, 0.0484, 0.0477, 0.0472, 0.0468, 0.0471, 0.0463, 0.0461, 0.0460, 0.0466, 0.0461, 0.0454, 0.0448, 0.0445, 0.0439, 0.0437, 0.0439, 0.0438, 0.0430, 0.0423, 0.0418, 0.0415, 0.0409, 0.0400, 0.0386, 0.0376, 0.0370, 0.0357, 0.0351, 0.0354, 0.0356, 0.0356, 0.0362, 0.0366, 0.0380, 0.0385, 0.0378, 0.0381, 0.0390, 0.0390, 0.0388, 0.0386, 0.0379, 0.0366, 0.0362, 0.0364, 0.0365, 0.0363, 0.0363, 0.0359, 0.0354, 0.0348, 0.0354, 0.0350, 0.0337, 0.0314, 0.0282, 0.0258, 0.0240, 0.0230, 0.0227, 0.0227, 0.0221, 0.0214, 0.0201, 0.0188, 0.0179, 0.0173, 0.0165, 0.0155, 0.0133, 0.0109, 0.0082, 0.0052, 0.0028, 0.0003, -0.0026, -0.0062, -0.0095, -0.0120, -0.0151, -0.0180, -0.0209, -0.0233, -0.0262, -0.0293, -0.0316, -0.0337, -0.0361, -0.0385, -0.0419, -0.0445, -0.0470, -0.0494, -0.0515, -0.0534, -0.0561, -0.0590, -0.0619, -0.0643, -0.0666, -0.0688, -0.0710, -0.0733, -0.0753, -0.0774, -0.0795, -0.0822, -0.0837, -0.0851, -0.0865, -0.0876, -0.0892, -0.0892, -0.0893, -0.0896, -0.0901, -0.0905, -0.0909, -0.0909, -0.0901, -0.0890, -0.0884, -0.0880, -0.0873, -0.0871, -0.0872, -0.0860, -0.0858, -0.0863, -0.0865, -0.0864, -0.0865, -0.0871, -0.0887, -0.0904, -0.0924, -0.0941, -0.0962, -0.0980, -0.0999, -0.1014, -0.1021, -0.1029, -0.1037, -0.1041, -0.1052, -0.1056, -0.1065, -0.1070, -0.1075, -0.1073, -0.1079, -0.1080, -0.1078, -0.1075, -0.1074, -0.1078, -0.1082, -0.1087, -0.1083, -0.1079, -0.1087, -0.1096, -0.1101, -0.1105, -0.1114, -0.1121, -0.1127, -0.1135, -0.1137, -0.1133, -0.1131, -0.1126, -0.1115, -0.1109, -0.1099, -0.1097, -0.1092, -0.1081, -0.1066, -0.1057, -0.1050, -0.1047, -0.1040, -0.1030, -0.1018, -0.1004, -0.0988, -0.0972, -0.0955, -0.0946, -0.0938, -0.0925, -0.0905, -0.0886, -0.0864, -0.0838, -0.0805, -0.0776, -0.0748, -0.0720, -0.0686, -0.0655, -0.0621, -0.0588, -0.0555, -0.0520, -0.0477, -0.0434, -0.0389, -0.0353, -0.0323, -0.0287, -0.0247, -0.0211, -0.0179, -0.0149, -0.0123, -0.0094, -0.0065, -0.0042, -0.0020, -0.0001, 0.0016, 0.0028, 0.0044, 0.0072, 0.0097, 0.0109, 0.0120, 0.0127, 0.0135, 0.0140, 0.0151, 0.0147, 0.0158, 0.0161, 0.0162, 0.0154, 0.0154, 0.0162, 0.0172, 0.0186, 0.0204, 0.0214, 0.0213, 0.0210, 0.0211, 0.0208, 0.0204, 0.0202, 0.0201, 0.0187, 0.0179, 0.0167, 0.0164, 0.0167, 0.0170, 0.0180, 0.0188, 0.0199, 0.0204, 0.0213, 0.0209, 0.0203, 0.0198, 0.0186, 0.0183, 0.0181, 0.0168, 0.0163, 0.0161, 0.0160, 0.0154, 0.0157, 0.0162, 0.0166, 0.0171, 0.0171, 0.0179, 0.0186, 0.0196, 0.0205, 0.0229, 0.0254, 0.0280, 0.0305, 0.0327, 0.0343, 0.0354, 0.0361, 0.0367, 0.0363, 0.0361, 0.0355, 0.0353, 0.0351, 0.0342, 0.0335, 0.0328, 0.0326, 0.0324, 0.0325, 0.0330, 0.0333, 0.0333, 0.0327, 0.0326, 0.0328, 0.0326, 0.0327, 0.0329, 0.0328, 0.0332, 0.0331, 0.0325, 0.0315, 0.0311, 0.0305, 0.0302, 0.0300, 0.0289, 0.0275, 0.0260, 0.0246, 0.0234, 0.0230, 0.0216, 0.0211, 0.0205, 0.0191, 0.0172, 0.0147, 0.0131, 0.0112, 0.0094, 0.0082, 0.0062, 0.0045, 0.0041, 0.0035, 0.0037, 0.0035, 0.0033, 0.0033, 0.0037, 0.0034, 0.0036, 0.0033, 0.0028, 0.0021, 0.0015, 0.0008, 0.0004, 0.0002, -0.0002, -0.0008, -0.0001, 0.0007, 0.0015, 0.0020, 0.0020, 0.0028, 0.0037, 0.0045, 0.0052, 0.0060, 0.0063, 0.0074, 0.0083, 0.0092, 0.0095, 0.0095, 0.0096, 0.0093, 0.0100, 0.0097, 0.0093, 0.0084, 0.0071, 0.0050, 0.0044, 0.0031, 0.0017, 0.0005, -0.0004, -0.0018, -0.0026, -0.0026, -0.0020, -0.0018, -0.0010, 0.0003, 0.0024, 0.0046, 0.0066, 0.0090, 0.0110, 0.0126, 0.0143, 0.0157, 0.0167, 0.0171, 0.0179, 0.0195, 0.0223, 0.0254, 0.0287, 0.0320, 0.0359, 0.0400, 0.0439, 0.0470, 0.0491, 0.0515, 0.0535, 0.0563, 0.0585, 0.0605, 0.0620, 0.0635, 0.0654, 0.0670, 0.0687, 0.0701, 0.0728, 0.0746, 0.0766, 0.0785, 0.0800, 0.0812, 0.0817, 0.0822, 0.0820, 0.0814, 0.0814, 0.0817, 0.0820, 0.0823, 0.0826, 0.0826, 0.0831, 0.0833, 0.0846, 0.0851, 0.0853, 0.0855, 0.0858, 0.0859, 0.0864, 0.0868, 0.0876, 0.0884, 0.0890, 0.0894, 0.0895, 0.0888, 0.0882, 0.0883, 0.0884, 0.0892, 0.0903, 0.0915, 0.0917, 0.0916, 0.0908, 0.0900, 0.0891, 0.0881, 0.0869, 0.0849, 0.0825, 0.0805, 0.0789, 0.0773, 0.0761, 0.0750, 0.0738, 0.0729, 0.0717, 0.0712, 0.0714, 0.0718, 0.0727, 0.0737, 0.0735, 0.0733, 0.0723, 0.0706, 0.0683, 0.0666, 0.0651, 0.0636, 0.0620, 0.0599, 0.0580, 0.0563, 0.0551, 0.0540, 0.0526, 0.0516, 0.0503, 0.0492, 0.0482, 0.0469, 0.0468, 0.0471, 0.0471, 0.0471, 0.0483, 0.0490, 0.0486, 0.0489, 0.0495, 0.0510, 0.0523, 0.0538, 0.0547, 0.0552, 0.0556, 0.0569, 0.0573, 0.0578, 0.0583, 0.0579, 0.0579, 0.0580, 0.0583, 0.0585, 0.0594, 0.0601, 0.0598, 0.0594, 0.0597, 0.0602, 0.0611, 0.0612, 0.0618, 0.0620, 0.0626, 0.0635, 0.0637, 0.0645, 0.0649, 0.0657, 0.0667, 0.0680, 0.0688, 0.0693, 0.0698, 0.0702, 0.0699, 0.0703, 0.0702, 0.0705, 0.0716, 0.0725, 0.0730, 0.0736, 0.0736, 0.0734, 0.0735, 0.0739, 0.0736, 0.0728, 0.0720, 0.0717, 0.0715, 0.0709, 0.0704, 0.0707, 0.0704, 0.0695, 0.0690, 0.0687, 0.0667, 0.0648, 0.0629, 0.0620, 0.0620, 0.0618, 0.0621, 0.0623, 0.0633, 0.0637, 0.0637, 0.0638, 0.0639, 0.0639, 0.0642, 0.0650, 0.0653, 0.0657, 0.0661, ])
-        self.y[2] = array([0.0000, 0.0001, -0.0002, -0.0003, 0.0004, 0.0014, 0.0021, 0.0025, 0.0025, 0.0021, 0.0018, 0.0022, 0.0016, 0.0018, 0.0018, 0.0021, 0.0027, 0.0034, 0.0046, 0.0060, 0.0076, 0.0080, 0.0084, 0.0090, 0.0100, 0.0104, 0.0098, 0.0097, 0.0100, 0.0100, 0.0105, 0.0117, 0.0124, 0.0128, 0.0133, 0.0133, 0.0133, 0.0132, 0.0132, 0.0136, 0.0144, 0.0161, 0.0179, 0.0196, 0.0222, 0.0251, 0.0265, 0.0279, 0.0287, 0.0291, 0.0297, 0.0305, 0.0316, 0.0328, 0.0340, 0.0361, 0.0382, 0.0408, 0.0425, 0.0442, 0.0460, 0.0474, 0.0489, 0.0502, 0.0512, 0.0517, 0.0526, 0.0525, 0.0525, 0.0521, 0.0508, 0.0498, 0.0487, 0.0478, 0.0472, 0.0461, 0.0446, 0.0434, 0.0415, 0.0399, 0.0388, 0.0374, 0.0360, 0.0351, 0.0339, 0.0320, 0.0308, 0.0294, 0.0286, 0.0278, 0.0255, 0.0224, 0.0194, 0.0170, 0.0147, 0.0131, 0.0123, 0.0121, 0.0110, 0.0106, 0.0100, 0.0090, 0.0089, 0.0093, 0.0100, 0.0111, 0.0132, 0.0159, 0.0179, 0.0195, 0.0207, 0.0220, 0.0229, 0.0242, 0.0261, 0.0279, 0.0290, 0.0300, 0.0303, 0.0309, 0.0316, 0.0328, 0.0335, 0.0332, 0.0323, 0.0314, 0.0300, 0.0283, 0.0268, 0.0248, 0.0225, 0.0201, 0.0172, 0.0143, 0.0119, 0.0104, 0.0088, 0.0071, 0.0059, 0.0051, 0.0038, 0.0027, 0.0017, 0.0009, 0.0007, -0.0002, -0.0008, -0.0020, -0.0034, -0.0055, -0.0069, -0.0082, -0.0086, -0.0085, -0.0089, -0.0088, -0.0092, -0.0099, -0.0110, -0.0121, -0.0137, -0.0150, -0.0157, -0.0160, -0.0155, -0.0149, -0.0140, -0.0139, -0.0134, -0.0135, -0.0136, -0.0138, -0.0145, -0.0158, -0.0155, -0.0155, -0.0153, -0.0154, -0.0159, -0.0157, -0.0152, -0.0143, -0.0140, -0.0138, -0.0142, -0.0148, -0.0154, -0.0154, -0.0147, -0.0136, -0.0122, -0.0107, -0.0102, -0.0091, -0.0082, -0.0063, -0.0042, -0.0028, -0.0007, 0.0015, 0.0038, 0.0054, 0.0075, 0.0093, 0.0110, 0.0137, 0.0156, 0.0170, 0.0184, 0.0195, 0.0199, 0.0206, 0.0209, 0.0207, 0.0201, 0.0198, 0.0196, 0.0191, 0.0192, 0.0193, 0.0196, 0.0201, 0.0206, 0.0216, 0.0229, 0.0253, 0.0278, 0.0304, 0.0321, 0.0341, 0.0356, 0.0367, 0.0372, 0.0379, 0.0383, 0.0394, 0.0396, 0.0397, 0.0391, 0.0382, 0.0362, 0.0346, 0.0334, 0.0325, 0.0325, 0.0325, 0.0323, 0.0316, 0.0321, 0.0328, 0.0338, 0.0352, 0.0366, 0.0378, 0.0389, 0.0401, 0.0403, 0.0406, 0.0419, 0.0425, 0.0424, 0.0421, 0.0415, 0.0407, 0.0406, 0.0411, 0.0413, 0.0419, 0.0420, 0.0416, 0.0415, 0.0402, 0.0388, 0.0377, 0.0368, 0.0357, 0.0353, 0.0351, 0.0348, 0.0347, 0.0340, 0.0326, 0.0314, 0.0306, 0.0295, 0.0288, 0.0275, 0.0257, 0.0234, 0.0209, 0.0188, 0.0169, 0.0151, 0.0132, 0.0114, 0.0093, 0.0076, 0.0055, 0.0026, -0.0008, -0.0038, -0.0069, -0.0097, -0.0118, -0.0132, -0.0148, -0.0164, -0.0183, -0.0202, -0.0213, -0.0228, -0.0253, -0.0280, -0.0299, -0.0315, -0.0329, -0.0343, -0.0349, -0.0364, -0.0373, -0.0383, -0.0391, -0.0400, -0.0401, -0.0404, -0.0414, -0.0422, -0.0425, -0.0425, -0.0420, -0.0419, -0.0412, -0.0412, -0.0408, -0.0400, -0.0396, -0.0397, -0.0400, -0.0401, -0.0405, -0.0412, -0.0410, -0.0401, -0.0389, -0.0377, -0.0372, -0.0369, -0.0364, -0.0356, -0.0347, -0.0345, -0.0346, -0.0353, -0.0359, -0.0367, -0.0376, -0.0385, -0.0387, -0.0391, -0.0401, -0.0400, -0.0398, -0.0395, -0.0391, -0.0385, -0.0383, -0.0377, -0.0374, -0.0371, -0.0361, -0.0357, -0.0355, -0.0342, -0.0324, -0.0303, -0.0280, -0.0257, -0.0232, -0.0205, -0.0179, -0.0147, -0.0113, -0.0091, -0.0059, -0.0019, 0.0024, 0.0071, 0.0120, 0.0177, 0.0219, 0.0248, 0.0273, 0.0290, 0.0302, 0.0318, 0.0325, 0.0331, 0.0334, 0.0344, 0.0360, 0.0387, 0.0414, 0.0437, 0.0456, 0.0471, 0.0491, 0.0511, 0.0526, 0.0536, 0.0550, 0.0570, 0.0597, 0.0622, 0.0647, 0.0672, 0.0696, 0.0710, 0.0725, 0.0748, 0.0777, 0.0806, 0.0832, 0.0854, 0.0874, 0.0893, 0.0906, 0.0914, 0.0927, 0.0937, 0.0944, 0.0959, 0.0970, 0.0970, 0.0967, 0.0955, 0.0945, 0.0934, 0.0927, 0.0921, 0.0916, 0.0909, 0.0901, 0.0893, 0.0884, 0.0881, 0.0877, 0.0870, 0.0870, 0.0871, 0.0872, 0.0867, 0.0860, 0.0845, 0.0821, 0.0800, 0.0775, 0.0752, 0.0728, 0.0703, 0.0676, 0.0655, 0.0637, 0.0618, 0.0593, 0.0558, 0.0518, 0.0483, 0.0445, 0.0414, 0.0384, 0.0365, 0.0349, 0.0338, 0.0330, 0.0323, 0.0320, 0.0319, 0.0320, 0.0323, 0.0324, 0.0324, 0.0322, 0.0327, 0.0328, 0.0320, 0.0314, 0.0295, 0.0279, 0.0258, 0.0243, 0.0229, 0.0211, 0.0195, 0.0176, 0.0163, 0.0151, 0.0136, 0.0123, 0.0108, 0.0088, 0.0064, 0.0041, 0.0021, 0.0002, -0.0020, -0.0051, -0.0078, -0.0106, -0.0137, -0.0169, -0.0195, -0.0218, -0.0235, -0.0253, -0.0269, -0.0281, -0.0290, -0.0299, -0.0315, -0.0328, -0.0336, -0.0344, -0.0352, -0.0354, -0.0353, -0.0358, -0.0355, -0.0347, -0.0344, -0.0338, -0.0335, -0.0324, -0.0319, -0.0319, -0.0322, -0.0334, -0.0351, -0.0365, -0.0381, -0.0401, -0.0424, -0.0449, -0.0472, -0.0491, -0.0506, -0.0522, -0.0533, -0.0544, -0.0553, -0.0553, -0.0557, -0.0558, -0.0563, -0.0573, -0.0587, -0.0602, -0.0617, -0.0636, -0.0666, -0.0699, -0.0734, -0.0760, -0.0791, -0.0817, -0.0840, -0.0857, -0.0869, -0.0881, -0.0882, -0.0884, -0.0888, -0.0893, -0.0889, -0.0876, -0.0869, -0.0858, -0.0851, -0.0836, -0.0825, -0.0813, -0.0807, -0.0800, -0.0802, -0.0805, -0.0807, -0.0813, -0.0818, -0.0819, -0.0822, -0.0829, -0.0825, -0.0829, -0.0838, -0.0840, -0.0836, -0.0824, -0.0810, -0.0799, -0.0789, -0.0785, -0.0785, -0.0774, -0.0770, -0.0761, -0.0755, -0.0752, -0.0746, -0.0744, -0.0741, -0.0729, -0.0718, -0.0710, -0.0694, -0.0673, -0.0649, -0.0627, -0.0606, -0.0592, -0.0582, -0.0571, -0.0555, -0.0539, -0.0527, -0.0516, -0.0508, -0.0503, -0.0508, -0.0518, -0.0527, -0.0536, -0.0544, -0.0545, -0.0541, -0.0547, -0.0553, -0.0561, -0.0573, -0.0587, -0.0600, -0.0608, -0.0616, -0.0624, -0.0626, -0.0631, -0.0638, -0.0630, -0.0621, -0.0612, -0.0603, -0.0594, -0.0577, -0.0564, -0.0551, -0.0535, -0.0511, -0.0485, -0.0455, -0.0424, -0.0396, -0.0374, -0.0360, -0.0351, -0.0343, -0.0336, -0.0324, -0.0311, -0.0296, -0.0276, -0.0259, -0.0240, -0.0223, -0.0212, -0.0205, -0.0201, -0.0203, -0.0214, -0.0232, -0.0261, -0.0285, -0.0304, -0.0320, -0.0342, -0.0365, -0.0381, -0.0394, -0.0416, -0.0434, -0.0443, -0.0450, -0.0465, -0.0482, -0.0490, -0.0497, -0.0508, -0.0506, -0.0509, -0.0514, -0.0522, -0.0525, -0.0532, -0.0547, -0.0553, -0.0575, -0.0597, -0.0629, -0.0666, -0.0702, -0.0737, -0.0773, -0.0805, -0.0835, -0.0847, -0.0875, -0.0893, -0.0913, -0.0929, -0.0935, -0.0943, -0.0949, -0.0957, -0.0962, -0.0977, -0.0994, -0.1011, -0.1031, -0.1057, -0.1086, -0.1114, -0.1141, -0.1158, -0.1174, -0.1197, -0.1219, -0.1234, -0.1250, -0.1267, -0.1273, -0.1270, -0.1268, -0.1263, -0.1257, -0.1240, -0.1220, -0.1210, -0.1197, -0.1197, -0.1188, -0.1171, -0.1147, -0.1122, -0.1101, -0.1077, -0.1052, -0.1031, -0.1020, -0.1008, -0.0983, -0.0960, -0.0934, -0.0908, -0.0889, -0.0865, -0.0836, -0.0799, -0.0767, -0.0740, -0.0716, -0.0692, -0.0663, -0.0628, -0.0596, -0.0567, -0.0535, -0.0508, -0.0472, -0.0435, -0.0394, -0.0347, -0.0301, -0.0253, -0.0210, -0.0165, -0.0126, -0.0095, -0.0072, -0.0046, -0.0020, -0.0001, 0.0023, 0.0050, 0.0077, 0.0102, 0.0135, 0.0175, 0.0212, 0.0245, 0.0280, 0.0309, 0.0336, 0.0365, 0.0397, 0.0433, 0.0474, 0.0511, 0.0546, 0.0574, 0.0602, 0.0634, 0.0663, 0.0695, 0.0729, 0.0752, 0.0762, 0.0773, 0.0781, 0.0790, 0.0806, 0.0836, 0.0857, 0.0879, 0.0896, 0.0920, 0.0949, 0.0975, 0.1002, ])
-
 # COMPOSITE types:
 # MassSpringForce: Line(horizontal), Spring, Rectangle, Arrow/Line(w/arrow)
 # must be easy to find the tip of the arrow
@@ -2547,7 +3508,7 @@ class ArbitraryVolume(Shape):
     """
     def __init__(self, position, width=1,
                  volume_symbol='V',
-                 volume_symbol_fontsize='18',
+                 volume_symbol_fontsize=18,
                  normal_vector_symbol='n',
                  vector_field_symbol=None):
         """
@@ -27,574 +27,1452 @@ def equal_dict(d1, d2):
                     return False
     return True
 
-def test_Axis():
-    drawing_tool.set_coordinate_system(
-        xmin=0, xmax=15, ymin=-7, ymax=8, axis=True,
-        instruction_file='tmp_Axis.py')
-    # Draw normal x and y axis with origin at (7.5, 2)
-    # in the coordinate system of the sketch: [0,15]x[-7,8]
-    x_axis = Axis((7.5,2), 5, 'x', rotation_angle=0)
-    y_axis = Axis((7.5,2), 5, 'y', rotation_angle=90)
-    system = Composition({'x axis': x_axis, 'y axis': y_axis})
-    system.draw()
-    drawing_tool.display()
-
-    # Rotate this system 40 degrees counter clockwise
-    # and draw it with dashed lines
-    system.set_linestyle('dashed')
-    system.rotate(40, (7.5,2))
-    system.draw()
-    drawing_tool.display()
-
-    # Rotate this system another 220 degrees and show
-    # with dotted lines
-    system.set_linestyle('dotted')
-    system.rotate(220, (7.5,2))
-    system.draw()
-    drawing_tool.display()
-
-    drawing_tool.display('Axis')
-    drawing_tool.savefig('tmp_Axis')
-    expected = {
-        'x axis': {
-            'arrow': {
-                'head left': {'line': "2 (x,y) coords linestyle='dotted'",},
-                'line': {'line': "2 (x,y) coords linestyle='dotted'",},
-                'head right': {'line': "2 (x,y) coords linestyle='dotted'",},},
-            'label': "Text at (6.57388,-3.25231)",},
-        'y axis': {
-            'arrow': {
-                'head left': {'line': "2 (x,y) coords linestyle='dotted'",},
-                'line': {'line': "2 (x,y) coords linestyle='dotted'",},
-                'head right': {'line': "2 (x,y) coords linestyle='dotted'",},},
-            'label': "Text at (12.7523,1.07388)",},}
-    computed = eval(repr(system))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
-
-
-def test_Distance_wText():
-    drawing_tool.set_coordinate_system(
-        xmin=0, xmax=10, ymin=0, ymax=6,
-        axis=True, instruction_file='tmp_Distance_wText.py')
-
-    fontsize=14
-    t = r'$ 2\pi R^2 $'  # sample text
-    examples = Composition({
-        'a0': Distance_wText((4,5), (8, 5), t, fontsize),
-        'a6': Distance_wText((4,5), (4, 4), t, fontsize),
-        'a1': Distance_wText((0,2), (2, 4.5), t, fontsize),
-        'a2': Distance_wText((0,2), (2, 0), t, fontsize),
-        'a3': Distance_wText((2,4.5), (0, 5.5), t, fontsize),
-        'a4': Distance_wText((8,4), (10, 3), t, fontsize,
-                             text_spacing=-1./60),
-        'a5': Distance_wText((8,2), (10, 1), t, fontsize,
-                             text_spacing=-1./40, alignment='right'),
-        'c1': Text_wArrow('text_spacing=-1./60',
-                          (4, 3.5), (9, 3.2),
-                          fontsize=10, alignment='left'),
-        'c2': Text_wArrow('text_spacing=-1./40, alignment="right"',
-                          (4, 0.5), (9, 1.2),
-                          fontsize=10, alignment='left'),
-        })
-    examples.draw()
-    drawing_tool.display('Distance_wText and text positioning')
-    drawing_tool.savefig('tmp_Distance_wText')
-
-    expected = {
-        'a1': {
-            'text': "Text at (1.13014,3.14588)",
-            'arrow': {
+def test_Axis(tmpdir):
+    with tmpdir.as_cwd():
+        drawing_tool.set_coordinate_system(
+            xmin=0, xmax=15, ymin=-7, ymax=8, axis=True,
+            instruction_file='tmp_Axis.py')
+        # Draw normal x and y axis with origin at (7.5, 2)
+        # in the coordinate system of the sketch: [0,15]x[-7,8]
+        x_axis = Axis((7.5,2), 5, 'x', rotation_angle=0)
+        y_axis = Axis((7.5,2), 5, 'y', rotation_angle=90)
+        system = Composition({'x axis': x_axis, 'y axis': y_axis})
+        system.draw()
+        drawing_tool.display()
+
+        # Rotate this system 40 degrees counter clockwise
+        # and draw it with dashed lines
+        system.set_linestyle('dashed')
+        system.rotate(40, (7.5,2))
+        system.draw()
+        drawing_tool.display()
+
+        # Rotate this system another 220 degrees and show
+        # with dotted lines
+        system.set_linestyle('dotted')
+        system.rotate(220, (7.5,2))
+        system.draw()
+        drawing_tool.display()
+
+        drawing_tool.display('Axis')
+        drawing_tool.savefig('tmp_Axis')
+        expected = {
+            'x axis': {
+                'arrow': {
+                    'head left': {'line': "2 (x,y) coords linestyle='dotted'",},
+                    'line': {'line': "2 (x,y) coords linestyle='dotted'",},
+                    'head right': {'line': "2 (x,y) coords linestyle='dotted'",},},
+                'label': "Text at (6.57388,-3.25231)",},
+            'y axis': {
                 'arrow': {
+                    'head left': {'line': "2 (x,y) coords linestyle='dotted'",},
+                    'line': {'line': "2 (x,y) coords linestyle='dotted'",},
+                    'head right': {'line': "2 (x,y) coords linestyle='dotted'",},},
+                'label': "Text at (12.7523,1.07388)",},}
+        computed = eval(repr(system))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+
+def test_Distance_wText(tmpdir):
+    with tmpdir.as_cwd():
+        drawing_tool.set_coordinate_system(
+            xmin=0, xmax=10, ymin=0, ymax=6,
+            axis=True, instruction_file='tmp_Distance_wText.py')
+
+        fontsize=14
+        t = r'$ 2\pi R^2 $'  # sample text
+        examples = Composition({
+            'a0': Distance_wText((4,5), (8, 5), t, fontsize),
+            'a6': Distance_wText((4,5), (4, 4), t, fontsize),
+            'a1': Distance_wText((0,2), (2, 4.5), t, fontsize),
+            'a2': Distance_wText((0,2), (2, 0), t, fontsize),
+            'a3': Distance_wText((2,4.5), (0, 5.5), t, fontsize),
+            'a4': Distance_wText((8,4), (10, 3), t, fontsize,
+                                 text_spacing=-1./60),
+            'a5': Distance_wText((8,2), (10, 1), t, fontsize,
+                                 text_spacing=-1./40, alignment='right'),
+            'c1': Text_wArrow('text_spacing=-1./60',
+                              (4, 3.5), (9, 3.2),
+                              fontsize=10, alignment='left'),
+            'c2': Text_wArrow('text_spacing=-1./40, alignment="right"',
+                              (4, 0.5), (9, 1.2),
+                              fontsize=10, alignment='left'),
+            })
+        examples.draw()
+        drawing_tool.display('Distance_wText and text positioning')
+        drawing_tool.savefig('tmp_Distance_wText')
+
+        expected = {
+            'a1': {
+                'text': "Text at (1.13014,3.14588)",
+                'arrow': {
+                    'arrow': {
+                        'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'a0': {
+                'text': "Text at (6,5.16667)",
+                'arrow': {'arrow': {
+                    'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'a3': {
+                'text': "Text at (1.07454,5.14907)",
+                'arrow': {'arrow': {
+                    'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'a2': {
+                'text': "Text at (1.11785,1.11785)",
+                'arrow': {'arrow': {
+                    'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'a5': {
+                'text': "Text at (8.8882,1.27639)",
+                'arrow': {'arrow': {
+                    'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'a4': {
+                'text': "Text at (8.92546,3.35093)",
+                'arrow': {'arrow': {
+                    'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'a6': {
+                'text': "Text at (4.16667,4.5)",
+                'arrow': {'arrow': {
                     'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'a0': {
-            'text': "Text at (6,5.16667)",
-            'arrow': {'arrow': {
-                'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'a3': {
-            'text': "Text at (1.07454,5.14907)",
-            'arrow': {'arrow': {
-                'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'a2': {
-            'text': "Text at (1.11785,1.11785)",
-            'arrow': {'arrow': {
-                'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'a5': {
-            'text': "Text at (8.8882,1.27639)",
-            'arrow': {'arrow': {
-                'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'a4': {
-            'text': "Text at (8.92546,3.35093)",
-            'arrow': {'arrow': {
-                'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'a6': {
-            'text': "Text at (4.16667,4.5)",
-            'arrow': {'arrow': {
-                'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'c2': "Text_wArrow at (4,0.5)",
-        'c1': "Text_wArrow at (4,3.5)",
-        }
-    computed = eval(repr(examples))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
-
-
-def test_Rectangle():
-    L = 3.0
-    W = 4.0
-
-    drawing_tool.set_coordinate_system(
-        xmin=0, xmax=2*W, ymin=-L/2, ymax=2*L,
-        axis=True, instruction_file='tmp_Rectangle.py')
-    drawing_tool.set_linecolor('blue')
-    drawing_tool.set_grid(True)
-
-    xpos = W/2
-    r = Rectangle(lower_left_corner=(xpos,0), width=W, height=L)
-    r.draw()
-    r.draw_dimensions()
-    drawing_tool.display('Rectangle')
-    drawing_tool.savefig('tmp_Rectangle')
-
-    expected = {'rectangle': "5 (x,y) coords",}
-    computed = eval(repr(r))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
-
-def test_Triangle():
-    L = 3.0
-    W = 4.0
-
-    drawing_tool.set_coordinate_system(
-        xmin=0, xmax=2*W, ymin=-L/2, ymax=1.2*L,
-        axis=True, instruction_file='tmp_Triangle.py')
-    drawing_tool.set_linecolor('blue')
-    drawing_tool.set_grid(True)
-
-    xpos = 1
-    t = Triangle(p1=(W/2,0), p2=(3*W/2,W/2), p3=(4*W/5.,L))
-    t.draw()
-    t.draw_dimensions()
-    drawing_tool.display('Triangle')
-    drawing_tool.savefig('tmp_Triangle')
-
-    expected = {'triangle': "4 (x,y) coords",}
-    computed = eval(repr(t))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
-
-
-def test_Arc():
-    L = 4.0
-    W = 4.0
-
-    drawing_tool.set_coordinate_system(
-        xmin=-W/2, xmax=W, ymin=-L/2, ymax=1.5*L,
-        axis=True, instruction_file='tmp_Arc.py')
-    drawing_tool.set_linecolor('blue')
-    drawing_tool.set_grid(True)
-
-    center = point(0,0)
-    radius = L/2
-    start_angle = 60
-    arc_angle = 45
-    a = Arc(center, radius, start_angle, arc_angle)
-    a.draw()
-
-    R1 = 1.25*radius
-    R2 = 1.5*radius
-    R = 2*radius
-    a.dimensions = {
-        'start_angle':
-        Arc_wText(
-            'start_angle', center, R1, start_angle=0,
-            arc_angle=start_angle, text_spacing=1/10.),
-        'arc_angle':
-        Arc_wText(
-            'arc_angle', center, R2, start_angle=start_angle,
-            arc_angle=arc_angle, text_spacing=1/20.),
-        'r=0':
-        Line(center, center +
-             point(R*cos(radians(start_angle)),
-                   R*sin(radians(start_angle)))),
-        'r=start_angle':
-        Line(center, center +
-             point(R*cos(radians(start_angle+arc_angle)),
-                   R*sin(radians(start_angle+arc_angle)))),
-        'r=start+arc_angle':
-        Line(center, center +
-             point(R, 0)).set_linestyle('dashed'),
-        'radius': Distance_wText(center, a(0), 'radius', text_spacing=1/40.),
-        'center': Text('center', center-point(radius/10., radius/10.)),
-        }
-    for dimension in a.dimensions:
-        if dimension.startswith('r='):
-            dim = a.dimensions[dimension]
-            dim.set_linestyle('dashed')
-            dim.set_linewidth(1)
-            dim.set_linecolor('black')
-
-    a.draw_dimensions()
-    drawing_tool.display('Arc')
-    drawing_tool.savefig('tmp_Arc')
-
-    expected = {'arc': "181 (x,y) coords"}
-    computed = eval(repr(a))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
-
-    expected = {
-        'center': 'text "center" at (-0.2,-0.2)',
-        'start_angle': {'text': "Text at (2.68468,1.55)",
-                        'arc': {'arc': "181 (x,y) coords",},},
-        'r=start+arc_angle': {
-            'line': "2 (x,y) coords linecolor='k' linewidth=1 linestyle='dashed'",},
-        'r=0': {'line': "2 (x,y) coords linecolor='k' linewidth=1 linestyle='dashed'",},
-        'radius': {'text': "Text at (0.629904,0.791025)",
-                   'arrow': {'arrow': {
-                       'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'r=start_angle': {'line': "2 (x,y) coords linecolor='k' linewidth=1 linestyle='dashed'",},
-        'arc_angle': {'text': "Text at (0.430736,3.27177)",
-                      'arc': {'arc': "181 (x,y) coords",},}
-        }
-    computed = eval(repr(a.dimensions))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
-
-def test_Spring():
-    L = 5.0
-    W = 2.0
-
-    drawing_tool.set_coordinate_system(
-        xmin=0, xmax=7*W, ymin=-L/2, ymax=1.5*L,
-        axis=True, instruction_file='tmp_Spring.py')
-    drawing_tool.set_linecolor('blue')
-    drawing_tool.set_grid(True)
-
-    xpos = W
-    s1 = Spring((W,0), L, teeth=True)
-    s1_title = Text('Default Spring',
-                    s1.geometric_features()['end'] + point(0,L/10))
-    s1.draw()
-    s1_title.draw()
-    #s1.draw_dimensions()
-    xpos += 3*W
-    s2 = Spring(start=(xpos,0), length=L, width=W/2.,
-                bar_length=L/6., teeth=False)
-    s2.draw()
-    s2.draw_dimensions()
-    drawing_tool.display('Spring')
-    drawing_tool.savefig('tmp_Spring')
-
-    # Check s1 and s1.dimensions
-    expected = {
-        'bar1': {'line': "2 (x,y) coords",},
-        'bar2': {'line': "2 (x,y) coords",},
-        'spiral': "45 (x,y) coords",}
-    computed = eval(repr(s1))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
-
-    expected = {
-        'bar_length1': {'text': "Text_wArrow at (-1.5,1.75)",
-                        'arrow': {'arrow': {
-                            'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'bar_length2': {'text': "Text_wArrow at (-1.5,5.5)",
-                        'arrow': {'arrow': {
-                            'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'width': {'text': "Text at (2,-1.51667)",
-                  'arrow': {'arrow': {
-                      'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'start': 'annotation "start" at (1.25,-0.75) with arrow to (2,0)',
-        'length': {'text': "Text at (3.73333,2.5)",
-                   'arrow': {'arrow': {
-                       'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'num_windings': 'annotation "num_windings" at (3,5.5) with arrow to (2.6,2.5)'
-        }
-    computed = eval(repr(s1.dimensions))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
-
-
-def test_Dashpot():
-    L = 5.0
-    W = 2.0
-    xpos = 0
-
-    drawing_tool.set_coordinate_system(
-        xmin=xpos, xmax=xpos+5.5*W, ymin=-L/2, ymax=1.5*L,
-        axis=True, instruction_file='tmp_Dashpot.py')
-    drawing_tool.set_linecolor('blue')
-    drawing_tool.set_grid(True)
-
-    # Default (simple) dashpot
-    xpos = 1.5
-    d1 = Dashpot(start=(xpos,0), total_length=L)
-    d1_title = Text('Dashpot (default)',
-                    d1.geometric_features()['end'] + point(0,L/10))
-    d1.draw()
-    d1_title.draw()
-
-    # Dashpot for animation with fixed bar_length, dashpot_length and
-    # prescribed piston_pos
-    xpos += 2.5*W
-    d2 = Dashpot(start=(xpos,0), total_length=1.2*L, width=W/2,
-                 bar_length=W, dashpot_length=L/2, piston_pos=2*W)
-    d2.draw()
-    d2.draw_dimensions()
-
-    drawing_tool.display('Dashpot')
-    drawing_tool.savefig('tmp_Dashpot')
-
-    expected = {
-        'line start': {'line': "2 (x,y) coords",},
-        'piston': {
-            'line': {'line': "2 (x,y) coords",},
-            'rectangle': {
-                'rectangle': "5 (x,y) coords fillcolor='' fillpattern='X'",},},
-        'pot': "4 (x,y) coords",
-        }
-    computed = eval(repr(d2))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
-
-    expected = {
-        'width': {'text': "Text at (6.5,-1.56667)",
-                  'arrow': {'arrow': {
-                      'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'start': 'annotation "start" at (5.75,-0.75) with arrow to (6.5,0)',
-        'bar_length': {'text': "Text_wArrow at (3.5,1.5)",
+            'c2': "Text_wArrow at (4,0.5)",
+            'c1': "Text_wArrow at (4,3.5)",
+            }
+        computed = eval(repr(examples))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+
+def test_Rectangle(tmpdir):
+    with tmpdir.as_cwd():
+        L = 3.0
+        W = 4.0
+
+        drawing_tool.set_coordinate_system(
+            xmin=0, xmax=2*W, ymin=-L/2, ymax=2*L,
+            axis=True, instruction_file='tmp_Rectangle.py')
+        drawing_tool.set_linecolor('blue')
+        drawing_tool.set_grid(True)
+
+        xpos = W/2
+        r = Rectangle(lower_left_corner=(xpos,0), width=W, height=L)
+        r.draw()
+        r.draw_dimensions()
+        drawing_tool.display('Rectangle')
+        drawing_tool.savefig('tmp_Rectangle')
+
+        expected = {'rectangle': "5 (x,y) coords",}
+        computed = eval(repr(r))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+def test_Triangle(tmpdir):
+    with tmpdir.as_cwd():
+        L = 3.0
+        W = 4.0
+
+        drawing_tool.set_coordinate_system(
+            xmin=0, xmax=2*W, ymin=-L/2, ymax=1.2*L,
+            axis=True, instruction_file='tmp_Triangle.py')
+        drawing_tool.set_linecolor('blue')
+        drawing_tool.set_grid(True)
+
+        xpos = 1
+        t = Triangle(p1=(W/2,0), p2=(3*W/2,W/2), p3=(4*W/5.,L))
+        t.draw()
+        t.draw_dimensions()
+        drawing_tool.display('Triangle')
+        drawing_tool.savefig('tmp_Triangle')
+
+        expected = {'triangle': "4 (x,y) coords",}
+        computed = eval(repr(t))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+
+def test_Arc(tmpdir):
+    with tmpdir.as_cwd():
+        L = 4.0
+        W = 4.0
+
+        drawing_tool.set_coordinate_system(
+            xmin=-W/2, xmax=W, ymin=-L/2, ymax=1.5*L,
+            axis=True, instruction_file='tmp_Arc.py')
+        drawing_tool.set_linecolor('blue')
+        drawing_tool.set_grid(True)
+
+        center = point(0,0)
+        radius = L/2
+        start_angle = 60
+        arc_angle = 45
+        a = Arc(center, radius, start_angle, arc_angle)
+        a.draw()
+
+        R1 = 1.25*radius
+        R2 = 1.5*radius
+        R = 2*radius
+        a.dimensions = {
+            'start_angle':
+            Arc_wText(
+                'start_angle', center, R1, start_angle=0,
+                arc_angle=start_angle, text_spacing=1/10.),
+            'arc_angle':
+            Arc_wText(
+                'arc_angle', center, R2, start_angle=start_angle,
+                arc_angle=arc_angle, text_spacing=1/20.),
+            'r=0':
+            Line(center, center +
+                 point(R*cos(radians(start_angle)),
+                       R*sin(radians(start_angle)))),
+            'r=start_angle':
+            Line(center, center +
+                 point(R*cos(radians(start_angle+arc_angle)),
+                       R*sin(radians(start_angle+arc_angle)))),
+            'r=start+arc_angle':
+            Line(center, center +
+                 point(R, 0)).set_linestyle('dashed'),
+            'radius': Distance_wText(center, a(0), 'radius', text_spacing=1/40.),
+            'center': Text('center', center-point(radius/10., radius/10.)),
+            }
+        for dimension in a.dimensions:
+            if dimension.startswith('r='):
+                dim = a.dimensions[dimension]
+                dim.set_linestyle('dashed')
+                dim.set_linewidth(1)
+                dim.set_linecolor('black')
+
+        a.draw_dimensions()
+        drawing_tool.display('Arc')
+        drawing_tool.savefig('tmp_Arc')
+
+        expected = {'arc': "181 (x,y) coords"}
+        computed = eval(repr(a))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+        expected = {
+            'center': 'text "center" at (-0.2,-0.2)',
+            'start_angle': {'text': "Text at (2.68468,1.55)",
+                            'arc': {'arc': "181 (x,y) coords",},},
+            'r=start+arc_angle': {
+                'line': "2 (x,y) coords linecolor='k' linewidth=1 linestyle='dashed'",},
+            'r=0': {'line': "2 (x,y) coords linecolor='k' linewidth=1 linestyle='dashed'",},
+            'radius': {'text': "Text at (0.629904,0.791025)",
                        'arrow': {'arrow': {
                            'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'total_length': {'text': "Text_wArrow at (8.75,5)",
-                         'arrow': {'arrow': {
-                             'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'dashpot_length': {'text': "Text_wArrow at (7,-0.5)",
+            'r=start_angle': {'line': "2 (x,y) coords linecolor='k' linewidth=1 linestyle='dashed'",},
+            'arc_angle': {'text': "Text at (0.430736,3.27177)",
+                          'arc': {'arc': "181 (x,y) coords",},}
+            }
+        computed = eval(repr(a.dimensions))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+def test_Spring(tmpdir):
+    with tmpdir.as_cwd():
+        L = 5.0
+        W = 2.0
+
+        drawing_tool.set_coordinate_system(
+            xmin=0, xmax=7*W, ymin=-L/2, ymax=1.5*L,
+            axis=True, instruction_file='tmp_Spring.py')
+        drawing_tool.set_linecolor('blue')
+        drawing_tool.set_grid(True)
+
+        xpos = W
+        s1 = Spring((W,0), L, teeth=True)
+        s1_title = Text('Default Spring',
+                        s1.geometric_features()['end'] + point(0,L/10))
+        s1.draw()
+        s1_title.draw()
+        #s1.draw_dimensions()
+        xpos += 3*W
+        s2 = Spring(start=(xpos,0), length=L, width=W/2.,
+                    bar_length=L/6., teeth=False)
+        s2.draw()
+        s2.draw_dimensions()
+        drawing_tool.display('Spring')
+        drawing_tool.savefig('tmp_Spring')
+
+        # Check s1 and s1.dimensions
+        expected = {
+            'bar1': {'line': "2 (x,y) coords",},
+            'bar2': {'line': "2 (x,y) coords",},
+            'spiral': "45 (x,y) coords",}
+        computed = eval(repr(s1))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+        expected = {
+            'bar_length1': {'text': "Text_wArrow at (-1.5,1.75)",
+                            'arrow': {'arrow': {
+                                'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'bar_length2': {'text': "Text_wArrow at (-1.5,5.5)",
+                            'arrow': {'arrow': {
+                                'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'width': {'text': "Text at (2,-1.51667)",
+                      'arrow': {'arrow': {
+                          'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'start': 'annotation "start" at (1.25,-0.75) with arrow to (2,0)',
+            'length': {'text': "Text at (3.73333,2.5)",
+                       'arrow': {'arrow': {
+                           'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'num_windings': 'annotation "num_windings" at (3,5.5) with arrow to (2.6,2.5)'
+            }
+        computed = eval(repr(s1.dimensions))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+
+def test_Dashpot(tmpdir):
+    with tmpdir.as_cwd():
+        L = 5.0
+        W = 2.0
+        xpos = 0
+
+        drawing_tool.set_coordinate_system(
+            xmin=xpos, xmax=xpos+5.5*W, ymin=-L/2, ymax=1.5*L,
+            axis=True, instruction_file='tmp_Dashpot.py')
+        drawing_tool.set_linecolor('blue')
+        drawing_tool.set_grid(True)
+
+        # Default (simple) dashpot
+        xpos = 1.5
+        d1 = Dashpot(start=(xpos,0), total_length=L)
+        d1_title = Text('Dashpot (default)',
+                        d1.geometric_features()['end'] + point(0,L/10))
+        d1.draw()
+        d1_title.draw()
+
+        # Dashpot for animation with fixed bar_length, dashpot_length and
+        # prescribed piston_pos
+        xpos += 2.5*W
+        d2 = Dashpot(start=(xpos,0), total_length=1.2*L, width=W/2,
+                     bar_length=W, dashpot_length=L/2, piston_pos=2*W)
+        d2.draw()
+        d2.draw_dimensions()
+
+        drawing_tool.display('Dashpot')
+        drawing_tool.savefig('tmp_Dashpot')
+
+        expected = {
+            'line start': {'line': "2 (x,y) coords",},
+            'piston': {
+                'line': {'line': "2 (x,y) coords",},
+                'rectangle': {
+                    'rectangle': "5 (x,y) coords fillcolor='' fillpattern='X'",},},
+            'pot': "4 (x,y) coords",
+            }
+        computed = eval(repr(d2))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+        expected = {
+            'width': {'text': "Text at (6.5,-1.56667)",
+                      'arrow': {'arrow': {
+                          'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'start': 'annotation "start" at (5.75,-0.75) with arrow to (6.5,0)',
+            'bar_length': {'text': "Text_wArrow at (3.5,1.5)",
                            'arrow': {'arrow': {
                                'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
-        'piston_pos': {'text': "Text_wArrow at (3.5,3.6875)",
-                       'arrow': {'arrow': {
-                           'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},}
-        }
-    computed = eval(repr(d2.dimensions))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
-
-def test_Wavy():
-    drawing_tool.set_coordinate_system(xmin=0, xmax=1.5,
-                                       ymin=-0.5, ymax=5,
-                                       axis=True,
-                                       instruction_file='tmp_Wavy.py')
-    w = Wavy(main_curve=lambda x: 1 + sin(2*x),
-             interval=[0,1.5],
-             wavelength_of_perturbations=0.3,
-             amplitude_of_perturbations=0.1,
-             smoothness=0.05)
-    w.draw()
-    drawing_tool.display('Wavy')
-    drawing_tool.savefig('tmp_Wavy')
-
-    expected = {'wavy': "2001 (x,y) coords",}
-    computed = eval(repr(w))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
-
-def test_beam():
-    L = 8.0
-    a = 3*L/4
-    b = L - a
-    H = 1.0
-    xpos = 0.0
-    ypos = 3.0
-
-    drawing_tool.set_coordinate_system(
-        xmin=-3, xmax=xpos+1.5*L,
-        ymin=0, ymax=ypos+5*H,
-        axis=False)
-    drawing_tool.set_linecolor('blue')
-    #drawing_tool.set_grid(True)
-    drawing_tool.set_fontsize(16)
-
-    A = point(xpos,ypos)
-
-    beam = Rectangle(A, L, H)
-
-    h = L/16  # size of support, clamped wall etc
-
-    clamped = Rectangle(A - point(h,0) - point(0,2*h), h,
-                        6*h).set_filled_curves(pattern='/')
-
-    load = ConstantBeamLoad(A + point(0,H), L, H)
-    load.set_linewidth(1).set_linecolor('black')
-    load_text = Text('$w$',
-                     load.geometric_features()['mid_top'] +
-                     point(0,h/2.))
-
-    B = A + point(a, 0)
-    C = B + point(b, 0)
-
-    support = SimplySupportedBeam(B, h)  # pt B is simply supported
-
-
-    R1 = Force(A-point(0,2*H), A, '$R_1$', text_spacing=1./50)
-    R1.set_linewidth(3).set_linecolor('black')
-    R2 = Force(B-point(0,2*H),
-               support.geometric_features()['mid_support'],
-               '$R_2$', text_spacing=1./50)
-    R2.set_linewidth(3).set_linecolor('black')
-    M1 = Moment('$M_1$', center=A + point(-H, H/2), radius=H/2,
-                left=True, text_spacing=1/30.)
-    M1.set_linecolor('black')
-
-    ab_level = point(0, 3*h)
-    a_dim = Distance_wText(A - ab_level, B - ab_level, '$a$')
-    b_dim = Distance_wText(B - ab_level, C - ab_level, '$b$')
-    dims = Composition({'a': a_dim, 'b': b_dim})
-    symbols = Composition(
-        {'R1': R1, 'R2': R2, 'M1': M1,
-         'w': load, 'w text': load_text,
-         'A': Text('$A$', A+point(0.7*h,-0.9*h)),
-         'B': Text('$B$',
-                   support.geometric_features()['mid_support']-
-                   point(1.25*h,0)),
-         'C': Text('$C$', C+point(h/2,-h/2))})
-
-    x_axis = Axis(A + point(L+h, H/2), 2*H, '$x$',).\
-             set_linecolor('black')
-    y_axis = Axis(A + point(0,H/2), 3.5*H, '$y$',
-                  label_alignment='left',
-                  rotation_angle=90).set_linecolor('black')
-    axes = Composition({'x axis': x_axis, 'y axis': y_axis})
-
-    annotations = Composition({'dims': dims, 'symbols': symbols,
-                               'axes': axes})
-    beam = Composition({'beam': beam, 'support': support,
-                        'clamped end': clamped, 'load': load})
-
-    def deflection(x, a, b, w):
-        import numpy as np
-        R1 = 5./8*w*a - 3*w*b**2/(4*a)
-        R2 = 3./8*w*a + w*b + 3*w*b**2/(4*a)
-        M1 = R1*a/3 - w*a**2/12
-        y = -(M1/2.)*x**2 + 1./6*R1*x**3 - w/24.*x**4 + \
-            1./6*R2*np.where(x > a, 1, 0)*(x-a)**3
-        return y
-
-    x = linspace(0, L, 101)
-    y = deflection(x, a, b, w=1.0)
-    y /= abs(y.max() - y.min())
-    y += ypos + H/2
-
-    elastic_line = Curve(x, y).\
-                   set_linecolor('red').\
-                   set_linestyle('dashed').\
-                   set_linewidth(3)
-
-    beam.draw()
-    drawing_tool.display()
-
-    import time
-    time.sleep(1.5)
-
-    annotations.draw()
-    drawing_tool.display()
-    time.sleep(1.5)
-
-    elastic_line.draw()
-    drawing_tool.display()
-    #beam.draw_dimensions()
-    drawing_tool.savefig('tmp_beam')
-
-    all = Composition({'beam': beam, 'text': annotations,
-                       'deflection': elastic_line})
-    expected = {
-        'beam': {
-            'load': {
-                u'box': {
-                    u'rectangle': "5 (x,y) coords linecolor=u'k' linewidth=1",},
-                u'arrow9': {u'arrow': {
-                    u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                u'arrow8': {u'arrow': {
-                    u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                u'arrow7': {u'arrow': {
-                    u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                u'arrow6': {u'arrow': {
-                    u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                u'arrow5': {u'arrow': {
-                    u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                u'arrow4': {u'arrow': {
-                    u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                u'arrow3': {u'arrow': {
-                    u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                u'arrow2': {u'arrow': {
-                    u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                u'arrow1': {u'arrow': {
-                    u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                u'arrow0': {u'arrow': {
-                    u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},},
+            'total_length': {'text': "Text_wArrow at (8.75,5)",
+                             'arrow': {'arrow': {
+                                 'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'dashpot_length': {'text': "Text_wArrow at (7,-0.5)",
+                               'arrow': {'arrow': {
+                                   'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},},
+            'piston_pos': {'text': "Text_wArrow at (3.5,3.6875)",
+                           'arrow': {'arrow': {
+                               'line': "2 (x,y) coords linecolor='k' linewidth=1 arrow='<->'",},},}
+            }
+        computed = eval(repr(d2.dimensions))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+def test_Wavy(tmpdir):
+    with tmpdir.as_cwd():
+        drawing_tool.set_coordinate_system(xmin=0, xmax=1.5,
+                                           ymin=-0.5, ymax=5,
+                                           axis=True,
+                                           instruction_file='tmp_Wavy.py')
+        w = Wavy(main_curve=lambda x: 1 + sin(2*x),
+                 interval=[0,1.5],
+                 wavelength_of_perturbations=0.3,
+                 amplitude_of_perturbations=0.1,
+                 smoothness=0.05)
+        w.draw()
+        drawing_tool.display('Wavy')
+        drawing_tool.savefig('tmp_Wavy')
+
+        expected = {'wavy': "2001 (x,y) coords",}
+        computed = eval(repr(w))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+def test_beam(tmpdir):
+    with tmpdir.as_cwd():
+        L = 8.0
+        a = 3*L/4
+        b = L - a
+        H = 1.0
+        xpos = 0.0
+        ypos = 3.0
+
+        drawing_tool.set_coordinate_system(
+            xmin=-3, xmax=xpos+1.5*L,
+            ymin=0, ymax=ypos+5*H,
+            axis=False)
+        drawing_tool.set_linecolor('blue')
+        #drawing_tool.set_grid(True)
+        drawing_tool.set_fontsize(16)
+
+        A = point(xpos,ypos)
+
+        beam = Rectangle(A, L, H)
+
+        h = L/16  # size of support, clamped wall etc
+
+        clamped = Rectangle(A - point(h,0) - point(0,2*h), h,
+                            6*h).set_filled_curves(pattern='/')
+
+        load = ConstantBeamLoad(A + point(0,H), L, H)
+        load.set_linewidth(1).set_linecolor('black')
+        load_text = Text('$w$',
+                         load.geometric_features()['mid_top'] +
+                         point(0,h/2.))
+
+        B = A + point(a, 0)
+        C = B + point(b, 0)
+
+        support = SimplySupportedBeam(B, h)  # pt B is simply supported
+
+
+        R1 = Force(A-point(0,2*H), A, '$R_1$', text_spacing=1./50)
+        R1.set_linewidth(3).set_linecolor('black')
+        R2 = Force(B-point(0,2*H),
+                   support.geometric_features()['mid_support'],
+                   '$R_2$', text_spacing=1./50)
+        R2.set_linewidth(3).set_linecolor('black')
+        M1 = Moment('$M_1$', center=A + point(-H, H/2), radius=H/2,
+                    left=True, text_spacing=1/30.)
+        M1.set_linecolor('black')
+
+        ab_level = point(0, 3*h)
+        a_dim = Distance_wText(A - ab_level, B - ab_level, '$a$')
+        b_dim = Distance_wText(B - ab_level, C - ab_level, '$b$')
+        dims = Composition({'a': a_dim, 'b': b_dim})
+        symbols = Composition(
+            {'R1': R1, 'R2': R2, 'M1': M1,
+             'w': load, 'w text': load_text,
+             'A': Text('$A$', A+point(0.7*h,-0.9*h)),
+             'B': Text('$B$',
+                       support.geometric_features()['mid_support']-
+                       point(1.25*h,0)),
+             'C': Text('$C$', C+point(h/2,-h/2))})
+
+        x_axis = Axis(A + point(L+h, H/2), 2*H, '$x$',).\
+                 set_linecolor('black')
+        y_axis = Axis(A + point(0,H/2), 3.5*H, '$y$',
+                      label_alignment='left',
+                      rotation_angle=90).set_linecolor('black')
+        axes = Composition({'x axis': x_axis, 'y axis': y_axis})
+
+        annotations = Composition({'dims': dims, 'symbols': symbols,
+                                   'axes': axes})
+        beam = Composition({'beam': beam, 'support': support,
+                            'clamped end': clamped, 'load': load})
+
+        def deflection(x, a, b, w):
+            import numpy as np
+            R1 = 5./8*w*a - 3*w*b**2/(4*a)
+            R2 = 3./8*w*a + w*b + 3*w*b**2/(4*a)
+            M1 = R1*a/3 - w*a**2/12
+            y = -(M1/2.)*x**2 + 1./6*R1*x**3 - w/24.*x**4 + \
+                1./6*R2*np.where(x > a, 1, 0)*(x-a)**3
+            return y
+
+        x = linspace(0, L, 101)
+        y = deflection(x, a, b, w=1.0)
+        y /= abs(y.max() - y.min())
+        y += ypos + H/2
+
+        elastic_line = Curve(x, y).\
+                       set_linecolor('red').\
+                       set_linestyle('dashed').\
+                       set_linewidth(3)
+
+        beam.draw()
+        drawing_tool.display()
+
+        import time
+        time.sleep(1.5)
+
+        annotations.draw()
+        drawing_tool.display()
+        time.sleep(1.5)
+
+        elastic_line.draw()
+        drawing_tool.display()
+        #beam.draw_dimensions()
+        drawing_tool.savefig('tmp_beam')
+
+        all = Composition({'beam': beam, 'text': annotations,
+                           'deflection': elastic_line})
+        expected = {
             'beam': {
-                u'rectangle': "5 (x,y) coords",},
-            'support': {
-                u'triangle': {u'triangle': "4 (x,y) coords",},
-                u'rectangle': {u'rectangle': "5 (x,y) coords fillcolor=u'' fillpattern=u'/'",},},
-            'clamped end': {
-                u'rectangle': "5 (x,y) coords fillcolor=u'' fillpattern='/'",},},
-        'deflection': "101 (x,y) coords linecolor='red' linewidth=3 linestyle='dashed'",
-        'text': {
-            'symbols': {
-                'A': "Text at (0.35,2.55)",
-                'w': {u'box': {u'rectangle': "5 (x,y) coords linecolor=u'k' linewidth=1",},
-                      u'arrow9': {u'arrow': {
-                          u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                      u'arrow8': {u'arrow': {
-                          u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                      u'arrow7': {u'arrow': {
-                          u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                      u'arrow6': {u'arrow': {
-                          u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                      u'arrow5': {u'arrow': {
-                          u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                      u'arrow4': {u'arrow': {
-                          u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                      u'arrow3': {u'arrow': {
-                          u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                      u'arrow2': {u'arrow': {
-                          u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                      u'arrow1': {u'arrow': {
-                          u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
-                      u'arrow0': {u'arrow': {
-                          u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},},
-                'C': "Text at (8.25,2.75)",
-                'B': "Text at (5.375,2.275)",
-                'M1': {
-                    u'text': "Text at (-2,3.5)",
-                    u'arc': {u'arc': "181 (x,y) coords linecolor=u'k' arrow=u'->'",},},
-                'R1': {
-                    u'text': "Text at (0,0.49)",
-                    u'arrow': {u'line': "2 (x,y) coords linecolor=u'k' linewidth=3 arrow=u'->'",},},
-                'R2': {
-                    u'text': "Text at (6,0.49)",
-                    u'arrow': {u'line': "2 (x,y) coords linecolor=u'k' linewidth=3 arrow=u'->'",},},
-                'w text': "Text at (4,5.25)",},
-            'dims': {
-                'a': {
-                    u'text': "Text at (3,1.75)",
-                    u'arrow': {u'arrow': {
-                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'<->'",},},},
-                'b': {
-                    u'text': "Text at (7,1.75)",
-                    u'arrow': {u'arrow': {
-                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'<->'",},},},},
-            'axes': {'x axis': {
-                u'arrow': {u'head left': {u'line': "2 (x,y) coords linecolor=u'k' linestyle=u'solid'",}, u'line': {u'line': "2 (x,y) coords linecolor=u'k'",}, u'head right': {u'line': "2 (x,y) coords linecolor=u'k' linestyle=u'solid'",},}, u'label': "Text at (10.8333,3.5)",},
-                     'y axis': {
-                u'arrow': {u'head left': {u'line': "2 (x,y) coords linecolor=u'k' linestyle=u'solid'",}, u'line': {u'line': "2 (x,y) coords linecolor=u'k'",}, u'head right': {u'line': "2 (x,y) coords linecolor=u'k' linestyle=u'solid'",},}, u'label': "Text at (2.34724e-16,7.33333)",},
-                     },
-            },
-        }
-    computed = eval(repr(all))
-    msg = 'expected=%s, computed=%s' % (expected, computed)
-    assert equal_dict(computed, expected), msg
+                'load': {
+                    u'box': {
+                        u'rectangle': "5 (x,y) coords linecolor=u'k' linewidth=1",},
+                    u'arrow9': {u'arrow': {
+                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                    u'arrow8': {u'arrow': {
+                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                    u'arrow7': {u'arrow': {
+                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                    u'arrow6': {u'arrow': {
+                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                    u'arrow5': {u'arrow': {
+                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                    u'arrow4': {u'arrow': {
+                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                    u'arrow3': {u'arrow': {
+                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                    u'arrow2': {u'arrow': {
+                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                    u'arrow1': {u'arrow': {
+                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                    u'arrow0': {u'arrow': {
+                        u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},},
+                'beam': {
+                    u'rectangle': "5 (x,y) coords",},
+                'support': {
+                    u'triangle': {u'triangle': "4 (x,y) coords",},
+                    u'rectangle': {u'rectangle': "5 (x,y) coords fillcolor=u'' fillpattern=u'/'",},},
+                'clamped end': {
+                    u'rectangle': "5 (x,y) coords fillcolor=u'' fillpattern='/'",},},
+            'deflection': "101 (x,y) coords linecolor='red' linewidth=3 linestyle='dashed'",
+            'text': {
+                'symbols': {
+                    'A': "Text at (0.35,2.55)",
+                    'w': {u'box': {u'rectangle': "5 (x,y) coords linecolor=u'k' linewidth=1",},
+                          u'arrow9': {u'arrow': {
+                              u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                          u'arrow8': {u'arrow': {
+                              u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                          u'arrow7': {u'arrow': {
+                              u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                          u'arrow6': {u'arrow': {
+                              u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                          u'arrow5': {u'arrow': {
+                              u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                          u'arrow4': {u'arrow': {
+                              u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                          u'arrow3': {u'arrow': {
+                              u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                          u'arrow2': {u'arrow': {
+                              u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                          u'arrow1': {u'arrow': {
+                              u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},
+                          u'arrow0': {u'arrow': {
+                              u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'->'",},},},
+                    'C': "Text at (8.25,2.75)",
+                    'B': "Text at (5.375,2.275)",
+                    'M1': {
+                        u'text': "Text at (-2,3.5)",
+                        u'arc': {u'arc': "181 (x,y) coords linecolor=u'k' arrow=u'->'",},},
+                    'R1': {
+                        u'text': "Text at (0,0.49)",
+                        u'arrow': {u'line': "2 (x,y) coords linecolor=u'k' linewidth=3 arrow=u'->'",},},
+                    'R2': {
+                        u'text': "Text at (6,0.49)",
+                        u'arrow': {u'line': "2 (x,y) coords linecolor=u'k' linewidth=3 arrow=u'->'",},},
+                    'w text': "Text at (4,5.25)",},
+                'dims': {
+                    'a': {
+                        u'text': "Text at (3,1.75)",
+                        u'arrow': {u'arrow': {
+                            u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'<->'",},},},
+                    'b': {
+                        u'text': "Text at (7,1.75)",
+                        u'arrow': {u'arrow': {
+                            u'line': "2 (x,y) coords linecolor=u'k' linewidth=1 arrow=u'<->'",},},},},
+                'axes': {'x axis': {
+                    u'arrow': {u'head left': {u'line': "2 (x,y) coords linecolor=u'k' linestyle=u'solid'",}, u'line': {u'line': "2 (x,y) coords linecolor=u'k'",}, u'head right': {u'line': "2 (x,y) coords linecolor=u'k' linestyle=u'solid'",},}, u'label': "Text at (10.8333,3.5)",},
+                         'y axis': {
+                    u'arrow': {u'head left': {u'line': "2 (x,y) coords linecolor=u'k' linestyle=u'solid'",}, u'line': {u'line': "2 (x,y) coords linecolor=u'k'",}, u'head right': {u'line': "2 (x,y) coords linecolor=u'k' linestyle=u'solid'",},}, u'label': "Text at (2.34724e-16,7.33333)",},
+                         },
+                },
+            }
+        computed = eval(repr(all))
+        msg = 'expected=%s, computed=%s' % (expected, computed)
+        assert equal_dict(computed, expected), msg
+
+def test_batch_curves():
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    drawing_tool.batch_curves = True
+    load = ConstantBeamLoad((1,1), 8, 2, num_arrows=10)
+    load.draw()
+    drawing_tool.display()
+    drawing_tool.batch_curves = False
+    # All lines in one LineCollection, all arrow heads in one PolyCollection
+    ax = drawing_tool.ax
+    assert len(ax.lines) == 0 and len(ax.patches) == 0
+    assert len(ax.collections) == 2
+
+def test_animate_reuse_artists():
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    fig = Composition({'wheel': Circle((2,2), 1),
+                       'force': Force((5,1), (5,3), '$F$')})
+    artists = []
+
+    def move(t, fig):
+        fig['wheel'].translate((1, 0))
+        artists.append(list(drawing_tool.ax.lines))
+
+    animate(fig, [0, 1, 2], move, reuse_artists=True)
+    # The same Line2D objects are updated in all frames (after the first)
+    assert artists[1] == artists[2] == list(drawing_tool.ax.lines)
+    wheel_x = fig['wheel']['arc'].x
+    assert any((line.get_xdata() == wheel_x).all()
+               for line in drawing_tool.ax.lines)
+
+def test_animate_parallel(tmpdir):
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    fig = Composition({})
+
+    def wheel_at(t, fig):
+        fig['wheel'] = Circle((1 + 8*t, 2), 1)
+
+    with tmpdir.as_cwd():
+        framefiles = animate(fig, [0, 0.5, 1], wheel_at, moviefiles=True,
+                             parallel=2)
+        for n in range(3):
+            assert os.path.isfile(framefiles % n)
+
+def test_pack():
+    drawing_tool.set_coordinate_system(xmin=0, xmax=20, ymin=-5, ymax=10)
+
+    def sketch():
+        return Composition({
+            'wheel': Circle(center=(5, 5), radius=2),
+            'box': Rectangle(lower_left_corner=(1, 1), width=3, height=2),
+            'spring': Composition({
+                'spring': Spring(start=(10, 1), length=4),
+                'label': Text('k', (12, 2))}),
+            })
+
+    fig1 = sketch()
+    fig2 = sketch()
+    packed = fig2.pack()
+    assert packed.xy.shape == (packed.offsets[-1], 2)
+    for fig in fig1, fig2:
+        fig.rotate(30, (2, 3))
+        fig['spring'].translate((1, 2))
+        fig['wheel'].scale(0.5)
+    minmax1 = fig1.minmax_coordinates()
+    minmax2 = fig2.minmax_coordinates()
+    for key in minmax1:
+        assert abs(minmax1[key] - minmax2[key]) < 1E-12
+    diff = fig1['box']['rectangle'].x - fig2['box']['rectangle'].x
+    assert abs(diff).max() < 1E-12
+    assert abs(fig1['spring']['label'].x - fig2['spring']['label'].x) < 1E-12
+
+    fig2['wheel'].set_linecolor('blue')
+    assert len(packed.styles) == 2
+    fig2['wheel'] = Circle(center=(5, 5), radius=1)
+    assert not packed.valid
+    fig2.translate((1, 0))  # works as without packing
+
+def test_transform_packed_curve():
+    """A pending lazy transformation applied to a packed curve."""
+    import numpy as np
+    curve = Curve([1., 2.], [0., 0.])
+    fig = Composition(dict(curve=curve))
+    fig.set_lazy_transforms()
+    fig.rotate(90, (0, 0))
+    curve.pack()  # the curve is no longer lazy
+    fig['curve']  # passes the rotation on to the curve
+    assert np.allclose(curve.x, [0, 0])
+    assert np.allclose(curve.y, [1, 2])
+
+def test_lazy_transforms():
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    fig1 = Composition({'wheel': Circle(center=(5, 5), radius=2),
+                        'box': Rectangle((1, 1), 3, 2)})
+    fig2 = fig1.copy().set_lazy_transforms()
+    for fig in fig1, fig2:
+        for i in range(100):
+            fig.rotate(3.6, (2, 3))
+            fig['box'].translate((0.01, 0))
+        fig.scale(0.5)
+    # No coordinates are computed before they are needed
+    assert fig2._matrix is not None
+    minmax1 = fig1.minmax_coordinates()
+    minmax2 = fig2.minmax_coordinates()
+    for key in minmax1:
+        assert abs(minmax1[key] - minmax2[key]) < 1E-12
+    assert fig2._matrix is None
+    diff = fig1['box']['rectangle'].y - fig2['box']['rectangle'].y
+    assert abs(diff).max() < 1E-12
+    fig2.set_lazy_transforms(False)
+    fig2['box'].translate((1, 0))  # modifies the arrays again
+
+def test_deform():
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    fig = Composition({'wheel': Circle(center=(5, 5), radius=2),
+                       'box': Rectangle((1, 1), 3, 2),
+                       'label': Text('box', (2, 2))})
+    x0 = fig['wheel']['arc'].x.copy()
+    y0 = fig['wheel']['arc'].y.copy()
+
+    def bump(x, y):
+        # works with one point at a time only
+        return (x + 1, y) if x > 5 else (x, y)
+
+    def wave(x, y):
+        return x, y + 0.1*sin(x)
+
+    fig.deform(bump)
+    fig.deform(wave, vectorized=True)
+    x = fig['wheel']['arc'].x
+    y = fig['wheel']['arc'].y
+    for i in range(len(x0)):
+        x_i, y_i = wave(*bump(x0[i], y0[i]))
+        assert abs(x[i] - x_i) < 1E-14 and abs(y[i] - y_i) < 1E-14
+    assert fig['label'].x == 2 and abs(fig['label'].y - (2 + 0.1*sin(2))) < 1E-14
+
+def test_deform_errors():
+    import pytest
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    line = Curve([1, 4], [1, 2])
+    calls = []
+
+    def shift(x, y):
+        calls.append(x)
+        return x + 1, y
+
+    line.deform(shift)
+    assert len(calls) == 1  # a vectorized function is called once
+    assert list(line.x) == [2, 5]
+
+    def broken(x, y):
+        return x + undefined_name, y
+
+    with pytest.raises(NameError):
+        line.deform(broken)  # other errors are not hidden
+
+    def wrong_length(x, y):
+        return x[:1], y
+
+    with pytest.raises(ValueError):
+        line.deform(wrong_length)
+
+    def wave(x, y):
+        return x, y + 0.1*sin(x[x > 0])  # works with arrays only
+
+    point = Text('p', (2, 2))
+    point.deform(wave, vectorized=True)
+    assert point.x == 2 and abs(point.y - (2 + 0.1*sin(2))) < 1E-14
+
+def test_bbox_cache():
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    box = Rectangle((1, 1), 3, 2)
+    fig = Composition({'box': box, 'line': Line((5, 5), (6, 8))})
+    assert fig.bbox() == (1, 6, 1, 8)
+    assert fig._cached_bbox() == (1, 6, 1, 8)
+    fig.translate((1, 0))  # box is updated, not computed
+    assert fig._cached_bbox() == (2, 7, 1, 8)
+    box.scale(2)  # changes in sub shapes remove the cached box
+    assert fig._cached_bbox() is None
+    assert fig.bbox() == (4, 10, 2, 8)
+    fig['line'] = Line((0, 0), (1, 1))
+    assert fig.minmax_coordinates() == \
+           {'xmin': 0, 'xmax': 10, 'ymin': 0, 'ymax': 6}
+    fig.pack()
+    fig.rotate(90, (0, 0))
+    xmin, xmax, ymin, ymax = fig.bbox()
+    assert abs(xmin + 6) < 1E-12 and abs(xmax) < 1E-12
+    assert abs(ymin) < 1E-12 and abs(ymax - 10) < 1E-12
+    box['rectangle'].x = box['rectangle'].x + 1  # packed curve
+    assert abs(fig.bbox()[0] + 5) < 1E-12
+
+def test_text_cache(tmpdir):
+    from pysketcher.cache import DiskCache
+    from pysketcher.MatplotlibDraw import MatplotlibDraw, _text_path
+    cache = DiskCache(str(tmpdir))
+    tool = MatplotlibDraw(backend='offscreen')
+    tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    tool.ax  # imports matplotlib
+    v1, c1 = _text_path('$x^2$', 18, None, 'center', cache, usetex=False)
+    assert (cache.hits, cache.misses) == (0, 1)
+    cache = DiskCache(str(tmpdir))  # as in another process
+    v2, c2 = _text_path('$x^2$', 18, None, 'center', cache, usetex=False)
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert (v1 == v2).all() and (c1 == c2).all()
+    assert abs(v1[:,0].min() + v1[:,0].max()) < 1E-12  # centered
+
+    # The cache is used only if asked for and LaTeX is installed
+    assert tool.text_cache is None
+    import sys
+    module = sys.modules['pysketcher.MatplotlibDraw']
+    latex = module._latex
+    module._latex = False
+    try:
+        tool = MatplotlibDraw(backend='offscreen', text_cache=cache)
+        tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+        tool.text('$x^2$', (5, 2))
+        assert len(tool.ax.texts) == 1 and not tool.ax.patches
+    finally:
+        module._latex = latex
+
+    cache = DiskCache(str(tmpdir.join('lru')))
+    cache.put(('a',), {'x': zeros(1000)})
+    cache.put(('b',), {'x': zeros(1000)})
+    os.utime(cache._filename(('b',)), (0, 0))  # least recently used
+    cache.maxsize = cache.stats()['size']
+    cache.put(('c',), {'x': zeros(1000)})
+    assert cache.get(('b',)) is None and cache.get(('a',)) is not None
+    assert cache.stats()['entries'] == 2 and cache.evictions == 1
+
+def test_adaptive_resolution():
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    assert len(Circle((5, 5), 0.1)['arc'].x) == 181
+    drawing_tool.chord_tolerance = 0.5  # pixels
+    try:
+        tol = drawing_tool.tolerance()
+        assert abs(tol - 0.5*10/800.) < 1E-15
+        for R in 0.1, 1, 4:
+            x = Circle((5, 5), R)['arc'].x
+            n = len(x) - 1  # no of segments
+            assert R*(1 - cos(pi/n)) <= tol  # max distance circle-chord
+            assert R*(1 - cos(pi/(n - 1))) > tol or n == 4
+        assert len(Circle((5, 5), 0.1)['arc'].x) < 20
+        assert len(Circle((5, 5), 4, resolution=180)['arc'].x) == 181
+        assert len(Spring((5, 0), 1)['spiral'].x) < \
+               len(Spring((5, 0), 5)['spiral'].x)
+    finally:
+        drawing_tool.chord_tolerance = None
+
+def test_StochasticWavyCurve():
+    import numpy as np
+    curve1 = StochasticWavyCurve(curve_no=1, percentage=50)
+    curve2 = StochasticWavyCurve(curve_no=1)
+    x1 = curve1.shapes['wavy'].x
+    x2 = curve2.shapes['wavy'].x
+    assert len(x2) == 825 and len(x1) == 412
+    assert np.shares_memory(x1, x2)  # both are views of the same data
+    assert abs(x2[1] - 0.0606) < 1E-15 and abs(x2[-1] - 49.9394) < 1E-15
+    curve1.shapes['wavy'].translate((1, 0))  # keeps the shared data
+    assert abs(curve1.shapes['wavy'].x[1] - 1.0606) < 1E-15
+    assert abs(curve2.shapes['wavy'].x[1] - 0.0606) < 1E-15
+
+def test_instruction_file(tmpdir):
+    import numpy as np
+    from pysketcher.MatplotlibDraw import MatplotlibDraw
+    filename = str(tmpdir.join('tmp_replay.py'))
+    tool = MatplotlibDraw(backend='offscreen')
+    tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5,
+                               instruction_file=filename)
+    x = np.linspace(0, 10, 1001)
+    tool.plot_curve(x, 2 + sin(x), name='wave')
+    tool.plot_curve([1, 2, 2, 1], [1, 1, 2, 1])
+    tool.instruction_file.close()
+    assert os.path.getsize(filename) < 2000  # no coordinates in the code
+    assert os.path.isfile(str(tmpdir.join('tmp_replay.npz')))
+    with open(filename) as f:
+        assert "matplotlib.use('Agg')" in f.read()  # the backend in use
+
+    # Replay
+    import matplotlib.pyplot as plt
+    plt.close('all')
+    namespace = {'__file__': filename}
+    with open(filename) as f:
+        exec(f.read(), namespace)
+    lines = namespace['ax'].lines
+    assert len(lines) == 2
+    assert (lines[0].get_xdata() == x).all()
+    assert (lines[1].get_ydata() == [1, 1, 2, 1]).all()
+
+def test_savefig_crop(tmpdir):
+    from matplotlib.image import imread
+    from pysketcher.MatplotlibDraw import MatplotlibDraw, _trim
+    tool = MatplotlibDraw(backend='offscreen')
+    tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    tool.plot_curve([2, 4, 4, 2], [1, 1, 3, 1])
+    full = str(tmpdir.join('full.png'))
+    cropped = str(tmpdir.join('cropped.png'))
+    tool.savefig(full, crop=False)
+    tool.savefig(cropped, dpi=100)
+    image = imread(full)
+    assert image.shape[:2] == (400, 800)
+    rows, columns = _trim(image)
+    assert imread(cropped).shape == image[rows,columns].shape
+    assert (imread(cropped) == image[rows,columns]).all()
+    assert imread(cropped).shape[0] < 200
+
+def test_savefig_formats(tmpdir):
+    from matplotlib.image import imread
+    from pysketcher.MatplotlibDraw import MatplotlibDraw
+    tool = MatplotlibDraw(backend='offscreen')
+    tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    tool.plot_curve([2, 4, 4, 2], [1, 1, 3, 1])
+    stem = str(tmpdir.join('fig'))
+    tool.savefig(stem, formats=('png', 'pdf', 'svg'))
+    single = str(tmpdir.join('single.png'))
+    tool.savefig(single)
+    assert (imread(stem + '.png') == imread(single)).all()
+    with open(stem + '.svg') as f:
+        svg = f.read()
+    # The crop box of the PNG image (in pt) is used for the SVG file
+    height, width = imread(single).shape[:2]
+    assert 'width="%gpt"' % ((width + 2)*0.72) in svg
+    assert os.path.getsize(stem + '.pdf') > 0
+
+def test_SVGDraw(tmpdir):
+    import numpy as np
+    from pysketcher.SVGDraw import SVGDraw
+    import pysketcher.shapes
+    previous = pysketcher.shapes.drawing_tool._tool
+    tool = use_drawing_tool('svg', precision=1)
+    try:
+        assert isinstance(tool, SVGDraw)
+        drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+        r = Rectangle((2, 1), 2, 2)
+        r.set_filled_curves('blue', pattern='/')
+        r.set_shadow(2)
+        r.draw()
+        Arrow1((5, 1), (8, 1)).draw()
+        Text('$x$', (6, 3)).draw()
+        tool.plot_curve([], [])  # empty curves are skipped
+        tool.plot_curves([np.zeros((0, 2)), np.array([[1., 4], [2, 4]])])
+        tool.plot_curve([1, 2], [4.5, 4.5], name='a -- <b>')
+        filename = str(tmpdir.join('fig'))
+        drawing_tool.savefig(filename)
+    finally:
+        use_drawing_tool(previous)
+    with open(filename + '.svg') as f:
+        svg = f.read()
+    # Pixels: 80 per unit, y axis pointing down
+    assert '<path d="M160.0,320.0L320.0,320.0 320.0,160.0 160.0,160.0 ' \
+           '160.0,320.0Z" fill="url(#hatch0)"' in svg
+    assert 'translate(2.77778,2.77778)' in svg   # shadow
+    assert svg.count('<pattern ') == 1
+    assert '>x</text>' in svg
+    assert svg.count('fill="red"') == 1          # arrow head
+    assert 'd="M80.0,80.0L160.0,80.0"' in svg
+    assert 'data-name="a -- &lt;b&gt;"' in svg and '<!--' not in svg
+    import xml.dom.minidom
+    xml.dom.minidom.parseString(svg.encode('utf-8'))
+    try:
+        tool.savefig(filename + '.png')
+        assert False, 'SVGDraw cannot make PNG files'
+    except ValueError:
+        pass
+
+def test_TikZDraw(tmpdir):
+    from pysketcher.TikZDraw import TikZDraw
+    import pysketcher.shapes
+    previous = pysketcher.shapes.drawing_tool._tool
+    tool = use_drawing_tool('tikz', precision=2, width=10)
+    try:
+        assert isinstance(tool, TikZDraw)
+        drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+        drawing_tool.plot_curve([0, 1.004, 1.001, 2.5], [-0.001, 0, 0, 1])
+        r1 = Rectangle((2, 1), 2, 2)
+        r2 = Rectangle((5, 1), 2, 2)
+        r2.set_filled_curves('blue', pattern='/')
+        Composition(dict(r1=r1, r2=r2)).draw()
+        Text('$x$', (6, 3), alignment='left').draw()
+        Text('code', (6, 4), fontsize=10, fontfamily='pcr').draw()
+        filename = str(tmpdir.join('fig'))
+        drawing_tool.savefig(filename)
+    finally:
+        use_drawing_tool(previous)
+    with open(filename + '.tex') as f:
+        tikz = f.read()
+    # Rounded coordinates without trailing zeros or repeated points
+    assert '\\path[s0] (0,0)--(1,0)--(2.5,1);' in tikz
+    # One style for the plain curves
+    assert '\\path[s0] (2,1)--(4,1)--(4,3)--(2,3)--(2,1);' in tikz
+    assert 's0/.style={draw=red,line width=2pt}' in tikz
+    assert 'pattern=north east lines' in tikz
+    assert '--cycle;' in tikz
+    assert '{$x$}' in tikz
+    assert 'font=\\fontfamily{pcr}\\fontsize{10}{12}\\selectfont' in tikz
+    assert tikz.count('/.style=') == 4
+    assert '[x=1cm,y=1cm' in tikz
+
+# Stand-in for gnuplot: logs the commands and the binary inline data
+gnuplot_standin = """
+import sys, re, struct
+stdin = getattr(sys.stdin, 'buffer', sys.stdin)
+stdout = getattr(sys.stdout, 'buffer', sys.stdout)
+log = open(sys.argv[1], 'w')
+for line in iter(stdin.readline, b''):
+    line = line.decode('utf-8').strip()
+    log.write(line + '\\n')
+    if line.startswith('plot '):
+        for n in re.findall(r'record=\\((\\d+)\\)', line):
+            data = struct.unpack('<%dd' % (2*int(n)), stdin.read(16*int(n)))
+            log.write('data %s\\n' % ' '.join('%g' % v for v in data))
+    elif line.startswith('print '):
+        stdout.write(line[7:-1].encode('utf-8') + b'\\n')
+        stdout.flush()
+    elif line == 'quit':
+        break
+"""
+
+def test_GnuplotDraw(tmpdir):
+    import sys
+    from pysketcher.GnuplotDraw import GnuplotDraw
+    import pysketcher.shapes
+    standin = str(tmpdir.join('standin.py'))
+    with open(standin, 'w') as f:
+        f.write(gnuplot_standin)
+    logfile = str(tmpdir.join('log'))
+    previous = pysketcher.shapes.drawing_tool._tool
+    tool = use_drawing_tool('gnuplot', [sys.executable, standin, logfile])
+    try:
+        assert isinstance(tool, GnuplotDraw)
+        drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+        r = Rectangle((2, 1), 2, 2)
+        r.set_filled_curves('blue')
+        Composition(dict(r=r, l=Line((5, 1), (6, 2)),
+                         t=Text('$x$', (6, 3)))).draw()
+        drawing_tool.savefig(str(tmpdir.join('fig.png')))
+        drawing_tool.erase()
+        drawing_tool.plot_curves([array([[0., 0], [1, 1]]),
+                                  array([[2., 2], [3, 3]])])
+        drawing_tool.display()
+        tool.close()
+    finally:
+        use_drawing_tool(previous)
+    with open(logfile) as f:
+        log = f.read().splitlines()
+    plots = [line for line in log if line.startswith('plot ')]
+    # One plot command per figure, with all curves as binary data
+    assert len(plots) == 2
+    assert plots[0].count("'-' binary record=") == 2
+    assert 'filledcurves closed dt 1 lw 1 lc rgb "red" fc rgb "blue" ' \
+           'fs solid border lc rgb "red"' in plots[0]
+    assert 'data 2 1 4 1 4 3 2 3 2 1' in log
+    assert 'data 5 1 6 2' in log
+    assert 'set label "x" at 6,3 center font ",14" front' in log
+    assert 'set output "%s"' % tmpdir.join('fig.png') in log
+    # plot_curves: one data set with a gap between the curves
+    assert 'record=(5)' in plots[1]
+    assert 'data 0 0 1 1 nan nan 2 2 3 3' in log
+    assert log[-1] == 'quit'
+
+def test_NullDraw(tmpdir):
+    from pysketcher.bench import run_example
+    from pysketcher.NullDraw import NullDraw
+    script = tmpdir.join('script.py')
+    script.write("""
+from pysketcher import *
+drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+r = Rectangle((2, 1), 2, 2)
+r.set_filled_curves('blue')
+Composition(dict(r=r, a=Arrow1((5, 1), (8, 1)),
+                 t=Text('x', (6, 3)))).draw()
+drawing_tool.display()
+input('Press Return: ')
+drawing_tool.savefig('script.png')
+""")
+    result = run_example(str(script), repeat=2)
+    assert 'error' not in result
+    assert result['name'] == 'script'
+    for name, expected in [('curves', 2), ('points', 7), ('texts', 1),
+                           ('arrows', 1), ('fills', 1), ('figures', 1),
+                           ('files', 1)]:
+        assert result[name] == expected, name
+    assert result['time'] >= result['figure_time'] > 0
+    assert not tmpdir.join('script.png').check()
+    # The previous drawing tool is restored
+    assert not isinstance(drawing_tool._tool, NullDraw)
+
+def test_shape_classes():
+    """Construct shapes that did not work earlier."""
+    import numpy as np
+    drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    wheel = Wheel((5, 5), 2, nlines=6)
+    assert len(wheel['spokes'].shapes) == 7
+    wall = Wall([[1, 3], [5, 8]], [[2, 3], [2, 4]], 0.5)
+    assert list(wall['wall'].y[:4]) == [2, 3, 2, 4]
+    wall2 = Wall2([1, 3, 5], [2, 2, 2], 0.5)
+    assert np.allclose(wall2['wall'].y, [2, 2, 2, 1.5, 1.5, 1.5])
+    parabola = Parabola((2, 2), (5, 7), (8, 2))
+    p = parabola['parabola']
+    assert np.allclose([p.y[0], p.y[10], p.y[-1]], [2, 7, 2])
+    assert len(SineWave(1, 9, 1, 0.5, 5)['waves'].x) == 488
+    axis = Axis2((2, 2), 6, '$x$')
+    assert np.allclose(axis.geometric_features()['end'], (8, 2))
+
+def test_bench_shapes(tmpdir):
+    from pysketcher.bench import run_shape, shape_cases
+    assert 'Wheel' in shape_cases and 'Point' not in shape_cases
+    result = run_shape('Wheel', repeat=1, directory=str(tmpdir))
+    assert 'error' not in result
+    for phase in ('construct', 'translate', 'rotate', 'draw_null',
+                  'draw_agg', 'savefig'):
+        assert result[phase] > 0
+    assert result['memory'] is None or result['memory'] > 0
+    assert tmpdir.join('Wheel.png').check()
+
+def test_profile():
+    import threading
+    from pysketcher import profiling
+    from pysketcher.NullDraw import NullDraw
+    import pysketcher.shapes
+    previous = pysketcher.shapes.drawing_tool._tool
+    use_drawing_tool(NullDraw())
+    try:
+        drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+        body = Composition(dict(box=Rectangle((2, 2), 4, 2),
+                                wheel=Wheel((3, 2), 0.5, nlines=4)))
+        fig = Composition(dict(body=body, text=Text('x', (5, 8))))
+        drawing_tool.profile()
+        fig.draw()
+        # Other threads are not profiled and cannot stop the profiling
+        seen = []
+        def other():
+            tool = NullDraw()
+            tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+            fig.draw(tool=tool)
+            seen.append(profiling.current_profile())
+            drawing_tool.profile(False)
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join()
+        assert seen == [None]
+        fig.draw()
+        drawing_tool.profile(False)
+        assert profiling.current_profile() is None
+        fig.draw()  # not recorded
+        report = drawing_tool.profile_report(by='path', show=False)
+    finally:
+        use_drawing_tool(previous)
+    paths = dict((row[0], row[1:]) for row in
+                 profiling.last_profile().rows('path'))
+    circle = fig['body']['wheel']['outer']['arc'].x.size
+    assert paths['(root)'][0] == 2
+    assert paths['(root)'][2] == paths["['body']"][2]
+    assert paths["['body']"][0] == 2
+    assert paths["['body']['box']"][2] == 2*5
+    assert paths["['body']['wheel']"][2] == 2*(2*circle + 5*2)
+    assert paths["['body']"][2] == paths["['body']['box']"][2] + \
+           paths["['body']['wheel']"][2]
+    classes = dict((row[0], row[1:]) for row in
+                   profiling.last_profile().rows())
+    assert classes['Line'][0] == 2*5
+    assert classes['Composition'][0] == 2*3   # root, body and in wheel
+    lines = report.splitlines()
+    assert lines[0].split() == ['path', 'calls', 'time', '(ms)', 'points']
+    assert lines[1].split()[0] == '(root)'    # most time
+    assert lines[2].split()[0] == "['body']"
+
+def test_drawing_context():
+    import threading
+    from pysketcher.NullDraw import NullDraw
+    from pysketcher.SVGDraw import SVGDraw
+    default = drawing_tool._tool
+    # draw(tool=...) draws with another tool, just this time
+    tool = NullDraw()
+    tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+    Rectangle((2, 2), 4, 2).draw(tool=tool)
+    assert tool.counts['curves'] == 1
+    assert drawing_tool._tool is default
+
+    # Threads that draw different figures at the same time
+    barrier = threading.Barrier(4) if hasattr(threading, 'Barrier') else None
+    results = {}
+    def render(i):
+        with drawing_context('svg', precision=0) as tool:
+            assert current_drawing_tool() is tool
+            tool.set_coordinate_system(xmin=0, xmax=10*(i+1),
+                                       ymin=0, ymax=10)
+            if barrier is not None:
+                barrier.wait()   # all coordinate systems are set
+            sketch = Composition(dict(
+                wheel=Wheel((5, 5), 2, nlines=i+3),
+                label=Text_wArrow('%d' % i, (1, 9), (5, 5))))
+            sketch.draw()
+            results[i] = tool.svg()
+    threads = [threading.Thread(target=render, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert drawing_tool._tool is default
+    for i in range(4):
+        expected = SVGDraw(precision=0)
+        expected.set_coordinate_system(xmin=0, xmax=10*(i+1),
+                                       ymin=0, ymax=10)
+        Composition(dict(
+            wheel=Wheel((5, 5), 2, nlines=i+3),
+            label=Text_wArrow('%d' % i, (1, 9), (5, 5)))).draw(tool=expected)
+        assert results[i] == expected.svg()
+
+def test_render_many(tmpdir):
+    import functools
+    from pysketcher.batch import render_many, render_scene
+    def build(n):
+        return Composition(dict(
+            spring=Spring((2, 1), 2.5, num_windings=n, width=0.4),
+            label=Text('%d windings' % n, (2, 4.5))))
+    scenes = [(functools.partial(build, n), (0, 4, 0, 6)) for n in range(3, 9)]
+    default = drawing_tool._tool
+    batch = render_many(scenes, 'svg', workers=3, tool='svg')
+    results = list(batch)
+    assert [r['index'] for r in results] == list(range(6))
+    assert [r['name'] for r in results][:2] == ['scene0000', 'scene0001']
+    for (build_scene, coordinates), result in zip(scenes, results):
+        expected = render_scene(build_scene, coordinates, ['svg'], 'svg')
+        assert result['data'] == expected
+        assert result['bytes'] == len(expected['svg'])
+    stats = batch.stats()
+    assert stats['scenes'] == 6 and stats['workers'] == 3
+    assert drawing_tool._tool is default
+
+    # Files, named scenes, Matplotlib figures without pyplot
+    scenes = [(functools.partial(build, n), dict(xmin=0, xmax=4, ymin=0,
+                                                 ymax=6), 'spring%d' % n)
+              for n in (4, 5)]
+    results = render_many(scenes, ('png', 'svg'), workers=2,
+                          directory=str(tmpdir)).results()
+    for result in results:
+        with open(result['files']['png'], 'rb') as f:
+            assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+    assert os.path.basename(results[1]['files']['svg']) == 'spring5.svg'
+
+def test_render_many_processes():
+    import functools, threading
+    import pysketcher.batch
+    from pysketcher.batch import render_many, render_scene
+    if not hasattr(os, 'fork'):
+        return
+    def build(n):
+        return Spring((2, 1), 2.5, num_windings=n, width=0.4)
+    # Two batches at the same time (from two threads) in forked workers
+    batches = dict((n, [(functools.partial(build, n + i), (0, 4, 0, 6))
+                        for i in range(3)]) for n in (3, 10))
+    results = {}
+    def render(n):
+        results[n] = render_many(batches[n], 'svg', workers=2, tool='svg',
+                                 processes=True).results()
+    threads = [threading.Thread(target=render, args=(n,)) for n in batches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert pysketcher.batch._forked_batch is None  # only set in workers
+    for n in batches:
+        for (build_scene, coordinates), result in zip(batches[n], results[n]):
+            expected = render_scene(build_scene, coordinates, ['svg'], 'svg')
+            assert result['data'] == expected
+
+def test_CachedDraw(tmpdir):
+    from pysketcher.CachedDraw import CachedDraw
+    from pysketcher.cache import DiskCache
+    previous = drawing_tool._tool
+    tool = use_drawing_tool('cached', 'svg', DiskCache(str(tmpdir.join('c'))),
+                            precision=1)
+    assert isinstance(tool, CachedDraw)
+    try:
+        def figure(stem, radius=1):
+            drawing_tool.set_coordinate_system(xmin=0, xmax=10,
+                                               ymin=0, ymax=5)
+            drawing_tool.set_linecolor('blue')
+            Composition(dict(wheel=Wheel((3, 2), radius),
+                             label=Text('wheel', (3, 4)))).draw()
+            drawing_tool.display('Title')
+            filename = str(tmpdir.join(stem))
+            drawing_tool.savefig(filename)
+            return open(filename + '.svg').read()
+        first = figure('a')
+        assert (tool.hits, tool.misses) == (0, 1)
+        assert first == figure('b')          # copied from the cache
+        assert (tool.hits, tool.misses) == (1, 1)
+        assert 'Title' in first and 'stroke="blue"' in first
+        assert figure('c', radius=1.5) != first
+        assert (tool.hits, tool.misses) == (1, 2)
+        # Shapes may be moved in-place after they are drawn
+        circle = Circle((5, 2.5), 1)
+        drawing_tool.erase()
+        circle.draw()
+        circle.translate((1, 0))
+        drawing_tool.savefig(str(tmpdir.join('d.svg')))
+        drawing_tool.erase()
+        Circle((5, 2.5), 1).draw()
+        assert drawing_tool.figure_bytes(['svg'])['svg'].decode('utf-8') == \
+               open(str(tmpdir.join('d.svg'))).read()
+        assert (tool.hits, tool.misses) == (1, 4)
+        assert drawing_tool.figure_bytes(['svg']) is not None
+        assert (tool.hits, tool.misses) == (2, 4)
+        # Using the wrapped tool directly turns the cache off
+        assert drawing_tool.precision == 1
+        drawing_tool.savefig(str(tmpdir.join('e.svg')))
+        assert (tool.hits, tool.misses) == (2, 4)
+    finally:
+        use_drawing_tool(previous)
+
+def test_save_load(tmpdir):
+    from pysketcher.SVGDraw import SVGDraw
+    def svg(shape):
+        tool = SVGDraw()
+        tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+        shape.draw(tool=tool)
+        return tool.svg()
+    previous = drawing_tool._tool
+    use_drawing_tool('null')
+    try:
+        drawing_tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=10)
+        wheel = Wheel((3, 3), 1).set_linecolor('blue')
+        fig = Composition(dict(
+            wheel=wheel, spring=Spring((7, 1), 5),
+            label=Text_wArrow('wheel', (3, 8), (3, 4), fontsize=12),
+            volume=ArbitraryVolume((6, 7), 2)))
+        fig.rotate(10, (5, 5))
+        filename = str(tmpdir.join('fig.pysk'))
+        fig.save(filename)
+        expected = svg(fig)
+        for mmap in True, False:
+            loaded = load(filename, mmap=mmap)
+            assert svg(loaded) == expected
+            assert type(loaded['wheel']) is Wheel
+            assert loaded['label'].arrow_tip == fig['label'].arrow_tip
+            assert sorted(loaded['spring'].dimensions) == \
+                   sorted(fig['spring'].dimensions)
+            # The file is not changed by changes of the loaded shape
+            loaded.translate((1, 0))
+            loaded['wheel'].set_linecolor('red')
+            assert svg(loaded) != expected
+        assert svg(load(filename)) == expected
+        # Packing and lazy transformations work on loaded shapes
+        loaded = load(filename)
+        loaded.pack()
+        fig.pack()
+        loaded.translate((1, 0))
+        fig.translate((1, 0))
+        assert svg(loaded) == svg(fig)
+
+        # Only shape classes in pysketcher are made
+        import json, zipfile
+        for module, name in [('os', 'system'),
+                             ('pysketcher.shapes', 'PackedCoordinates'),
+                             ('pysketcher.shapes', 'os')]:
+            with zipfile.ZipFile(filename) as z:
+                members = dict((m, z.read(m)) for m in z.namelist())
+            scene = json.loads(members['scene.json'].decode('utf-8'))
+            scene['classes'][0][:2] = [module, name]
+            members['scene.json'] = json.dumps(scene).encode('utf-8')
+            evil = str(tmpdir.join('evil.pysk'))
+            with zipfile.ZipFile(evil, 'w') as z:
+                for member, data in members.items():
+                    z.writestr(member, data)
+            try:
+                load(evil)
+                assert False, 'loaded %s.%s' % (module, name)
+            except ValueError:
+                pass
+    finally:
+        use_drawing_tool(previous)
+
+def test_copy_bbox():
+    """A copy of a sub shape does not copy its parents."""
+    drawing_tool.set_coordinate_system(xmin=0, xmax=20, ymin=0, ymax=10)
+    wheel = Wheel((3, 3), 1)
+    fig = Composition(dict(wheel=wheel, ground=Line((0, 2), (20, 2))))
+    box = fig.bbox()  # registers fig as parent of wheel
+    part = wheel.copy()
+    def shapes(shape):
+        yield shape
+        for child in shape.__dict__.get('_shapes', {}).values():
+            for s in shapes(child):
+                yield s
+    for s in shapes(part):
+        assert not s.__dict__.get('_bbox_parents')
+        assert s.__dict__.get('_bbox') is None
+    assert part.bbox() == wheel.bbox()
+    copied = fig.copy()
+    assert copied.bbox() == box
+    copied['wheel'].translate((5, 0))
+    assert copied.bbox() == box  # the ground line is wider
+    copied['wheel'].translate((0, 10))
+    assert copied.bbox()[3] == box[3] + 10
+    assert fig.bbox() == box
+
+def test_copy_sharing():
+    import numpy as np
+    previous = drawing_tool._tool
+    use_drawing_tool('null')
+    try:
+        drawing_tool.set_coordinate_system(xmin=0, xmax=20, ymin=0, ymax=10)
+        wheel = Wheel((3, 3), 1)
+        fig = Composition(dict(wheel=wheel, spring=Spring((7, 1), 5)))
+        box = fig.bbox()
+        other = fig.copy()
+        rim, rim2 = wheel['outer']['arc'], other['wheel']['outer']['arc']
+        assert rim2.x is rim.x and rim2.y is rim.y
+        # Moving the copy gives it new arrays and leaves fig unchanged
+        other['wheel'].translate((10, 0))
+        assert rim2.x is not rim.x
+        assert np.allclose(rim2.x, rim.x + 10)
+        assert other['spring']['spiral'].x is fig['spring']['spiral'].x
+        assert fig.bbox() == box
+        assert other.bbox()[1] > box[1]  # the cached box of other changed
+        other['spring'].deform(lambda x, y: (x, 2*y))
+        assert fig.bbox() == box
+        # Packed shapes: the copy gets its own arrays
+        fig.pack()
+        packed = fig.copy()
+        fig.translate((1, 0))
+        assert np.allclose(packed['wheel']['outer']['arc'].x, rim.x - 1)
+        packed.translate((2, 0))
+        assert np.allclose(packed['wheel']['outer']['arc'].x, rim.x + 1)
+        # Copy of a sub shape
+        part = fig['wheel'].copy()
+        part.scale(0.5)
+        assert np.allclose(part['outer']['arc'].x, 0.5*rim.x)
+        assert not hasattr(part, '_bbox_parents')
+    finally:
+        use_drawing_tool(previous)
+
+def test_matplotlib_settings():
+    import sys, matplotlib
+    import matplotlib.pyplot as plt
+    from pysketcher.MatplotlibDraw import MatplotlibDraw
+    module = sys.modules['pysketcher.MatplotlibDraw']
+    usetex = matplotlib.rcParams['text.usetex']
+    tool = MatplotlibDraw(backend='offscreen', usetex=False)
+    tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    tool.text('$x$', (1, 1))
+    assert not tool.ax.texts[0].get_usetex()
+    assert matplotlib.rcParams['text.usetex'] == usetex  # not changed
+    with matplotlib.rc_context({'text.usetex': not usetex}):
+        assert MatplotlibDraw(backend='offscreen').usetex == (not usetex)
+
+    # Another backend than the first one is used
+    previous = matplotlib.get_backend(), module._backend
+    try:
+        for backend in 'pdf', 'svg':
+            tool = MatplotlibDraw(backend=backend)
+            tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+            tool.ax
+            assert matplotlib.get_backend() == backend
+            plt.close(tool.fig)
+    finally:
+        plt.switch_backend(previous[0])
+        module._backend = previous[1]
+
+def test_offscreen_backend():
+    from pysketcher.MatplotlibDraw import MatplotlibDraw
+    tool = MatplotlibDraw(backend='offscreen')
+    assert tool.backend == 'Agg'
+    tool.set_coordinate_system(xmin=0, xmax=10, ymin=0, ymax=5)
+    assert tool._fig is None  # no figure before the first drawing
+    tool.plot_curve([1, 2, 3], [1, 3, 1])
+    assert type(tool.fig.canvas).__name__ == 'FigureCanvasAgg'
+    assert len(tool.ax.lines) == 1
+    assert tuple(tool.fig.get_size_inches()) == (8, 4)
 
 def diff_files(files1, files2, mode='HTML'):
     import difflib, time
@@ -639,5 +1517,3 @@ def _test_test():
         resfile = mplfile.replace('tmp_', 'res_')
         res_files.append(resfile)
     diff_files(new_files, res_files)
-
-test_Arc()
@@ -8,6 +8,6 @@ setup(name='pysketcher',
       license='BSD',
       long_description=pysketcher.__doc__,
       platforms='any',
-      #package_data={'name': ['pysketcher/*.dat'],},
+      package_data={'pysketcher': ['*.npy']},
       packages=['pysketcher'])
 